@@ -0,0 +1,153 @@
+"""
+Feed iCalendar (.ics) deadline assignment per user.
+
+URL feed memakai token bertanda tangan (django.core.signing) berisi user id,
+sehingga aplikasi kalender bisa polling tanpa JWT dan verifikasi token tidak
+butuh query. Isi feed disimpan di cache dengan key yang memuat versi data
+feed (course user beserta updated_at course dan jumlah + MAX(updated_at)
+assignment-nya, satu query). Cache default Django per proses, jadi
+invalidasi eksplisit tidak akan terlihat di worker lain; dengan versi di key,
+perubahan langsung menghasilkan key baru di semua worker.
+"""
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils import timezone
+
+TOKEN_SALT = 'assignments.calendar'
+CACHE_VERSION = 2
+# Key sudah berubah saat data berubah; TTL membatasi memori dan membuat
+# deadline yang lewat FEED_HISTORY keluar dari feed
+FEED_CACHE_TIMEOUT = 60 * 15
+# Deadline yang sudah lewat lebih dari ini tidak dimasukkan ke feed
+FEED_HISTORY = timedelta(days=30)
+PRODID = '-//EduPlatform//Assignment Deadlines//EN'
+
+
+def feed_token(user_id):
+    return signing.Signer(salt=TOKEN_SALT).sign(str(user_id))
+
+
+def user_id_from_token(token):
+    """User id dari token feed, atau None jika token tidak valid"""
+    try:
+        return int(signing.Signer(salt=TOKEN_SALT).unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def feed_cache_key(user_id, version):
+    return f'calendar-feed:v{CACHE_VERSION}:{user_id}:{version}'
+
+
+def feed_courses(user_id):
+    """Queryset course feed user, atau None jika user tidak ada atau tidak aktif"""
+    from courses.models import Course
+    from users.models import User
+
+    user = User.objects.filter(pk=user_id, is_active=True).values('role').first()
+    if user is None:
+        return None
+    if user['role'] == 'student':
+        return Course.objects.filter(enrollments__student_id=user_id, enrollments__is_active=True)
+    return Course.objects.filter(lecturer_id=user_id)
+
+
+def feed_version(courses):
+    """Hash semua yang memengaruhi isi feed, dari satu query aggregate per course"""
+    rows = (
+        courses.annotate(assignment_count=Count('assignments'), assignments_modified=Max('assignments__updated_at'))
+        .order_by('pk')
+        .values_list('pk', 'updated_at', 'assignment_count', 'assignments_modified')
+    )
+    return hashlib.md5(repr(list(rows)).encode(), usedforsecurity=False).hexdigest()
+
+
+def get_feed(user_id):
+    """
+    (body, etag) feed user dari cache, dibangun jika belum ada.
+    Return None jika user tidak ada atau tidak aktif.
+    """
+    courses = feed_courses(user_id)
+    if courses is None:
+        return None
+    key = feed_cache_key(user_id, feed_version(courses))
+    feed = cache.get(key)
+    if feed is None:
+        body = build_feed(courses)
+        feed = (body, '"%s"' % hashlib.md5(body, usedforsecurity=False).hexdigest())
+        cache.set(key, feed, FEED_CACHE_TIMEOUT)
+    return feed
+
+
+def build_feed(courses):
+    from .models import Assignment
+
+    assignments = (
+        Assignment.objects.filter(
+            course__in=courses, due_date__gte=timezone.now() - FEED_HISTORY
+        )
+        .order_by('due_date', 'id')
+        .values('id', 'title', 'description', 'due_date', 'created_at', 'course__code', 'course__name')
+    )
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        'X-WR-CALNAME:Assignment deadlines',
+    ]
+    for assignment in assignments:
+        code = assignment['course__code'] or assignment['course__name']
+        summary = f"[{code}] {assignment['title']}"
+        lines += [
+            'BEGIN:VEVENT',
+            f"UID:assignment-{assignment['id']}@eduplatform",
+            # DTSTAMP tetap (bukan waktu build) agar feed identik antar rebuild
+            f"DTSTAMP:{_format_datetime(assignment['created_at'])}",
+            f"DTSTART:{_format_datetime(assignment['due_date'])}",
+            f"DTEND:{_format_datetime(assignment['due_date'])}",
+            f"SUMMARY:{_escape(summary)}",
+            f"DESCRIPTION:{_escape(assignment['description'])}",
+            'END:VEVENT',
+        ]
+    lines.append('END:VCALENDAR')
+    return ''.join(_fold(line) + '\r\n' for line in lines).encode('utf-8')
+
+
+def _format_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _escape(text):
+    """Escape TEXT value (RFC 5545 3.3.11)"""
+    return (
+        (text or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line, limit=75):
+    """Lipat baris lebih dari 75 oktet (RFC 5545 3.1) tanpa memotong karakter UTF-8"""
+    if len(line.encode('utf-8')) <= limit:
+        return line
+    parts, current, size = [], '', 0
+    for char in line:
+        width = len(char.encode('utf-8'))
+        if size + width > limit:
+            parts.append(current)
+            # Baris lanjutan diawali spasi, yang ikut dihitung
+            current, size = ' ', 1
+        current += char
+        size += width
+    parts.append(current)
+    return '\r\n'.join(parts)
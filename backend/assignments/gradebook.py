@@ -0,0 +1,125 @@
+"""
+Gradebook course: matriks student x assignment.
+
+Dibangun dari query .values() datar (assignment, student aktif, submission)
+tanpa serializer bersarang. Student diambil urut username dalam batch;
+submission tiap batch diambil dengan student_id__in dan dipasangkan lewat
+student_id, sehingga baris matriks bisa dihasilkan satu per satu (dipakai
+export CSV yang di-stream) tanpa membandingkan username di Python, yang
+urutannya bisa berbeda dengan collation database. Semua query dijalankan di
+dalam gradebook_snapshot() agar melihat data yang sama.
+"""
+import csv
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import connection, transaction
+
+from courses.models import Enrollment
+from .models import Assignment, Submission
+
+ITERATOR_CHUNK_SIZE = 2000
+# Student per query submission (student_id__in)
+STUDENT_BATCH_SIZE = 500
+
+
+@contextmanager
+def gradebook_snapshot():
+    """
+    Transaksi read-only di mana semua query melihat snapshot yang sama
+    (REPEATABLE READ di PostgreSQL; transaksi SQLite sudah konsisten). Di
+    dalam transaksi yang sudah berjalan, isolation level tidak bisa diubah
+    dan snapshot transaksi itu yang dipakai.
+    """
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+        yield
+
+
+def gradebook_assignments(course):
+    return list(
+        Assignment.objects.filter(course=course)
+        .order_by('due_date', 'id')
+        .values('id', 'title', 'due_date')
+    )
+
+
+def iter_gradebook_rows(course, assignments):
+    """
+    Yield (student, cells) per student aktif, urut username.
+    cells sejajar dengan `assignments`; None jika belum submit, selain itu
+    dict submission_id, grade, submitted_at, late. Submission untuk
+    assignment di luar `assignments` dilewati.
+    """
+    column = {assignment['id']: index for index, assignment in enumerate(assignments)}
+    due_dates = [assignment['due_date'] for assignment in assignments]
+
+    students = (
+        Enrollment.objects.filter(course=course, is_active=True)
+        .order_by('student__username', 'student_id')
+        .values_list('student_id', 'student__username', 'student__first_name', 'student__last_name')
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+
+    while True:
+        batch = list(islice(students, STUDENT_BATCH_SIZE))
+        if not batch:
+            return
+
+        cells_by_student = {student_id: [None] * len(assignments) for student_id, *_ in batch}
+        submissions = (
+            Submission.objects.filter(assignment__course=course, student_id__in=cells_by_student)
+            .order_by('student_id', 'assignment_id')
+            .values_list('student_id', 'assignment_id', 'id', 'grade', 'submitted_at')
+            .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+        )
+        for student_id, assignment_id, submission_id, grade, submitted_at in submissions:
+            index = column.get(assignment_id)
+            if index is not None:
+                cells_by_student[student_id][index] = {
+                    'submission_id': submission_id,
+                    'grade': grade,
+                    'submitted_at': submitted_at,
+                    'late': submitted_at > due_dates[index],
+                }
+
+        for student_id, username, first_name, last_name in batch:
+            student = {
+                'id': student_id,
+                'username': username,
+                'first_name': first_name,
+                'last_name': last_name,
+            }
+            yield student, cells_by_student[student_id]
+
+
+class _Echo:
+    """File-like object untuk csv.writer: write() mengembalikan baris CSV"""
+    def write(self, value):
+        return value
+
+
+def _safe_cell(value):
+    # Cegah formula injection saat CSV dibuka di spreadsheet
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@'):
+        return "'" + value
+    return value
+
+
+def iter_gradebook_csv(course):
+    """Baris CSV gradebook satu per satu (nilai kosong jika belum dinilai)"""
+    writer = csv.writer(_Echo())
+    with gradebook_snapshot():
+        assignments = gradebook_assignments(course)
+
+        header = ['username', 'first_name', 'last_name']
+        header += [_safe_cell(f"{assignment['title']} (#{assignment['id']})") for assignment in assignments]
+        yield writer.writerow(header)
+
+        for student, cells in iter_gradebook_rows(course, assignments):
+            row = [_safe_cell(student['username']), _safe_cell(student['first_name']), _safe_cell(student['last_name'])]
+            row += ['' if cell is None or cell['grade'] is None else cell['grade'] for cell in cells]
+            yield writer.writerow(row)
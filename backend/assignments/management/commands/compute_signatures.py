@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from assignments.models import Submission
+from assignments.similarity import update_signature
+
+
+class Command(BaseCommand):
+    help = "Compute MinHash signatures for submissions whose file changed (or was never analyzed)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--assignment',
+            type=int,
+            help='Only process submissions of this assignment',
+        )
+
+    def handle(self, *args, **options):
+        submissions = Submission.objects.order_by('pk')
+        if options['assignment']:
+            submissions = submissions.filter(assignment_id=options['assignment'])
+
+        computed = 0
+        for submission_id in submissions.values_list('pk', flat=True).iterator():
+            # update_signature melewati submission yang file-nya tidak berubah
+            if update_signature(submission_id) is not None:
+                computed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Computed {computed} signature(s)"))
@@ -0,0 +1,74 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='assignment',
+            options={'ordering': ['-created_at']},
+        ),
+        migrations.AlterModelOptions(
+            name='submission',
+            options={'ordering': ['-submitted_at']},
+        ),
+        migrations.RenameField(
+            model_name='submission',
+            old_name='score',
+            new_name='grade',
+        ),
+        migrations.RemoveField(
+            model_name='assignment',
+            name='max_score',
+        ),
+        migrations.RemoveField(
+            model_name='assignment',
+            name='updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='submission',
+            name='content',
+        ),
+        migrations.RemoveField(
+            model_name='submission',
+            name='file',
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='file_url',
+            field=models.CharField(default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='assignment',
+            name='title',
+            field=models.CharField(max_length=150),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='feedback',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='student',
+            field=models.ForeignKey(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterModelTable(
+            name='assignment',
+            table='assignments',
+        ),
+        migrations.AlterModelTable(
+            name='submission',
+            table='submissions',
+        ),
+    ]
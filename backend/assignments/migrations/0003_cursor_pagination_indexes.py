@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0002_sync_models'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['-submitted_at', '-id'], name='submission_cursor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['student', '-submitted_at', '-id'], name='submission_student_cursor_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0003_cursor_pagination_indexes'),
+        ('courses', '0007_course_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['course', 'due_date'], name='assignment_course_due_idx'),
+        ),
+    ]
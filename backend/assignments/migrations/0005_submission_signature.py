@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0004_assignment_due_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionSignature',
+            fields=[
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='assignments.submission')),
+                ('signature', models.BinaryField(null=True)),
+                ('shingle_count', models.PositiveIntegerField(default=0)),
+                ('file_url', models.CharField(max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signatures', to='assignments.assignment')),
+            ],
+            options={
+                'db_table': 'submission_signatures',
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0005_submission_signature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentStats',
+            fields=[
+                ('assignment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='assignments.assignment')),
+                ('submission_count', models.PositiveIntegerField(default=0)),
+                ('graded_count', models.PositiveIntegerField(default=0)),
+                ('grade_sum', models.BigIntegerField(default=0)),
+                ('grade_sum_squares', models.BigIntegerField(default=0)),
+                ('bucket_0', models.PositiveIntegerField(default=0)),
+                ('bucket_1', models.PositiveIntegerField(default=0)),
+                ('bucket_2', models.PositiveIntegerField(default=0)),
+                ('bucket_3', models.PositiveIntegerField(default=0)),
+                ('bucket_4', models.PositiveIntegerField(default=0)),
+                ('bucket_5', models.PositiveIntegerField(default=0)),
+                ('bucket_6', models.PositiveIntegerField(default=0)),
+                ('bucket_7', models.PositiveIntegerField(default=0)),
+                ('bucket_8', models.PositiveIntegerField(default=0)),
+                ('bucket_9', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'assignment_stats',
+            },
+        ),
+    ]
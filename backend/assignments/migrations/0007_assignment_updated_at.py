@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:10
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    Assignment = apps.get_model('assignments', 'Assignment')
+    Assignment.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0006_assignment_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
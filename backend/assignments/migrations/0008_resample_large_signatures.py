@@ -0,0 +1,25 @@
+from django.db import migrations
+
+# assignments.similarity.MAX_SHINGLES saat migration ini dibuat
+MAX_SHINGLES = 2000
+
+
+def drop_unsampled_signatures(apps, schema_editor):
+    """
+    Signature file dengan lebih dari MAX_SHINGLES shingle dihitung tanpa
+    sampling dan tidak bisa dibandingkan dengan signature baru; hapus agar
+    dihitung ulang oleh manage.py compute_signatures.
+    """
+    SubmissionSignature = apps.get_model('assignments', 'SubmissionSignature')
+    SubmissionSignature.objects.filter(shingle_count__gt=MAX_SHINGLES).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0007_assignment_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_unsampled_signatures, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models import F
 from django.conf import settings
+from django.utils import timezone
 from courses.models import Course
 
 
@@ -14,10 +16,16 @@ class Assignment(models.Model):
     description = models.TextField()
     due_date = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Versi feed kalender (assignments.calendar.feed_version)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'assignments'
         ordering = ['-created_at']
+        indexes = [
+            # Window deadline per course (?due_after=&due_before=, feed kalender)
+            models.Index(fields=['course', 'due_date'], name='assignment_course_due_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.course.code}"
@@ -45,6 +53,126 @@ class Submission(models.Model):
         db_table = 'submissions'
         unique_together = ['assignment', 'student']
         ordering = ['-submitted_at']
+        indexes = [
+            # Keyset pagination /api/submissions/ (lecturer: semua, student: miliknya)
+            models.Index(fields=['-submitted_at', '-id'], name='submission_cursor_idx'),
+            models.Index(fields=['student', '-submitted_at', '-id'], name='submission_student_cursor_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.username} - {self.assignment.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Nilai awal untuk mendeteksi file baru / perubahan nilai di assignments.signals
+        instance._loaded_file_url = instance.__dict__.get('file_url')
+        instance._loaded_grade = instance.__dict__.get('grade')
+        instance._loaded_assignment_id = instance.__dict__.get('assignment_id')
+        return instance
+
+
+class SubmissionSignature(models.Model):
+    """
+    MinHash signature isi file submission (assignments.similarity), dipakai
+    untuk mencari pasangan submission yang mirip tanpa membandingkan semua pasangan.
+    """
+    submission = models.OneToOneField(
+        Submission,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='signature'
+    )
+    # Denormalisasi agar report per assignment cukup satu query tanpa join
+    assignment = models.ForeignKey(
+        Assignment,
+        on_delete=models.CASCADE,
+        related_name='signatures'
+    )
+    # NUM_PERM nilai uint32 (512 byte); null jika file bukan teks / terlalu pendek
+    signature = models.BinaryField(null=True)
+    shingle_count = models.PositiveIntegerField(default=0)
+    file_url = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'submission_signatures'
+
+
+# Histogram nilai: GRADE_BUCKETS bucket selebar GRADE_BUCKET_WIDTH,
+# bucket terakhir menampung semua nilai >= 90
+GRADE_BUCKET_WIDTH = 10
+GRADE_BUCKETS = 10
+
+
+def grade_bucket_field(grade):
+    index = min(max(grade, 0) // GRADE_BUCKET_WIDTH, GRADE_BUCKETS - 1)
+    return f'bucket_{index}'
+
+
+class AssignmentStats(models.Model):
+    """
+    Statistik nilai per assignment yang di-update incremental oleh
+    assignments.signals (dan bulk grading), sehingga halaman statistik cukup
+    membaca satu row. Rebuild penuh: manage.py rebuild_assignment_stats
+    """
+    assignment = models.OneToOneField(
+        Assignment,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    submission_count = models.PositiveIntegerField(default=0)
+    graded_count = models.PositiveIntegerField(default=0)
+    grade_sum = models.BigIntegerField(default=0)
+    grade_sum_squares = models.BigIntegerField(default=0)
+    bucket_0 = models.PositiveIntegerField(default=0)
+    bucket_1 = models.PositiveIntegerField(default=0)
+    bucket_2 = models.PositiveIntegerField(default=0)
+    bucket_3 = models.PositiveIntegerField(default=0)
+    bucket_4 = models.PositiveIntegerField(default=0)
+    bucket_5 = models.PositiveIntegerField(default=0)
+    bucket_6 = models.PositiveIntegerField(default=0)
+    bucket_7 = models.PositiveIntegerField(default=0)
+    bucket_8 = models.PositiveIntegerField(default=0)
+    bucket_9 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'assignment_stats'
+
+    def __str__(self):
+        return f"Stats {self.assignment_id}: {self.graded_count}/{self.submission_count} graded"
+
+    @property
+    def histogram(self):
+        return [getattr(self, f'bucket_{index}') for index in range(GRADE_BUCKETS)]
+
+    @classmethod
+    def apply_changes(cls, assignment_id, submissions=0, removed=(), added=()):
+        """
+        Update statistik secara atomic (F expression) untuk perubahan nilai:
+        `removed` = nilai lama yang hilang, `added` = nilai baru (None diabaikan).
+        Jika row statistik belum ada, tidak ada yang di-update; row dibangun
+        penuh saat pertama kali dibaca (lihat assignments.stats).
+        """
+        deltas = {}
+
+        def add(field, delta):
+            deltas[field] = deltas.get(field, 0) + delta
+
+        if submissions:
+            add('submission_count', submissions)
+        for sign, grades in ((-1, removed), (1, added)):
+            for grade in grades:
+                if grade is None:
+                    continue
+                add('graded_count', sign)
+                add('grade_sum', sign * grade)
+                add('grade_sum_squares', sign * grade * grade)
+                add(grade_bucket_field(grade), sign)
+
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if updates:
+            updates['updated_at'] = timezone.now()
+            cls.objects.filter(assignment_id=assignment_id).update(**updates)
@@ -24,3 +24,33 @@ class SubmissionSerializer(serializers.ModelSerializer):
         fields = ['id', 'assignment', 'assignment_detail', 'student', 'student_detail', 
                   'file_url', 'submitted_at', 'grade', 'feedback']
         read_only_fields = ['id', 'submitted_at']
+
+
+class DeadlineWindowSerializer(serializers.Serializer):
+    """Query params window deadline: ?due_after=&due_before= (ISO 8601)"""
+    due_after = serializers.DateTimeField(required=False)
+    due_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        due_after, due_before = attrs.get('due_after'), attrs.get('due_before')
+        if due_after and due_before and due_after > due_before:
+            raise serializers.ValidationError('due_after must be before due_before.')
+        return attrs
+
+
+class DeadlineSerializer(serializers.Serializer):
+    """Baris ringkas /api/assignments/deadlines/ (tanpa course_detail bersarang)"""
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    due_date = serializers.DateTimeField()
+    course_id = serializers.IntegerField()
+    course_code = serializers.CharField()
+    course_name = serializers.CharField()
+
+
+class BulkGradeItemSerializer(serializers.Serializer):
+    """Satu baris body /api/assignments/{id}/bulk-grade/"""
+    id = serializers.IntegerField()
+    grade = serializers.IntegerField(allow_null=True, min_value=0)
+    # Jika tidak dikirim, feedback lama dipertahankan
+    feedback = serializers.CharField(required=False, allow_null=True, allow_blank=True)
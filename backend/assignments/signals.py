@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Assignment, AssignmentStats, Submission
+from .similarity import schedule_signature
+
+
+@receiver(post_save, sender=Assignment)
+def assignment_created(sender, instance, created, **kwargs):
+    if created:
+        AssignmentStats.objects.create(assignment=instance)
+
+
+@receiver(post_save, sender=Submission)
+def submission_saved(sender, instance, created, **kwargs):
+    """Signature MinHash dihitung ulang hanya jika file submission berubah"""
+    if created or instance.file_url != getattr(instance, '_loaded_file_url', None):
+        submission_id = instance.pk
+        transaction.on_commit(lambda: schedule_signature(submission_id))
+
+    # Statistik nilai assignment (AssignmentStats)
+    if created:
+        AssignmentStats.apply_changes(instance.assignment_id, submissions=1, added=[instance.grade])
+    else:
+        old_assignment_id = getattr(instance, '_loaded_assignment_id', None) or instance.assignment_id
+        old_grade = getattr(instance, '_loaded_grade', instance.grade)
+        if old_assignment_id != instance.assignment_id:
+            AssignmentStats.apply_changes(old_assignment_id, submissions=-1, removed=[old_grade])
+            AssignmentStats.apply_changes(instance.assignment_id, submissions=1, added=[instance.grade])
+        elif old_grade != instance.grade:
+            AssignmentStats.apply_changes(instance.assignment_id, removed=[old_grade], added=[instance.grade])
+
+    instance._loaded_file_url = instance.file_url
+    instance._loaded_grade = instance.grade
+    instance._loaded_assignment_id = instance.assignment_id
+
+
+@receiver(post_delete, sender=Submission)
+def submission_deleted(sender, instance, **kwargs):
+    """Dipanggil juga untuk delete cascade (hapus student)"""
+    old_grade = getattr(instance, '_loaded_grade', instance.grade)
+    AssignmentStats.apply_changes(instance.assignment_id, submissions=-1, removed=[old_grade])
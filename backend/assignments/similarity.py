@@ -0,0 +1,212 @@
+"""
+Deteksi submission yang mirip (near-duplicate) dengan MinHash + LSH.
+
+Isi file submission dipecah menjadi shingle (SHINGLE_SIZE kata berurutan),
+lalu diringkas menjadi MinHash signature NUM_PERM nilai uint32 yang disimpan
+di SubmissionSignature. Signature dihitung sekali per file, di thread pool
+setelah submission disimpan (lihat assignments.signals).
+
+MinHash murni Python memegang GIL, jadi hanya MAX_SHINGLES hash shingle
+terkecil yang dipakai (bottom-k). Sampel ini konsisten antar dokumen (hash
+yang sama selalu terpilih dengan cara yang sama), sehingga similarity tetap
+bisa diperkirakan dan biaya per file tetap kecil berapapun ukurannya.
+
+Report per assignment tidak membandingkan semua pasangan: signature dibagi
+menjadi BANDS band berisi ROWS nilai, dan hanya submission yang punya band
+identik (bucket LSH yang sama) yang dibandingkan. Dengan 32 x 4, pasangan
+dengan Jaccard 0.5 hampir pasti menjadi kandidat (~87%), sedangkan pasangan
+dengan Jaccard 0.2 jarang (~5%).
+"""
+import heapq
+import logging
+import random
+import re
+import zlib
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from operator import eq
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+# Prima terbesar < 2^32: a * x + b muat di 64 bit untuk x 32-bit
+PRIME = 4294967291
+# Koefisien permutasi tetap agar signature dari proses mana pun bisa dibandingkan
+_rng = random.Random(20240601)
+PERMUTATIONS = [(_rng.randrange(1, PRIME), _rng.randrange(0, PRIME)) for _ in range(NUM_PERM)]
+
+MAX_TEXT_BYTES = 2 * 1024 * 1024
+# NUM_PERM x MAX_SHINGLES operasi per signature
+MAX_SHINGLES = 2000
+DEFAULT_THRESHOLD = 0.5
+# Bucket LSH yang lebih besar (mis. banyak submission berisi template yang
+# sama) tidak dibandingkan semua pasangan, hanya anggota yang berurutan
+MAX_BUCKET_SIZE = 50
+WORD_RE = re.compile(r'\w+')
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.SIMILARITY_WORKERS,
+            thread_name_prefix='submission-signature',
+        )
+    return _executor
+
+
+def schedule_signature(submission_id):
+    """Jadwalkan perhitungan signature; sinkron jika SIMILARITY_WORKERS = 0"""
+    if settings.SIMILARITY_WORKERS <= 0:
+        update_signature(submission_id)
+        return
+    _get_executor().submit(_run_in_worker, submission_id)
+
+
+def _run_in_worker(submission_id):
+    close_old_connections()
+    try:
+        update_signature(submission_id)
+    except Exception:
+        logger.exception("Failed to compute signature for submission %s", submission_id)
+    finally:
+        connection.close()
+
+
+def shingles(text):
+    """Hash 32-bit dari setiap SHINGLE_SIZE kata berurutan (huruf kecil)"""
+    words = WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return set()
+    return {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def sample_shingles(hashes):
+    """MAX_SHINGLES hash terkecil (semua jika lebih sedikit)"""
+    if len(hashes) <= MAX_SHINGLES:
+        return list(hashes)
+    return heapq.nsmallest(MAX_SHINGLES, hashes)
+
+
+def minhash(hashes):
+    """MinHash signature (array uint32, NUM_PERM nilai) dari sampel hash shingle"""
+    values = sample_shingles(hashes)
+    return array('I', (min((a * x + b) % PRIME for x in values) for a, b in PERMUTATIONS))
+
+
+def estimate_similarity(first, second):
+    """Perkiraan Jaccard similarity dari dua signature"""
+    return sum(map(eq, first, second)) / NUM_PERM
+
+
+def read_text(file_url):
+    """
+    Isi file submission sebagai teks, atau None jika file tidak ada di
+    MEDIA_ROOT (misalnya link eksternal) atau bukan file teks.
+    """
+    path = urlparse(file_url or '').path
+    prefix = '/' + settings.MEDIA_URL.strip('/') + '/'
+    if not path.startswith(prefix):
+        return None
+    try:
+        with default_storage.open(path[len(prefix):], 'rb') as handle:
+            data = handle.read(MAX_TEXT_BYTES)
+    except (OSError, SuspiciousFileOperation):
+        return None
+    if b'\x00' in data[:8192]:
+        return None
+    return data.decode('utf-8', errors='ignore')
+
+
+def update_signature(submission_id):
+    """Hitung ulang signature jika file submission berubah sejak perhitungan terakhir"""
+    from .models import Submission, SubmissionSignature
+
+    submission = Submission.objects.filter(pk=submission_id).values('assignment_id', 'file_url').first()
+    if submission is None:
+        return None
+    existing = SubmissionSignature.objects.filter(pk=submission_id).values_list('file_url', flat=True).first()
+    if existing == submission['file_url']:
+        return None
+
+    text = read_text(submission['file_url'])
+    hashes = shingles(text) if text else set()
+    signature = minhash(hashes).tobytes() if hashes else None
+    SubmissionSignature.objects.update_or_create(
+        submission_id=submission_id,
+        defaults={
+            'assignment_id': submission['assignment_id'],
+            'signature': signature,
+            'shingle_count': len(hashes),
+            'file_url': submission['file_url'],
+        },
+    )
+    return signature
+
+
+def find_similar_pairs(assignment_id, threshold=DEFAULT_THRESHOLD):
+    """
+    Pasangan (submission_a, submission_b, similarity) dengan perkiraan
+    similarity >= threshold, urut dari yang paling mirip.
+    """
+    from .models import SubmissionSignature
+
+    signatures = {
+        submission_id: bytes(signature)
+        for submission_id, signature in SubmissionSignature.objects.filter(
+            assignment_id=assignment_id, signature__isnull=False
+        ).values_list('submission_id', 'signature')
+    }
+
+    # Bucket LSH: key = (nomor band, byte mentah band tersebut)
+    band_bytes = ROWS * 4
+    buckets = defaultdict(list)
+    for submission_id, signature in signatures.items():
+        for band in range(BANDS):
+            buckets[(band, signature[band * band_bytes:(band + 1) * band_bytes])].append(submission_id)
+
+    candidates = set()
+    capped, largest = 0, 0
+    for members in buckets.values():
+        if len(members) > MAX_BUCKET_SIZE:
+            # n^2 pasangan terlalu mahal; setiap anggota tetap dibandingkan
+            # dengan tetangganya sehingga salinan identik tetap terlapor
+            members = sorted(members)
+            candidates.update(zip(members, members[1:]))
+            capped, largest = capped + 1, max(largest, len(members))
+        elif len(members) > 1:
+            candidates.update(combinations(sorted(members), 2))
+    if capped:
+        logger.warning(
+            "Assignment %s: %d LSH bucket(s) larger than %d (largest %d) compared by neighbours only",
+            assignment_id, capped, MAX_BUCKET_SIZE, largest,
+        )
+
+    unpacked = {}
+    pairs = []
+    for first, second in candidates:
+        for submission_id in (first, second):
+            if submission_id not in unpacked:
+                unpacked[submission_id] = array('I', signatures[submission_id])
+        similarity = estimate_similarity(unpacked[first], unpacked[second])
+        if similarity >= threshold:
+            pairs.append((first, second, similarity))
+
+    pairs.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+    return pairs, len(signatures)
@@ -0,0 +1,112 @@
+"""
+Perhitungan ulang AssignmentStats dan format respons /api/assignments/{id}/stats/.
+
+Update incremental ada di AssignmentStats.apply_changes; modul ini dipakai
+saat row statistik belum ada dan oleh command rebuild_assignment_stats.
+"""
+import math
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import GRADE_BUCKET_WIDTH, GRADE_BUCKETS, AssignmentStats, Submission
+
+STAT_FIELDS = ['submission_count', 'graded_count', 'grade_sum', 'grade_sum_squares'] + [
+    f'bucket_{index}' for index in range(GRADE_BUCKETS)
+]
+
+
+def _bucket_filter(index):
+    # Bucket pertama/terakhir juga menampung nilai di bawah 0 / di atas 100
+    condition = Q()
+    if index > 0:
+        condition &= Q(grade__gte=index * GRADE_BUCKET_WIDTH)
+    if index < GRADE_BUCKETS - 1:
+        condition &= Q(grade__lt=(index + 1) * GRADE_BUCKET_WIDTH)
+    return condition & Q(grade__isnull=False)
+
+
+def aggregate_stats(submissions):
+    """Satu query GROUP BY assignment: dict assignment_id -> nilai STAT_FIELDS"""
+    buckets = {
+        f'bucket_{index}': Count('id', filter=_bucket_filter(index))
+        for index in range(GRADE_BUCKETS)
+    }
+    rows = (
+        submissions.order_by()
+        .values('assignment_id')
+        .annotate(
+            submission_count=Count('id'),
+            graded_count=Count('grade'),
+            grade_sum=Coalesce(Sum('grade'), 0),
+            grade_sum_squares=Coalesce(Sum(F('grade') * F('grade')), 0),
+            **buckets,
+        )
+    )
+    return {row.pop('assignment_id'): row for row in rows}
+
+
+def rebuild_stats(assignment):
+    """
+    Hitung penuh statistik satu assignment dan simpan (dipakai saat row
+    belum ada dan oleh command rebuild_assignment_stats). Row statistik
+    dikunci sebelum submission dihitung, sehingga apply_changes yang berjalan
+    bersamaan menunggu lalu menambahkan perubahannya di atas hasil ini.
+    """
+    with transaction.atomic():
+        list(AssignmentStats.objects.select_for_update().filter(assignment=assignment).values_list('pk'))
+        values = aggregate_stats(Submission.objects.filter(assignment=assignment)).get(assignment.pk, {})
+        defaults = {field: values.get(field, 0) for field in STAT_FIELDS}
+        defaults['updated_at'] = timezone.now()
+        stats, _ = AssignmentStats.objects.update_or_create(assignment=assignment, defaults=defaults)
+    stats.assignment = assignment
+    return stats
+
+
+def _median(histogram, graded):
+    """Median diperkirakan dari histogram (interpolasi linear di dalam bucket)"""
+    if not graded:
+        return None
+    half = graded / 2
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= half:
+            return round(index * GRADE_BUCKET_WIDTH + GRADE_BUCKET_WIDTH * (half - seen) / count, 2)
+        seen += count
+    return None
+
+
+def _bucket_label(index):
+    low = index * GRADE_BUCKET_WIDTH
+    if index == GRADE_BUCKETS - 1:
+        return f'{low}+'
+    return f'{low}-{low + GRADE_BUCKET_WIDTH - 1}'
+
+
+def stats_payload(stats, enrolled):
+    graded = stats.graded_count
+    mean = stats.grade_sum / graded if graded else None
+    stddev = None
+    if graded:
+        variance = max(stats.grade_sum_squares / graded - mean * mean, 0)
+        stddev = round(math.sqrt(variance), 2)
+    histogram = stats.histogram
+
+    return {
+        'assignment': stats.assignment_id,
+        'submissions': stats.submission_count,
+        'graded': graded,
+        'ungraded': stats.submission_count - graded,
+        'enrolled': enrolled,
+        'submission_rate': round(stats.submission_count / enrolled, 4) if enrolled else None,
+        'mean': round(mean, 2) if mean is not None else None,
+        'median': _median(histogram, graded),
+        'stddev': stddev,
+        'histogram': [
+            {'range': _bucket_label(index), 'count': count}
+            for index, count in enumerate(histogram)
+        ],
+        'updated_at': stats.updated_at,
+    }
@@ -1,3 +1,269 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from courses.models import Course, Enrollment
+from users.models import User
+from .calendar import get_feed
+from .gradebook import gradebook_assignments, gradebook_snapshot, iter_gradebook_rows
+from .models import Assignment, AssignmentStats, Submission, SubmissionSignature
+from .similarity import (
+    MAX_SHINGLES, estimate_similarity, find_similar_pairs, minhash, sample_shingles, shingles,
+)
+
+
+class GradebookTest(TestCase):
+    def setUp(self):
+        lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.course = Course.objects.create(name='Nilai', code='GRADE101', description='-', lecturer=lecturer)
+        due = timezone.now() + timedelta(days=7)
+        self.first = Assignment.objects.create(course=self.course, title='Tugas 1', description='-', due_date=due)
+        self.students = []
+        for name in ['cici', 'budi', 'ani']:
+            student = User.objects.create_user(name, role='student')
+            Enrollment.objects.create(student=student, course=self.course)
+            self.students.append(student)
+
+    def _rows(self, assignments):
+        with gradebook_snapshot():
+            return [(student['username'], cells) for student, cells in iter_gradebook_rows(self.course, assignments)]
+
+    def test_submissions_land_in_their_student_row(self):
+        cici, budi, ani = self.students
+        Submission.objects.create(assignment=self.first, student=cici, file_url='x', grade=90)
+        Submission.objects.create(assignment=self.first, student=ani, file_url='x', grade=70)
+        # Student tidak aktif tidak punya baris; submission-nya dilewati
+        Enrollment.objects.filter(student=budi).update(is_active=False)
+        Submission.objects.create(assignment=self.first, student=budi, file_url='x', grade=10)
+
+        rows = self._rows(gradebook_assignments(self.course))
+
+        self.assertEqual([username for username, _ in rows], ['ani', 'cici'])
+        self.assertEqual([cells[0]['grade'] for _, cells in rows], [70, 90])
+
+    def test_assignment_missing_from_columns_is_skipped(self):
+        # Assignment dibuat setelah daftar kolom diambil
+        assignments = gradebook_assignments(self.course)
+        later = Assignment.objects.create(
+            course=self.course, title='Tugas 2', description='-', due_date=timezone.now(),
+        )
+        Submission.objects.create(assignment=later, student=self.students[0], file_url='x', grade=80)
+        Submission.objects.create(assignment=self.first, student=self.students[0], file_url='x', grade=60)
+
+        rows = dict(self._rows(assignments))
+
+        self.assertEqual(len(rows['cici']), 1)
+        self.assertEqual(rows['cici'][0]['grade'], 60)
+        self.assertIsNone(rows['ani'][0])
+
+
+    def test_rows_match_across_batches(self):
+        for name in ['Dodi', 'eka']:
+            student = User.objects.create_user(name, role='student')
+            Enrollment.objects.create(student=student, course=self.course)
+            self.students.append(student)
+        for grade, student in enumerate(self.students):
+            Submission.objects.create(assignment=self.first, student=student, file_url='x', grade=grade)
+
+        with mock.patch('assignments.gradebook.STUDENT_BATCH_SIZE', 2):
+            rows = dict(self._rows(gradebook_assignments(self.course)))
+
+        self.assertEqual(len(rows), len(self.students))
+        for grade, student in enumerate(self.students):
+            self.assertEqual(rows[student.username][0]['grade'], grade)
+
+
+class RebuildAssignmentStatsTest(TestCase):
+    def test_rebuild_upserts_existing_rows(self):
+        lecturer = User.objects.create_user('dosen', role='lecturer')
+        student = User.objects.create_user('ani', role='student')
+        course = Course.objects.create(name='Stat', code='STAT101', description='-', lecturer=lecturer)
+        assignment = Assignment.objects.create(
+            course=course, title='Tugas', description='-', due_date=timezone.now(),
+        )
+        Submission.objects.create(assignment=assignment, student=student, file_url='x', grade=85)
+        # Row statistik yang rusak diperbaiki di tempat, bukan dihapus lalu dibuat ulang
+        AssignmentStats.objects.update_or_create(assignment=assignment, defaults={'submission_count': 42})
+
+        call_command('rebuild_assignment_stats', stdout=StringIO())
+
+        stats = AssignmentStats.objects.get(assignment=assignment)
+        self.assertEqual(stats.submission_count, 1)
+        self.assertEqual(stats.graded_count, 1)
+        self.assertEqual(stats.grade_sum, 85)
+        self.assertEqual(stats.bucket_8, 1)
+
+        # Row yang hilang dibuat lagi
+        AssignmentStats.objects.filter(assignment=assignment).delete()
+        call_command('rebuild_assignment_stats', stdout=StringIO())
+        self.assertEqual(AssignmentStats.objects.get(assignment=assignment).submission_count, 1)
+
+    def test_stats_endpoint_rejects_non_ascii_digits(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('dosen', role='lecturer'))
+        self.assertEqual(client.get('/api/assignments/²/stats/').status_code, 404)
+
+
+class CalendarFeedTest(TestCase):
+    def setUp(self):
+        lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.student = User.objects.create_user('ani', role='student')
+        self.course = Course.objects.create(name='Kalender', code='CAL101', description='-', lecturer=lecturer)
+        Enrollment.objects.create(student=self.student, course=self.course)
+        self.assignment = Assignment.objects.create(
+            course=self.course, title='Tugas Lama', description='-',
+            due_date=timezone.now() + timedelta(days=1),
+        )
+
+    def test_cached_feed_follows_data_changes(self):
+        body, etag = get_feed(self.student.pk)
+        self.assertIn(b'Tugas Lama', body)
+        self.assertEqual(get_feed(self.student.pk), (body, etag))
+
+        # Tanpa invalidasi eksplisit: versi feed di key cache berubah
+        self.assignment.title = 'Tugas Baru'
+        self.assignment.save()
+        body, _ = get_feed(self.student.pk)
+        self.assertIn(b'Tugas Baru', body)
+
+        Enrollment.objects.filter(student=self.student).update(is_active=False)
+        self.assertNotIn(b'Tugas Baru', get_feed(self.student.pk)[0])
+
+        User.objects.filter(pk=self.student.pk).update(is_active=False)
+        self.assertIsNone(get_feed(self.student.pk))
+
+
+class MinHashTest(TestCase):
+    TEXT = ' '.join(f'kata{index % 997} isi{index % 13}' for index in range(6000))
+
+    def test_same_text_gives_same_signature(self):
+        first = minhash(shingles(self.TEXT))
+        second = minhash(shingles(self.TEXT))
+        self.assertEqual(first.tobytes(), second.tobytes())
+        self.assertEqual(estimate_similarity(first, second), 1.0)
+
+    def test_large_documents_are_sampled(self):
+        hashes = shingles(self.TEXT)
+        self.assertGreater(len(hashes), MAX_SHINGLES)
+        self.assertEqual(sample_shingles(hashes), sorted(hashes)[:MAX_SHINGLES])
+        # Urutan input tidak memengaruhi sampel maupun signature
+        self.assertEqual(minhash(sorted(hashes, reverse=True)).tobytes(), minhash(hashes).tobytes())
+
+    @mock.patch('assignments.similarity.MAX_BUCKET_SIZE', 3)
+    def test_large_buckets_compare_neighbours_only(self):
+        lecturer = User.objects.create_user('dosen', role='lecturer')
+        course = Course.objects.create(name='Mirip', code='SIM101', description='-', lecturer=lecturer)
+        assignment = Assignment.objects.create(
+            course=course, title='Tugas', description='-', due_date=timezone.now(),
+        )
+        signature = minhash(shingles(self.TEXT)).tobytes()
+        for index in range(5):
+            student = User.objects.create_user(f'student{index}', role='student')
+            submission = Submission.objects.create(assignment=assignment, student=student, file_url='x')
+            SubmissionSignature.objects.create(
+                submission=submission, assignment=assignment, signature=signature, file_url='x',
+            )
+
+        with self.assertLogs('assignments.similarity', 'WARNING'):
+            pairs, analyzed = find_similar_pairs(assignment.pk)
+
+        self.assertEqual(analyzed, 5)
+        # Lima salinan identik: 4 pasangan bertetangga, bukan 10 pasangan
+        self.assertEqual(len(pairs), 4)
+        self.assertTrue(all(similarity == 1.0 for _, _, similarity in pairs))
+
+
+class SubmissionCursorPaginationTest(TestCase):
+    SUBMISSIONS = 25
+
+    def setUp(self):
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+        course = Course.objects.create(name='Kursor', code='CUR101', description='-', lecturer=self.lecturer)
+        assignment = Assignment.objects.create(
+            course=course, title='Tugas', description='-', due_date=timezone.now(),
+        )
+        for index in range(self.SUBMISSIONS):
+            student = User.objects.create_user(f'student{index}', role='student')
+            Submission.objects.create(assignment=assignment, student=student, file_url='x')
+        # Semua submitted_at sama: urutan ditentukan tiebreaker id
+        Submission.objects.update(submitted_at=timezone.now())
+        self.client = APIClient()
+        self.client.force_authenticate(self.lecturer)
+
+    def test_pages_follow_id_tiebreaker_without_count(self):
+        seen, query_counts = [], []
+        url = '/api/submissions/?cursor='
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in query['sql'].upper() for query in queries))
+            query_counts.append(len(queries))
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+
+        expected = list(Submission.objects.order_by('-submitted_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+        # Per halaman: query halaman + konteks otorisasi (users.context), berapapun isinya
+        self.assertEqual(query_counts, [2] * len(query_counts))
+
+
+class BulkGradeTest(TestCase):
+    def setUp(self):
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+        course = Course.objects.create(name='Nilai', code='BULK101', description='-', lecturer=self.lecturer)
+        self.assignment = Assignment.objects.create(
+            course=course, title='Tugas', description='-', due_date=timezone.now(),
+        )
+        self.submissions = []
+        for index in range(6):
+            student = User.objects.create_user(f'student{index}', role='student')
+            self.submissions.append(Submission.objects.create(
+                assignment=self.assignment, student=student, file_url='x', feedback='lama',
+            ))
+        self.url = f'/api/assignments/{self.assignment.pk}/bulk-grade/'
+        self.client = APIClient()
+        self.client.force_authenticate(self.lecturer)
+
+    def grade(self, submissions, grade):
+        return self.client.post(self.url, [
+            {'id': submission.pk, 'grade': grade} for submission in submissions
+        ], format='json')
+
+    def test_query_count_does_not_depend_on_rows(self):
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.grade(self.submissions[:2], 70).status_code, 200)
+        with CaptureQueriesContext(connection) as many:
+            response = self.grade(self.submissions, 80)
+
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(response.data, {'assignment': self.assignment.pk, 'updated': 6})
+        # Feedback yang tidak dikirim tetap
+        self.assertEqual(set(Submission.objects.values_list('grade', 'feedback')), {(80, 'lama')})
+        stats = AssignmentStats.objects.get(assignment=self.assignment)
+        self.assertEqual((stats.graded_count, stats.grade_sum, stats.bucket_8), (6, 480, 6))
+
+    def test_unknown_submission_rejects_the_whole_batch(self):
+        other = Assignment.objects.create(
+            course=self.assignment.course, title='Lain', description='-', due_date=timezone.now(),
+        )
+        foreign = Submission.objects.create(assignment=other, student=self.submissions[0].student, file_url='x')
+
+        response = self.grade([self.submissions[0], foreign], 90)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['ids'], [str(foreign.pk)])
+        self.assertFalse(Submission.objects.filter(grade__isnull=False).exists())
 
-# Create your tests here.
+    def test_only_course_lecturer_can_grade(self):
+        self.client.force_authenticate(User.objects.create_user('dosen2', role='lecturer'))
+        self.assertEqual(self.grade(self.submissions, 90).status_code, 403)
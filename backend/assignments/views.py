@@ -1,8 +1,29 @@
+from django.db import transaction
+from django.db.models import F
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from .models import Assignment, Submission
-from .serializers import AssignmentSerializer, SubmissionSerializer
-from users.permissions import IsLecturerOrAdmin
+from rest_framework.response import Response
+from .calendar import feed_token, get_feed, user_id_from_token
+from .models import Assignment, AssignmentStats, Submission
+from .similarity import DEFAULT_THRESHOLD, find_similar_pairs
+from .stats import rebuild_stats, stats_payload
+from .serializers import (
+    AssignmentSerializer, BulkGradeItemSerializer, DeadlineSerializer, DeadlineWindowSerializer, SubmissionSerializer,
+)
+from users.context import get_auth_context
+from users.permissions import IsCourseOwner, IsLecturerOrAdmin
+
+# Batas jumlah baris per request bulk grading
+MAX_BULK_GRADES = 1000
+# Batas jumlah pasangan di report similarity
+MAX_SIMILAR_PAIRS = 1000
 
 class AssignmentViewSet(viewsets.ModelViewSet):
     # BARIS INI WAJIB ADA agar router tidak error "basename argument not specified"
@@ -10,26 +31,179 @@ class AssignmentViewSet(viewsets.ModelViewSet):
     
     serializer_class = AssignmentSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('due_date', 'id')
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Assignment.objects.all()
+        # course_detail (beserta lecturer_detail) tanpa query per baris
+        queryset = Assignment.objects.select_related('course__lecturer')
 
         # Jika user belum login (anonymous), return list kosong
         if not user.is_authenticated:
             return queryset.none()
 
         # Jika student, HANYA tampilkan assignment dari course yang diambil
+        # (id course dari AuthContext, tanpa join enrollments yang bisa menduplikasi baris)
         if user.role == 'student':
-            queryset = queryset.filter(course__enrollments__student=user)
-        
-        return queryset.order_by('due_date')
+            queryset = queryset.filter(course_id__in=get_auth_context(self.request).enrolled_course_ids)
+
+        # Window deadline: /api/assignments/?due_after=...&due_before=...
+        # (index assignment_course_due_idx)
+        window = self.get_deadline_window()
+        if 'due_after' in window:
+            queryset = queryset.filter(due_date__gte=window['due_after'])
+        if 'due_before' in window:
+            queryset = queryset.filter(due_date__lte=window['due_before'])
+
+        return queryset.order_by('due_date', 'id')
+
+    def get_deadline_window(self):
+        serializer = DeadlineWindowSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @action(detail=False, methods=['get'])
+    def deadlines(self, request):
+        """
+        Deadline ringkas tanpa course_detail bersarang.
+        URL: /api/assignments/deadlines/?due_after=&due_before=
+        Tanpa due_after, hanya deadline yang belum lewat.
+        """
+        queryset = self.get_queryset()
+        if 'due_after' not in self.get_deadline_window():
+            queryset = queryset.filter(due_date__gte=timezone.now())
+        rows = queryset.values(
+            'id', 'title', 'due_date', 'course_id',
+            course_code=F('course__code'), course_name=F('course__name'),
+        )
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(DeadlineSerializer(page, many=True).data)
+        return Response(DeadlineSerializer(rows, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        URL feed iCalendar pribadi untuk aplikasi kalender.
+        URL: /api/assignments/calendar/
+        """
+        path = reverse('assignment-calendar-feed', args=[feed_token(request.user.pk)])
+        return Response({'url': request.build_absolute_uri(path)})
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsLecturerOrAdmin()]
+        if self.action in ['bulk_grade', 'similarity', 'stats']:
+            return [IsLecturerOrAdmin(), IsCourseOwner()]
         return [IsAuthenticated()]
 
+    # API: POST /api/assignments/{id}/bulk-grade/
+    # Body: [{"id": 12, "grade": 85, "feedback": "Bagus"}, ...]
+    @action(detail=True, methods=['post'], url_path='bulk-grade')
+    def bulk_grade(self, request, pk=None):
+        # Ownership dicek sekali di sini (IsCourseOwner), bukan per submission
+        assignment = self.get_object()
+        serializer = BulkGradeItemSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=MAX_BULK_GRADES
+        )
+        serializer.is_valid(raise_exception=True)
+        items = {}
+        for item in serializer.validated_data:
+            if item['id'] in items:
+                raise ValidationError({'detail': f"Duplicate submission id {item['id']}."})
+            items[item['id']] = item
+
+        with transaction.atomic():
+            submissions = list(
+                Submission.objects.select_for_update()
+                .filter(assignment=assignment, pk__in=items)
+                .only('id', 'grade', 'feedback')
+            )
+            missing = set(items) - {submission.pk for submission in submissions}
+            if missing:
+                raise ValidationError({
+                    'detail': 'Submissions not found for this assignment.',
+                    'ids': sorted(missing),
+                })
+
+            removed, added = [], []
+            for submission in submissions:
+                item = items[submission.pk]
+                if submission.grade != item['grade']:
+                    removed.append(submission.grade)
+                    added.append(item['grade'])
+                submission.grade = item['grade']
+                if 'feedback' in item:
+                    submission.feedback = item['feedback']
+            Submission.objects.bulk_update(submissions, ['grade', 'feedback'], batch_size=500)
+            # bulk_update tidak memicu signal: statistik di-update sekali untuk semua baris
+            AssignmentStats.apply_changes(assignment.pk, removed=removed, added=added)
+
+        return Response({'assignment': assignment.pk, 'updated': len(submissions)})
+
+    # API: GET /api/assignments/{id}/stats/
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Mean, median, histogram, submission rate dan jumlah belum dinilai"""
+        stats = None
+        if str(pk).isascii() and str(pk).isdigit():
+            stats = (
+                AssignmentStats.objects.select_related('assignment__course')
+                .filter(assignment_id=pk)
+                .first()
+            )
+        if stats is None:
+            # Row belum ada (assignment lama): hitung sekali, selanjutnya incremental
+            stats = rebuild_stats(self.get_object())
+        else:
+            self.check_object_permissions(request, stats.assignment)
+
+        enrolled = stats.assignment.course.active_students_count
+        return Response(stats_payload(stats, enrolled))
+
+    # API: GET /api/assignments/{id}/similarity/?threshold=0.5&limit=100
+    @action(detail=True, methods=['get'])
+    def similarity(self, request, pk=None):
+        """Pasangan submission yang isinya mirip (perkiraan Jaccard dari MinHash)"""
+        assignment = self.get_object()
+        try:
+            threshold = float(request.query_params.get('threshold', DEFAULT_THRESHOLD))
+            limit = int(request.query_params.get('limit', 100))
+        except ValueError:
+            raise ValidationError({'detail': 'threshold and limit must be numbers.'})
+        if not 0 < threshold <= 1:
+            raise ValidationError({'threshold': 'Must be between 0 and 1.'})
+        limit = max(1, min(limit, MAX_SIMILAR_PAIRS))
+
+        pairs, analyzed = find_similar_pairs(assignment.pk, threshold)
+        shown = pairs[:limit]
+
+        # Satu query untuk username semua submission yang tampil
+        submission_ids = {submission_id for pair in shown for submission_id in pair[:2]}
+        students = dict(
+            Submission.objects.filter(pk__in=submission_ids).values_list('id', 'student__username')
+        )
+        total_submissions = Submission.objects.filter(assignment=assignment).count()
+
+        return Response({
+            'assignment': assignment.pk,
+            'threshold': threshold,
+            'submissions': total_submissions,
+            'analyzed': analyzed,
+            'pairs_found': len(pairs),
+            'pairs': [
+                {
+                    'submission_a': first,
+                    'student_a': students.get(first),
+                    'submission_b': second,
+                    'student_b': students.get(second),
+                    'similarity': round(similarity, 3),
+                }
+                for first, second, similarity in shown
+            ],
+        })
+
 class SubmissionViewSet(viewsets.ModelViewSet):
     queryset = Submission.objects.all()
     serializer_class = SubmissionSerializer
@@ -41,8 +215,32 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         if not user.is_authenticated:
             return Submission.objects.none()
 
+        # Semua FK yang di-serialize (student_detail, assignment_detail.course_detail)
+        # ikut di-load, jadi biaya satu halaman tidak tergantung jumlah baris
+        queryset = Submission.objects.select_related('student', 'assignment__course__lecturer')
+
         # Student hanya melihat submission miliknya sendiri
         if user.role == 'student':
-            return Submission.objects.filter(student=user)
+            return queryset.filter(student=user)
         # Dosen melihat semua submission
-        return Submission.objects.all()
\ No newline at end of file
+        return queryset
+
+
+@require_safe
+def calendar_feed(request, token):
+    """
+    Feed .ics per user: /api/calendar/<token>.ics (tanpa JWT, token di URL).
+    Disajikan dari cache (key berisi versi data feed); klien yang mengirim If-None-Match mendapat 304.
+    """
+    user_id = user_id_from_token(token)
+    feed = get_feed(user_id) if user_id is not None else None
+    if feed is None:
+        raise Http404
+
+    body, etag = feed
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=300)
+    return response
@@ -1,14 +1,20 @@
 from django.contrib import admin
-from .models import Course, Enrollment
+from .models import Course, Enrollment, WaitlistEntry
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
-    list_display = ('code', 'name', 'lecturer', 'created_at')
+    list_display = ('code', 'name', 'lecturer', 'capacity', 'students_count', 'active_students_count', 'created_at')
     search_fields = ('name', 'code')
     list_filter = ('created_at',)
 
 @admin.register(Enrollment)
 class EnrollmentAdmin(admin.ModelAdmin):
-    list_display = ('student', 'course', 'enrolled_at')
-    list_filter = ('enrolled_at',)
-    search_fields = ('student__username', 'course__name')
\ No newline at end of file
+    list_display = ('student', 'course', 'is_active', 'enrolled_at')
+    list_filter = ('is_active', 'enrolled_at')
+    search_fields = ('student__username', 'course__name')
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('student', 'course', 'created_at')
+    list_filter = ('created_at',)
+    search_fields = ('student__username', 'course__name')
@@ -0,0 +1,206 @@
+"""
+Jalur enroll yang aman untuk banyak request bersamaan (registration rush).
+
+- Insert enrollment memakai INSERT ... ON CONFLICT DO NOTHING (idempotent),
+  bukan get_or_create, sehingga race pada unique_together tidak jadi 500.
+- Jika course punya capacity, kursi diambil dengan UPDATE bersyarat
+  (active_students_count < capacity) yang atomic di database.
+- Jika penuh, student masuk waitlist dan dipromosikan FIFO saat kursi kosong.
+
+Insert di sini tidak memicu post_save, jadi counter course di-update langsung.
+"""
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Course, Enrollment, WaitlistEntry
+
+ENROLLED = 'enrolled'
+ALREADY_ENROLLED = 'already_enrolled'
+WAITLISTED = 'waitlisted'
+ALREADY_WAITLISTED = 'already_waitlisted'
+
+
+# Batas baris per INSERT (SQLite membatasi jumlah parameter per query)
+INSERT_BATCH_SIZE = 200
+
+
+def insert_ignore_conflicts(model, rows, conflict_fields, returning='pk'):
+    """
+    INSERT ... VALUES (...), (...) ON CONFLICT (...) DO NOTHING RETURNING <returning>.
+    rows: list dict field -> nilai (key sama untuk semua baris).
+    Return list nilai `returning` untuk baris yang benar-benar di-insert.
+    """
+    if not rows:
+        return []
+    opts = model._meta
+    quote = connection.ops.quote_name
+    fields = [opts.get_field(name) for name in rows[0]]
+    returning_field = opts.pk if returning == 'pk' else opts.get_field(returning)
+    row_placeholder = '({})'.format(', '.join(['%s'] * len(fields)))
+
+    inserted = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            batch = rows[start:start + INSERT_BATCH_SIZE]
+            params = [
+                field.get_db_prep_save(row[field.name], connection)
+                for row in batch for field in fields
+            ]
+            sql = 'INSERT INTO {table} ({columns}) VALUES {values} ON CONFLICT ({conflict}) DO NOTHING RETURNING {returning}'.format(
+                table=quote(opts.db_table),
+                columns=', '.join(quote(field.column) for field in fields),
+                values=', '.join([row_placeholder] * len(batch)),
+                conflict=', '.join(quote(opts.get_field(name).column) for name in conflict_fields),
+                returning=quote(returning_field.column),
+            )
+            cursor.execute(sql, params)
+            inserted.extend(row[0] for row in cursor.fetchall())
+    return inserted
+
+
+def _insert_ignore_conflict(model, values, conflict_fields):
+    """
+    INSERT ... ON CONFLICT (...) DO NOTHING RETURNING id.
+    Return id baris baru, atau None jika baris sudah ada.
+    """
+    inserted = insert_ignore_conflicts(model, [values], conflict_fields)
+    return inserted[0] if inserted else None
+
+
+def _reserve_seat(course_id):
+    """Ambil satu kursi secara atomic; False jika course penuh"""
+    return bool(
+        Course.objects.filter(pk=course_id)
+        .filter(Q(capacity__isnull=True) | Q(active_students_count__lt=F('capacity')))
+        .update(
+            students_count=F('students_count') + 1,
+            active_students_count=F('active_students_count') + 1,
+            updated_at=timezone.now(),
+        )
+    )
+
+
+class _CourseFull(Exception):
+    pass
+
+
+def _claim_seat(course_id, student_id):
+    """
+    Insert enrollment lalu ambil kursi, dalam satu savepoint.
+    Return ENROLLED, ALREADY_ENROLLED, atau None jika course penuh
+    (insert di-rollback).
+    """
+    try:
+        with transaction.atomic():
+            enrollment_id = _insert_ignore_conflict(
+                Enrollment,
+                {
+                    'student': student_id,
+                    'course': course_id,
+                    'enrolled_at': timezone.now(),
+                    'is_active': True,
+                },
+                conflict_fields=['student', 'course'],
+            )
+            if enrollment_id is None:
+                return ALREADY_ENROLLED
+            if not _reserve_seat(course_id):
+                raise _CourseFull
+    except _CourseFull:
+        return None
+    return ENROLLED
+
+
+def enroll_student(course, student):
+    """
+    Enroll student ke course. Return salah satu status:
+    ENROLLED, ALREADY_ENROLLED, WAITLISTED, ALREADY_WAITLISTED.
+    """
+    with transaction.atomic():
+        result = _claim_seat(course.pk, student.pk)
+        if result is None:
+            waitlist_id = _insert_ignore_conflict(
+                WaitlistEntry,
+                {'student': student.pk, 'course': course.pk, 'created_at': timezone.now()},
+                conflict_fields=['student', 'course'],
+            )
+            return WAITLISTED if waitlist_id else ALREADY_WAITLISTED
+
+        if result == ENROLLED:
+            # Jika sebelumnya ada di waitlist, hapus
+            WaitlistEntry.objects.filter(course=course, student=student).delete()
+        return result
+
+
+def bulk_enroll_students(course_id, student_ids):
+    """
+    Enroll banyak student sekaligus (bulk-enroll lecturer) tanpa melewati
+    capacity. `student_ids` urut prioritas: jika kursi tidak cukup, yang
+    di depan yang mendapat kursi. Return (enrolled, full): student yang baru
+    di-enroll dan student yang tidak kebagian kursi. Student yang sudah
+    ter-enroll tidak ada di keduanya.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        # Insert dulu baru kunci row course: urutan lock sama dengan _claim_seat
+        inserted = set(insert_ignore_conflicts(
+            Enrollment,
+            [
+                {'student': student_id, 'course': course_id, 'enrolled_at': now, 'is_active': True}
+                for student_id in sorted(student_ids)
+            ],
+            conflict_fields=['student', 'course'],
+            returning='student',
+        ))
+        new_ids = [student_id for student_id in student_ids if student_id in inserted]
+
+        course = Course.objects.select_for_update().only('capacity', 'active_students_count').get(pk=course_id)
+        if course.capacity is None:
+            free = len(new_ids)
+        else:
+            free = max(course.capacity - course.active_students_count, 0)
+        enrolled, full = new_ids[:free], new_ids[free:]
+
+        if full:
+            # Tanpa signal: baris ini belum pernah dihitung di counter course
+            Enrollment.objects.filter(course_id=course_id, student_id__in=full)._raw_delete(Enrollment.objects.db)
+        Course.adjust_enrollment_counts(course_id, total=len(enrolled), active=len(enrolled))
+        WaitlistEntry.objects.filter(course_id=course_id, student_id__in=enrolled).delete()
+    return enrolled, full
+
+
+def waitlist_position(course, student):
+    """Posisi (mulai dari 1) student di waitlist course, atau None"""
+    entry = WaitlistEntry.objects.filter(course=course, student=student).first()
+    if entry is None:
+        return None
+    return WaitlistEntry.objects.filter(course=course).filter(
+        Q(created_at__lt=entry.created_at) |
+        Q(created_at=entry.created_at, id__lte=entry.id)
+    ).count()
+
+
+def promote_waitlist(course_id):
+    """
+    Promosikan antrian waitlist (FIFO) selama masih ada kursi kosong.
+    Return jumlah student yang dipromosikan.
+    """
+    promoted = 0
+    while True:
+        with transaction.atomic():
+            entry = (
+                WaitlistEntry.objects.select_for_update(skip_locked=True)
+                .filter(course_id=course_id)
+                .order_by('created_at', 'id')
+                .first()
+            )
+            if entry is None:
+                return promoted
+
+            result = _claim_seat(course_id, entry.student_id)
+            if result is None:
+                return promoted
+            if result == ENROLLED:
+                promoted += 1
+            entry.delete()
@@ -0,0 +1,159 @@
+"""
+Thumbnail dan varian WebP untuk Course.image.
+
+Upload asli (sering foto HP berukuran MB) di-resize ke beberapa lebar tetap,
+disimpan sebagai JPEG dan WebP, lalu path-nya dicatat di Course.image_variants.
+Proses berjalan di thread pool di luar request thread, dijadwalkan setelah
+transaksi commit (lihat courses.signals).
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Lebar varian (px) -> dipakai sebagai descriptor "320w" di srcset
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+VARIANT_DIR = 'courses/variants'
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS,
+            thread_name_prefix='course-image',
+        )
+    return _executor
+
+
+def schedule_variants(course_id):
+    """Jadwalkan pembuatan varian; sinkron jika IMAGE_VARIANT_WORKERS = 0"""
+    if settings.IMAGE_VARIANT_WORKERS <= 0:
+        generate_variants(course_id)
+        return
+    _get_executor().submit(_run_in_worker, course_id)
+
+
+def _run_in_worker(course_id):
+    close_old_connections()
+    try:
+        generate_variants(course_id)
+    except Exception:
+        logger.exception("Failed to generate image variants for course %s", course_id)
+    finally:
+        connection.close()
+
+
+def _variant_name(image_name, width, ext):
+    stem = os.path.splitext(os.path.basename(image_name))[0]
+    return f"{VARIANT_DIR}/{stem}_{width}w.{ext}"
+
+
+def render_variants(source):
+    """
+    Resize satu gambar ke semua VARIANT_WIDTHS.
+    Return list (lebar, ext, bytes); lebar yang melebihi gambar asli dilewati
+    (kecuali varian terkecil, yang dibuat seukuran gambar asli).
+    """
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+        rendered = []
+        for width in VARIANT_WIDTHS:
+            if width > image.width and width != VARIANT_WIDTHS[0]:
+                continue
+            target = min(width, image.width)
+            height = max(1, round(image.height * target / image.width))
+            resized = image.resize((target, height), Image.Resampling.LANCZOS)
+
+            for ext, (fmt, options) in VARIANT_FORMATS.items():
+                output = resized.convert('RGB') if fmt == 'JPEG' else resized
+                buffer = BytesIO()
+                output.save(buffer, fmt, **options)
+                rendered.append((target, ext, buffer.getvalue()))
+        return rendered
+
+
+def generate_variants(course_id):
+    """Buat varian untuk satu course dan simpan ke Course.image_variants"""
+    from .models import Course
+
+    course = Course.objects.filter(pk=course_id).only('id', 'image', 'image_variants').first()
+    if course is None:
+        return None
+
+    old_paths = variant_paths(course.image_variants)
+    if not course.image:
+        variants = {}
+    else:
+        with course.image.open('rb') as source:
+            rendered = render_variants(source)
+
+        variants = {}
+        for width, ext, data in rendered:
+            name = _variant_name(course.image.name, width, ext)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            saved = default_storage.save(name, ContentFile(data))
+            variants.setdefault(str(width), {})[ext] = saved
+
+    # Hanya simpan jika image belum diganti lagi selama proses berjalan
+    current = Course.objects.filter(pk=course_id)
+    if course.image:
+        current = current.filter(image=course.image.name)
+    else:
+        current = current.filter(Q(image='') | Q(image__isnull=True))
+    updated = current.update(image_variants=variants, updated_at=timezone.now())
+    new_paths = variant_paths(variants)
+    if not updated:
+        stale = new_paths
+    elif getattr(default_storage, 'reference_counted', False):
+        # Setiap save menambah referensi, jadi semua referensi lama dilepas
+        # walaupun namanya sama (isi identik -> blob yang sama)
+        stale = old_paths
+    else:
+        stale = old_paths - new_paths
+    delete_files(stale)
+    return variants if updated else None
+
+
+def variant_paths(variants):
+    return {path for formats in (variants or {}).values() for path in formats.values()}
+
+
+def delete_files(paths):
+    for path in paths:
+        try:
+            default_storage.delete(path)
+        except OSError:
+            logger.warning("Could not delete image variant %s", path)
+
+
+def build_srcset(variants, build_url):
+    """
+    Map format -> string srcset, misalnya
+    {'webp': '/media/..._320w.webp 320w, /media/..._640w.webp 640w', 'jpeg': '...'}
+    """
+    srcset = {}
+    for width in sorted(variants or {}, key=int):
+        for ext, path in variants[width].items():
+            srcset.setdefault(ext, []).append(f"{build_url(default_storage.url(path))} {width}w")
+    return {ext: ', '.join(entries) for ext, entries in srcset.items()}
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from courses.images import generate_variants
+from courses.models import Course
+
+
+def _generate(course_id):
+    try:
+        return course_id, generate_variants(course_id), None
+    except Exception as exc:
+        return course_id, None, exc
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Backfill thumbnail & WebP variants for existing Course images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of images processed in parallel (default: 4)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants even for courses that already have them',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Course.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['force']:
+            queryset = queryset.filter(image_variants={})
+        course_ids = list(queryset.values_list('pk', flat=True))
+
+        if not course_ids:
+            self.stdout.write(self.style.SUCCESS("No course images need variants."))
+            return
+
+        self.stdout.write(f"Generating variants for {len(course_ids)} course image(s)...")
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            futures = [executor.submit(_generate, course_id) for course_id in course_ids]
+            for future in as_completed(futures):
+                course_id, _, error = future.result()
+                if error is not None:
+                    failed += 1
+                    self.stderr.write(f"✗ Course {course_id}: {error}")
+                else:
+                    done += 1
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Generated variants for {done} course(s), {failed} failed"))
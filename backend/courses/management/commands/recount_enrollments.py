@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from courses.models import Course, Enrollment
+
+
+def _count_subquery(**filters):
+    """Subquery jumlah enrollment per course (dipakai di dalam UPDATE)"""
+    subquery = (
+        Enrollment.objects.filter(course=OuterRef('pk'), **filters)
+        .order_by()
+        .values('course')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = "Recompute Course.students_count / active_students_count from Enrollment rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report courses whose counters have drifted',
+        )
+
+    def handle(self, *args, **options):
+        real_total = _count_subquery()
+        real_active = _count_subquery(is_active=True)
+
+        drifted = Course.objects.annotate(
+            real_total=real_total,
+            real_active=real_active,
+        ).filter(
+            ~Q(students_count=F('real_total')) | ~Q(active_students_count=F('real_active'))
+        )
+
+        drifted_ids = list(drifted.values_list('pk', flat=True))
+        if not drifted_ids:
+            self.stdout.write(self.style.SUCCESS("All enrollment counters are correct."))
+            return
+
+        self.stdout.write(f"Found {len(drifted_ids)} course(s) with drifted counters.")
+        if options['dry_run']:
+            return
+
+        # Satu UPDATE untuk semua course yang drift
+        with transaction.atomic():
+            updated = Course.objects.filter(pk__in=drifted_ids).update(
+                students_count=_count_subquery(),
+                active_students_count=_count_subquery(is_active=True),
+                updated_at=timezone.now(),
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Repaired counters on {updated} course(s)"))
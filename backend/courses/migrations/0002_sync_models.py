@@ -0,0 +1,65 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='module',
+            name='course',
+        ),
+        migrations.AlterModelOptions(
+            name='course',
+            options={},
+        ),
+        migrations.RenameField(
+            model_name='course',
+            old_name='title',
+            new_name='name',
+        ),
+        migrations.RemoveField(
+            model_name='course',
+            name='duration',
+        ),
+        migrations.RemoveField(
+            model_name='course',
+            name='instructor',
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='code',
+            field=models.CharField(default='', max_length=20, unique=True),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='duration_weeks',
+            field=models.IntegerField(default=12),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='lecturer',
+            field=models.ForeignKey(default=1, limit_choices_to={'role': 'lecturer'}, on_delete=django.db.models.deletion.CASCADE, related_name='teaching_courses', to=settings.AUTH_USER_MODEL),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to='courses/'),
+        ),
+        migrations.DeleteModel(
+            name='Lesson',
+        ),
+        migrations.DeleteModel(
+            name='Module',
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:43
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_enrollment_counts(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    for course in Course.objects.annotate(
+        total=Count('enrollments'),
+        active=Count('enrollments', filter=Q(enrollments__is_active=True)),
+    ).filter(total__gt=0).iterator():
+        Course.objects.filter(pk=course.pk).update(
+            students_count=course.total,
+            active_students_count=course.active,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_sync_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='active_students_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='students_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(backfill_enrollment_counts, migrations.RunPython.noop),
+    ]
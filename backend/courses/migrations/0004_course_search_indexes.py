@@ -0,0 +1,55 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Index, TextField
+from django.db.models.functions import Cast, Upper
+
+
+def search_indexes():
+    # Hanya untuk PostgreSQL. Ekspresi disalin (bukan di-import) dari
+    # courses.search.course_search_vector / course_code_prefix_expression agar
+    # migration tidak berubah saat modul itu diubah; harus tetap sama persis
+    return [
+        GinIndex(
+            SearchVector('name', weight='A', config='simple')
+            + SearchVector('code', weight='A', config='simple')
+            + SearchVector('description', weight='B', config='simple'),
+            name='course_search_document_idx',
+        ),
+        GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='course_name_trgm_idx'),
+        GinIndex(fields=['code'], opclasses=['gin_trgm_ops'], name='course_code_trgm_idx'),
+        Index(
+            OpClass(Upper(Cast('code', output_field=TextField())), name='text_pattern_ops'),
+            name='course_code_prefix_idx',
+        ),
+    ]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Course = apps.get_model('courses', 'Course')
+    for index in search_indexes():
+        schema_editor.add_index(Course, index)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Course = apps.get_model('courses', 'Course')
+    for index in search_indexes():
+        schema_editor.remove_index(Course, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_enrollment_counters'),
+    ]
+
+    operations = [
+        # CREATE EXTENSION hanya dijalankan di PostgreSQL
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
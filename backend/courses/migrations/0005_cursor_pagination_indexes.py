@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', '-enrolled_at', '-id'], name='enrollment_student_cursor_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_course_capacity_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from django.conf import settings
 
 class Course(models.Model):
@@ -12,13 +15,57 @@ class Course(models.Model):
         related_name='teaching_courses'
     )
     duration_weeks = models.IntegerField(default=12)
+    # Kosong = tanpa batas kursi; jika penuh, student masuk waitlist
+    capacity = models.PositiveIntegerField(null=True, blank=True)
     image = models.ImageField(upload_to='courses/', null=True, blank=True)
+    # {"320": {"webp": "courses/variants/..", "jpeg": ".."}, ...} diisi oleh courses.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Counter denormalisasi, dijaga oleh courses.signals (lihat recount_enrollments)
+    students_count = models.PositiveIntegerField(default=0, editable=False)
+    active_students_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Hanya diubah lewat UPDATE di database (F expression / worker image), tidak
+    # pernah lewat save() biasa: instance yang di-load sebelum enroll bersamaan
+    # akan menimpa nilai terbaru dengan nilai lamanya
+    DB_MANAGED_FIELDS = ('students_count', 'active_students_count', 'image_variants')
+
     def __str__(self):
         return f"{self.code} - {self.name}"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not args and kwargs.get('update_fields') is None \
+                and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DB_MANAGED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan nama image awal untuk mendeteksi upload baru di courses.signals
+        instance._loaded_image = instance.__dict__.get('image')
+        return instance
+
+    @classmethod
+    def adjust_enrollment_counts(cls, course_id, total=0, active=0):
+        """
+        Update counter enrollment secara atomic di database (F expression),
+        sehingga enroll yang bersamaan tidak saling menimpa.
+        """
+        updates = {}
+        if total:
+            updates['students_count'] = Greatest(F('students_count') + total, 0)
+        if active:
+            updates['active_students_count'] = Greatest(F('active_students_count') + active, 0)
+        if updates:
+            # updated_at ikut berubah agar ETag course ikut berubah
+            updates['updated_at'] = timezone.now()
+            cls.objects.filter(pk=course_id).update(**updates)
+
 class Enrollment(models.Model):
     student = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
@@ -31,10 +78,48 @@ class Enrollment(models.Model):
         related_name='enrollments' # PENTING untuk filtering course.enrollments
     )
     enrolled_at = models.DateTimeField(auto_now_add=True)
+    is_active = models.BooleanField(default=True)
 
     class Meta:
         unique_together = ['student', 'course'] # Mencegah double enroll
         ordering = ['-enrolled_at']
+        indexes = [
+            # Keyset pagination /api/enrollments/ (filter student, urut -enrolled_at, -id)
+            models.Index(fields=['student', '-enrolled_at', '-id'], name='enrollment_student_cursor_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student.username} -> {self.course.code}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan nilai awal untuk update counter di courses.signals
+        instance._loaded_course_id = instance.__dict__.get('course_id')
+        instance._loaded_is_active = instance.__dict__.get('is_active')
+        return instance
+
+
+class WaitlistEntry(models.Model):
+    """Antrian student saat course penuh, dipromosikan FIFO saat ada kursi kosong"""
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='waitlist_entries'
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='waitlist_entries'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['student', 'course']
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['course', 'created_at', 'id'], name='waitlist_course_fifo_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.student.username} -> {self.course.code}"
\ No newline at end of file
+        return f"{self.student.username} (waitlist) -> {self.course.code}"
@@ -0,0 +1,78 @@
+"""
+Pencarian course.
+
+Di PostgreSQL memakai full-text search (SearchVector + GIN index) yang
+digabung dengan trigram similarity (pg_trgm) untuk pencocokan typo pada
+name/code, lalu diurutkan berdasarkan relevansi. Di database lain
+(SQLite untuk development) kembali ke pencarian icontains biasa.
+
+Ekspresi di bawah harus sama persis dengan index di migration
+courses/0004_course_search_indexes agar planner memakai index.
+"""
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db import connection
+from django.db.models import F, Q, TextField
+from django.db.models.functions import Cast, Greatest, Upper
+
+SEARCH_CONFIG = 'simple'
+AUTOCOMPLETE_LIMIT = 10
+
+
+def course_search_vector():
+    """Dokumen full-text course: name/code berbobot A, description berbobot B"""
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('code', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def course_code_prefix_expression():
+    """Ekspresi UPPER(code::text) yang dipakai lookup istartswith di PostgreSQL"""
+    return Upper(Cast('code', output_field=TextField()))
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def search_courses(queryset, term):
+    """
+    Filter dan ranking course berdasarkan kata kunci.
+    Di PostgreSQL hasil terurut berdasarkan relevansi (annotation `search_score`),
+    selain itu terurut dari yang terbaru seperti sebelumnya.
+    """
+    if not is_postgres():
+        return queryset.filter(
+            Q(name__icontains=term) |
+            Q(code__icontains=term) |
+            Q(description__icontains=term)
+        ).order_by('-created_at')
+
+    query = SearchQuery(term, search_type='websearch', config=SEARCH_CONFIG)
+    # alias(): dokumen tsvector tidak ikut di-SELECT, hanya dipakai filter & rank
+    queryset = queryset.alias(
+        search_document=course_search_vector(),
+        search_similarity=Greatest(
+            TrigramSimilarity('name', term),
+            TrigramSimilarity('code', term),
+        ),
+    ).annotate(
+        search_score=SearchRank(F('search_document'), query) + F('search_similarity'),
+    )
+    return queryset.filter(
+        Q(search_document=query) |
+        Q(name__trigram_similar=term) |
+        Q(code__trigram_similar=term)
+    ).order_by('-search_score', '-created_at')
+
+
+def autocomplete_courses(queryset, prefix):
+    """Prefix match pada code (memakai index UPPER(code) text_pattern_ops di PostgreSQL)"""
+    return queryset.filter(code__istartswith=prefix).order_by('code')
+
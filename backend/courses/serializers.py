@@ -1,30 +1,40 @@
+import csv
+import io
+
 from rest_framework import serializers
 from .models import Course, Enrollment
+from users.context import get_auth_context
 from users.serializers import UserSerializer
+from .images import build_srcset
 
 class CourseSerializer(serializers.ModelSerializer):
     lecturer_detail = UserSerializer(source='lecturer', read_only=True)
-    students_count = serializers.SerializerMethodField()
+    students_count = serializers.IntegerField(read_only=True)
+    active_students_count = serializers.IntegerField(read_only=True)
     is_enrolled = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Course
         fields = [
             'id', 'name', 'code', 'description', 
             'lecturer', 'lecturer_detail', 
-            'duration_weeks', 'image', 
-            'students_count', 'is_enrolled', 'created_at'
+            'duration_weeks', 'capacity', 'image', 'image_srcset', 
+            'students_count', 'active_students_count', 'is_enrolled', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
 
-    def get_students_count(self, obj):
-        return obj.enrollments.count()
+    def get_image_srcset(self, obj):
+        # {"webp": "url 320w, url 640w, ...", "jpeg": "..."} untuk <picture>/<img srcset>
+        request = self.context.get('request')
+        build_url = request.build_absolute_uri if request else (lambda url: url)
+        return build_srcset(obj.image_variants, build_url)
 
     def get_is_enrolled(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            # Cek apakah user sudah enroll di course ini
-            return Enrollment.objects.filter(student=request.user, course=obj).exists()
+            # Set course id yang diikuti di-load sekali per request (users.context)
+            return get_auth_context(request).is_enrolled(obj.id)
         return False
 
 class EnrollmentSerializer(serializers.ModelSerializer):
@@ -33,5 +43,39 @@ class EnrollmentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Enrollment
-        fields = ['id', 'student', 'course', 'course_detail', 'enrolled_at']
-        read_only_fields = ['id', 'enrolled_at']
\ No newline at end of file
+        fields = ['id', 'student', 'course', 'course_detail', 'is_active', 'enrolled_at']
+        read_only_fields = ['id', 'enrolled_at']
+
+
+class BulkEnrollSerializer(serializers.Serializer):
+    """
+    Input bulk enroll: list username/id di `students`, atau file CSV di `file`
+    (kolom pertama berisi username atau id, header opsional).
+    """
+    CSV_HEADERS = {'username', 'id', 'student', 'student_id'}
+
+    students = serializers.ListField(child=serializers.CharField(), required=False)
+    file = serializers.FileField(required=False)
+
+    def validate(self, attrs):
+        identifiers = [value.strip() for value in attrs.get('students', [])]
+
+        upload = attrs.get('file')
+        if upload:
+            try:
+                text = upload.read().decode('utf-8-sig')
+            except UnicodeDecodeError:
+                raise serializers.ValidationError({'file': 'CSV must be UTF-8 encoded.'})
+            for row in csv.reader(io.StringIO(text)):
+                if row and row[0].strip():
+                    identifiers.append(row[0].strip())
+            if identifiers and identifiers[0].lower() in self.CSV_HEADERS:
+                identifiers.pop(0)
+
+        # Hilangkan duplikat tapi pertahankan urutan input
+        identifiers = list(dict.fromkeys(value for value in identifiers if value))
+        if not identifiers:
+            raise serializers.ValidationError('Provide a list of students or a CSV file.')
+
+        attrs['identifiers'] = identifiers
+        return attrs
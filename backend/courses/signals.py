@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Course, Enrollment
+from .images import delete_files, schedule_variants, variant_paths
+
+
+def _promote_waitlist_on_commit(course_id):
+    """Kursi mungkin kosong: promosikan waitlist setelah transaksi commit"""
+    from .enrollment import promote_waitlist
+    transaction.on_commit(lambda: promote_waitlist(course_id))
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_saved(sender, instance, created, **kwargs):
+    """Jaga students_count / active_students_count saat enrollment dibuat atau diubah"""
+    active = 1 if instance.is_active else 0
+    if created:
+        Course.adjust_enrollment_counts(instance.course_id, total=1, active=active)
+    else:
+        old_course_id = getattr(instance, '_loaded_course_id', None) or instance.course_id
+        was_active = 1 if getattr(instance, '_loaded_is_active', instance.is_active) else 0
+        if old_course_id != instance.course_id:
+            # Enrollment dipindah ke course lain
+            Course.adjust_enrollment_counts(old_course_id, total=-1, active=-was_active)
+            Course.adjust_enrollment_counts(instance.course_id, total=1, active=active)
+            _promote_waitlist_on_commit(old_course_id)
+        elif was_active != active:
+            Course.adjust_enrollment_counts(instance.course_id, active=active - was_active)
+            if not active:
+                _promote_waitlist_on_commit(instance.course_id)
+
+    instance._loaded_course_id = instance.course_id
+    instance._loaded_is_active = instance.is_active
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    """Dipanggil juga untuk delete dari admin dan cascade (hapus user/course)"""
+    was_active = getattr(instance, '_loaded_is_active', instance.is_active)
+    Course.adjust_enrollment_counts(
+        instance.course_id, total=-1, active=-1 if was_active else 0
+    )
+    if was_active:
+        _promote_waitlist_on_commit(instance.course_id)
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, created, **kwargs):
+    """Capacity bisa dinaikkan atau dihapus dari API maupun admin"""
+    if not created:
+        _promote_waitlist_on_commit(instance.pk)
+
+    # Upload image baru -> buat thumbnail/WebP di worker pool setelah commit
+    image_name = instance.image.name if instance.image else None
+    old_image = getattr(instance, '_loaded_image', None) or None
+    if image_name != old_image:
+        course_id = instance.pk
+        transaction.on_commit(lambda: schedule_variants(course_id))
+        # Image lama tidak direferensikan lagi (di CAS: refcount dikurangi)
+        if old_image:
+            transaction.on_commit(lambda: delete_files({old_image}))
+    instance._loaded_image = image_name
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    paths = variant_paths(instance.image_variants)
+    if instance.image:
+        paths.add(instance.image.name)
+    if paths:
+        transaction.on_commit(lambda: delete_files(paths))
@@ -1,3 +1,371 @@
-from django.test import TestCase
+import importlib
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.test import APIClient
+
+from users.models import User
+from .models import Course, Enrollment, WaitlistEntry
+from .search import course_code_prefix_expression, course_search_vector
+from .views import CourseViewSet
+
+
+class EnrollmentTestMixin:
+    CAPACITY = 5
+    STUDENTS = 20
+
+    def setUp(self):
+        lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.course = Course.objects.create(
+            name='Registration Rush', code='RUSH101', description='-',
+            lecturer=lecturer, capacity=self.CAPACITY,
+        )
+        self.students = [
+            User.objects.create_user(f'student{i}', role='student')
+            for i in range(self.STUDENTS)
+        ]
+
+
+# Test DB SQLite (in-memory, shared cache) mengunci per tabel sehingga request
+# paralel langsung gagal "table is locked"; jalankan dengan PostgreSQL.
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentEnrollmentTest(EnrollmentTestMixin, TransactionTestCase):
+    """Banyak student enroll bersamaan ke satu course dengan capacity terbatas"""
+
+    def _fire(self, users):
+        barrier = threading.Barrier(len(users))
+        statuses = []
+        lock = threading.Lock()
+
+        def enroll(user):
+            client = APIClient()
+            client.force_authenticate(user)
+            barrier.wait()
+            try:
+                response = client.post(f'/api/courses/{self.course.id}/enroll/')
+                with lock:
+                    statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=enroll, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    def test_parallel_enroll_does_not_overbook(self):
+        statuses = self._fire(self.students)
+
+        self.assertEqual(len(statuses), self.STUDENTS)
+        self.assertNotIn(500, statuses)
+        self.assertEqual(statuses.count(201), self.CAPACITY)
+        self.assertEqual(statuses.count(202), self.STUDENTS - self.CAPACITY)
+
+        self.course.refresh_from_db()
+        self.assertEqual(Enrollment.objects.filter(course=self.course).count(), self.CAPACITY)
+        self.assertEqual(self.course.active_students_count, self.CAPACITY)
+        self.assertEqual(self.course.students_count, self.CAPACITY)
+        self.assertEqual(
+            WaitlistEntry.objects.filter(course=self.course).count(),
+            self.STUDENTS - self.CAPACITY,
+        )
+
+    def test_parallel_duplicate_enroll_is_idempotent(self):
+        self.course.capacity = None
+        self.course.save()
+        student = self.students[0]
+
+        statuses = self._fire([student] * 10)
+
+        self.assertNotIn(500, statuses)
+        self.assertEqual(statuses.count(201), 1)
+        self.assertEqual(statuses.count(400), 9)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.students_count, 1)
+
+
+class WaitlistTest(EnrollmentTestMixin, TransactionTestCase):
+    """TransactionTestCase agar promosi waitlist (transaction.on_commit) ikut jalan"""
+
+    def test_waitlist_promoted_in_fifo_order(self):
+        client = APIClient()
+        for student in self.students[:self.CAPACITY + 2]:
+            client.force_authenticate(student)
+            client.post(f'/api/courses/{self.course.id}/enroll/')
+
+        Enrollment.objects.get(course=self.course, student=self.students[0]).delete()
+
+        first_waiting, second_waiting = self.students[self.CAPACITY:self.CAPACITY + 2]
+        self.assertTrue(Enrollment.objects.filter(course=self.course, student=first_waiting).exists())
+        self.assertFalse(Enrollment.objects.filter(course=self.course, student=second_waiting).exists())
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_students_count, self.CAPACITY)
+
+    def test_enrollment_endpoint_reports_waitlist(self):
+        client = APIClient()
+        statuses = []
+        for student in self.students[:self.CAPACITY + 1]:
+            client.force_authenticate(student)
+            response = client.post('/api/enrollments/', {'course': self.course.id, 'student': student.id})
+            statuses.append(response.status_code)
+
+        self.assertEqual(statuses, [201] * self.CAPACITY + [202])
+        self.assertEqual(response.data['status'], 'waitlisted')
+        self.assertEqual(response.data['position'], 1)
+        self.assertTrue(
+            WaitlistEntry.objects.filter(course=self.course, student=self.students[self.CAPACITY]).exists()
+        )
+
+
+class CourseCounterTest(EnrollmentTestMixin, TestCase):
+    def test_stale_instance_save_keeps_counters(self):
+        stale = Course.objects.get(pk=self.course.pk)
+        for student in self.students[:2]:
+            Enrollment.objects.create(course=self.course, student=student)
+
+        stale.name = 'Registration Rush (baru)'
+        stale.save()
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.name, 'Registration Rush (baru)')
+        self.assertEqual(self.course.students_count, 2)
+        self.assertEqual(self.course.active_students_count, 2)
+
+    def test_course_save_during_enrollment_does_not_overbook(self):
+        Course.objects.filter(pk=self.course.pk).update(capacity=2)
+        stale = Course.objects.get(pk=self.course.pk)
+        client = APIClient()
+        statuses = []
+        for index, student in enumerate(self.students[:3]):
+            if index == 2:
+                # Lecturer menyimpan form course yang dibuka sebelum dua enroll di atas
+                stale.description = 'diubah'
+                stale.save()
+            client.force_authenticate(student)
+            statuses.append(client.post(f'/api/courses/{self.course.id}/enroll/').status_code)
+
+        self.assertEqual(statuses, [201, 201, 202])
+        self.assertEqual(Enrollment.objects.filter(course=self.course).count(), 2)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_students_count, 2)
+
+
+class BulkEnrollTest(EnrollmentTestMixin, TestCase):
+    def test_counts_only_inserted_rows(self):
+        Enrollment.objects.create(course=self.course, student=self.students[0])
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.students_count, 1)
+
+        client = APIClient()
+        client.force_authenticate(self.course.lecturer)
+        response = client.post(f'/api/courses/{self.course.id}/bulk-enroll/', {
+            'students': ['student0', 'student1', str(self.students[2].id), 'dosen', 'tidak-ada'],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data['summary'],
+            {'enrolled': 2, 'already_enrolled': 1, 'course_full': 0, 'unknown': 1, 'not_student': 1},
+        )
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.students_count, 3)
+        self.assertEqual(self.course.active_students_count, 3)
+        self.assertEqual(Enrollment.objects.filter(course=self.course).count(), 3)
+
+
+    def bulk_enroll(self, students):
+        client = APIClient()
+        client.force_authenticate(self.course.lecturer)
+        response = client.post(
+            f'/api/courses/{self.course.id}/bulk-enroll/', {'students': students}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_capacity_is_respected_in_input_order(self):
+        Enrollment.objects.create(course=self.course, student=self.students[0])
+        names = [student.username for student in self.students[:8]]
+
+        response = self.bulk_enroll(list(reversed(names)))
+
+        self.assertEqual(response.data['summary']['enrolled'], self.CAPACITY - 1)
+        self.assertEqual(response.data['summary']['course_full'], 3)
+        enrolled = set(Enrollment.objects.filter(course=self.course).values_list('student__username', flat=True))
+        self.assertEqual(enrolled, {'student0', 'student7', 'student6', 'student5', 'student4'})
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.active_students_count, self.CAPACITY)
+        self.assertEqual(self.course.students_count, self.CAPACITY)
+
+    def test_enrolled_students_leave_the_waitlist(self):
+        WaitlistEntry.objects.create(course=self.course, student=self.students[0])
+        WaitlistEntry.objects.create(course=self.course, student=self.students[1])
+
+        self.bulk_enroll(['student0'])
+
+        waiting = WaitlistEntry.objects.filter(course=self.course).values_list('student', flat=True)
+        self.assertEqual(list(waiting), [self.students[1].id])
+
+    def test_non_ascii_digits_are_unknown(self):
+        response = self.bulk_enroll(['²', '٣'])
+        self.assertEqual(response.data['summary']['unknown'], 2)
+
+
+class ConditionalGetTest(EnrollmentTestMixin, TestCase):
+    def test_change_within_same_second_is_not_304(self):
+        client = APIClient()
+        client.force_authenticate(self.students[0])
+        url = f'/api/courses/{self.course.id}/'
+        first = client.get(url)
+        self.assertNotIn('Last-Modified', first)
+
+        self.course.description = 'diubah'
+        self.course.save()
+        # If-Modified-Since di masa depan saja tidak cukup untuk 304
+        response = client.get(
+            url, HTTP_IF_NONE_MATCH=first['ETag'], HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['description'], 'diubah')
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalid_lookup_is_404(self):
+        client = APIClient()
+        client.force_authenticate(self.students[0])
+        self.assertEqual(client.get('/api/courses/abc/').status_code, 404)
+        self.assertEqual(client.get(f'/api/courses/{self.course.id + 1000}/').status_code, 404)
+
+    def test_object_permission_checked_before_304(self):
+        client = APIClient()
+        client.force_authenticate(self.students[0])
+        url = f'/api/courses/{self.course.id}/'
+        etag = client.get(url)['ETag']
+
+        denied = mock.patch.object(
+            CourseViewSet, 'check_object_permissions', side_effect=PermissionDenied()
+        )
+        with denied:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
+
+class CourseSearchTest(TestCase):
+    def setUp(self):
+        lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.web = Course.objects.create(name='Pemrograman Web', code='WEB101', description='HTML dan CSS', lecturer=lecturer)
+        self.webx = Course.objects.create(name='Web Lanjut', code='WEB201', description='-', lecturer=lecturer)
+        self.db = Course.objects.create(name='Basis Data', code='DB101', description='Normalisasi', lecturer=lecturer)
+        self.client = APIClient()
+        self.client.force_authenticate(lecturer)
+
+    def test_search_and_autocomplete(self):
+        response = self.client.get('/api/courses/', {'search': 'normalisasi'})
+        self.assertEqual([course['id'] for course in response.data['results']], [self.db.id])
+
+        response = self.client.get('/api/courses/autocomplete/', {'q': 'web'})
+        self.assertEqual([course['code'] for course in response.data], ['WEB101', 'WEB201'])
+
+    def test_migration_indexes_match_search_expressions(self):
+        # Migration menyalin ekspresinya; planner hanya memakai index jika sama persis
+        migration = importlib.import_module('courses.migrations.0004_course_search_indexes')
+        indexes = {index.name: index for index in migration.search_indexes()}
+        self.assertEqual(indexes['course_search_document_idx'].expressions[0], course_search_vector())
+        prefix = indexes['course_code_prefix_idx'].expressions[0]
+        self.assertEqual(prefix.source_expressions[0], course_code_prefix_expression())
+
+
+class CourseListQueryTest(EnrollmentTestMixin, TestCase):
+    def list_courses(self):
+        client = APIClient()
+        client.force_authenticate(self.students[0])
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/courses/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], len(queries)
+
+    def test_query_count_does_not_grow_with_courses(self):
+        Enrollment.objects.create(course=self.course, student=self.students[0])
+        _, baseline = self.list_courses()
+
+        for index in range(5):
+            lecturer = User.objects.create_user(f'dosen{index}', role='lecturer')
+            course = Course.objects.create(name=f'Course {index}', code=f'C{index}', description='-', lecturer=lecturer)
+            Enrollment.objects.create(course=course, student=self.students[1])
+        results, count = self.list_courses()
+
+        self.assertEqual(count, baseline)
+        self.assertEqual(len(results), 6)
+        by_code = {course['code']: course for course in results}
+        self.assertTrue(by_code['RUSH101']['is_enrolled'])
+        self.assertEqual(by_code['RUSH101']['students_count'], 1)
+        self.assertEqual(by_code['RUSH101']['lecturer_detail']['username'], 'dosen')
+        self.assertFalse(by_code['C0']['is_enrolled'])
+        self.assertEqual(by_code['C0']['students_count'], 1)
+
+
+class CourseImageVariantTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, IMAGE_VARIANT_WORKERS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+
+    def image(self, name='foto.png', size=(800, 400)):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'teal').save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def test_upload_generates_resized_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(
+                name='Gambar', code='IMG101', description='-', lecturer=self.lecturer, image=self.image(),
+            )
+
+        course.refresh_from_db()
+        # 1280 lebih lebar dari gambar asli (800px): dilewati
+        self.assertEqual(set(course.image_variants), {'320', '640'})
+        for width, formats in course.image_variants.items():
+            self.assertEqual(set(formats), {'webp', 'jpeg'})
+            with default_storage.open(formats['webp']) as handle, Image.open(handle) as variant:
+                self.assertEqual(variant.format, 'WEBP')
+                self.assertEqual(variant.size, (int(width), int(width) // 2))
+
+        client = APIClient()
+        client.force_authenticate(self.lecturer)
+        srcset = client.get(f'/api/courses/{course.id}/').data['image_srcset']
+        self.assertEqual(set(srcset), {'webp', 'jpeg'})
+        self.assertTrue(srcset['webp'].endswith(' 640w'))
+
+    def test_replacing_image_drops_old_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(
+                name='Gambar', code='IMG101', description='-', lecturer=self.lecturer, image=self.image(),
+            )
+        course.refresh_from_db()
+        old_paths = {path for formats in course.image_variants.values() for path in formats.values()}
+
+        course.image = self.image('baru.png', size=(300, 300))
+        with self.captureOnCommitCallbacks(execute=True):
+            course.save()
+
+        course.refresh_from_db()
+        # Lebih kecil dari varian terkecil: dibuat seukuran aslinya
+        self.assertEqual(set(course.image_variants), {'300'})
+        self.assertEqual(course.image_variants['300'].keys(), {'webp', 'jpeg'})
+        for path in old_paths:
+            self.assertFalse(default_storage.exists(path))
@@ -1,40 +1,74 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
-from django.db.models import Q
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.db.models import Max, Q
 from .models import Course, Enrollment
-from .serializers import CourseSerializer, EnrollmentSerializer
-from users.permissions import IsLecturerOrAdmin
+from .serializers import BulkEnrollSerializer, CourseSerializer, EnrollmentSerializer
+from .search import AUTOCOMPLETE_LIMIT, autocomplete_courses, search_courses
+from .enrollment import (
+    ALREADY_ENROLLED, ALREADY_WAITLISTED, ENROLLED, WAITLISTED, bulk_enroll_students, enroll_student,
+    waitlist_position,
+)
+from assignments.gradebook import (
+    gradebook_assignments, gradebook_snapshot, iter_gradebook_csv, iter_gradebook_rows,
+)
+from eduplatform.conditional import ConditionalGetMixin
+from eduplatform.streaming import buffered
+from users.models import User
+from users.context import get_auth_context
+from users.permissions import IsCourseOwner, IsLecturerOrAdmin
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
+    # Dipakai mode ?cursor= (Course tidak punya Meta.ordering)
+    cursor_ordering = ('-created_at', '-id')
+
+    def get_validator_aggregates(self):
+        # lecturer_detail ikut di-serialize
+        aggregates = super().get_validator_aggregates()
+        aggregates['lecturer_modified'] = Max('lecturer__updated_at')
+        return aggregates
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsLecturerOrAdmin()]
+        if self.action in ['bulk_enroll', 'gradebook', 'gradebook_export']:
+            return [IsLecturerOrAdmin(), IsCourseOwner()]
         return [IsAuthenticatedOrReadOnly()]
 
     def get_queryset(self):
-        queryset = Course.objects.all()
         user = self.request.user
 
+        # Jumlah student dibaca dari kolom students_count (counter denormalisasi),
+        # lecturer di-load sekaligus; is_enrolled dicek di AuthContext (users.context)
+        queryset = Course.objects.select_related('lecturer')
+
         # Filter 1: Jika request minta "enrolled only"
         if self.request.query_params.get('enrolled') == 'true' and user.is_authenticated:
-            queryset = queryset.filter(enrollments__student=user).distinct()
+            queryset = queryset.filter(id__in=get_auth_context(self.request).enrolled_course_ids)
         
-        # Filter 2: Search
+        # Filter 2: Search (full-text + trigram di PostgreSQL, icontains di SQLite)
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | 
-                Q(code__icontains=search) |
-                Q(description__icontains=search)
-            )
-            
+            return search_courses(queryset, search)
+
         return queryset.order_by('-created_at')
 
+    # API: GET /api/courses/autocomplete/?q=WEB
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        prefix = request.query_params.get('q', '').strip()
+        if not prefix:
+            return Response([])
+
+        courses = autocomplete_courses(Course.objects.all(), prefix)
+        return Response(list(courses.values('id', 'code', 'name')[:AUTOCOMPLETE_LIMIT]))
+
     # API: POST /api/courses/{id}/enroll/
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def enroll(self, request, pk=None):
@@ -47,24 +81,156 @@ class CourseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Gunakan get_or_create untuk menghandle unique constraint
-        enrollment, created = Enrollment.objects.get_or_create(student=user, course=course)
-        
-        if not created:
+        # INSERT ... ON CONFLICT DO NOTHING + kursi atomic (lihat courses.enrollment)
+        result = enroll_student(course, user)
+
+        if result == ALREADY_ENROLLED:
             return Response(
                 {'detail': 'Already enrolled.'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
-            
+
+        if result in (WAITLISTED, ALREADY_WAITLISTED):
+            return Response(
+                {
+                    'detail': 'Course is full, added to waitlist.',
+                    'status': 'waitlisted',
+                    'position': waitlist_position(course, user),
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+
         return Response(
             {'detail': 'Enrolled successfully', 'status': 'enrolled'}, 
             status=status.HTTP_201_CREATED
         )
 
+    # API: POST /api/courses/{id}/bulk-enroll/
+    # Body: {"students": ["andi", "budi", 42]} atau multipart dengan file CSV
+    @action(detail=True, methods=['post'], url_path='bulk-enroll')
+    def bulk_enroll(self, request, pk=None):
+        course = self.get_object()
+        serializer = BulkEnrollSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        identifiers = serializer.validated_data['identifiers']
+
+        # Resolve semua user dalam satu query (username atau id)
+        numeric_ids = [int(value) for value in identifiers if value.isascii() and value.isdigit()]
+        users = User.objects.filter(
+            Q(username__in=identifiers) | Q(id__in=numeric_ids)
+        ).only('id', 'username', 'role')
+        by_username = {user.username: user for user in users}
+        by_id = {str(user.id): user for user in users}
+
+        resolved = {}
+        for value in identifiers:
+            user = by_username.get(value) or by_id.get(value)
+            if user is not None:
+                resolved[value] = user
+
+        # Urutan input menentukan siapa yang mendapat kursi jika capacity tidak cukup.
+        # Insert langsung tidak memicu signal; counter dan waitlist diurus bulk_enroll_students
+        student_ids = list(dict.fromkeys(user.id for user in resolved.values() if user.role == 'student'))
+        enrolled_ids, full_ids = bulk_enroll_students(course.pk, student_ids)
+        enrolled_ids, full_ids = set(enrolled_ids), set(full_ids)
+
+        results = []
+        for value in identifiers:
+            user = resolved.get(value)
+            if user is None:
+                row_status = 'unknown'
+            elif user.role != 'student':
+                row_status = 'not_student'
+            elif user.id in enrolled_ids:
+                row_status = 'enrolled'
+            elif user.id in full_ids:
+                row_status = 'course_full'
+            else:
+                row_status = 'already_enrolled'
+            results.append({
+                'input': value,
+                'user_id': user.id if user else None,
+                'username': user.username if user else None,
+                'status': row_status,
+            })
+
+        summary = {key: 0 for key in ('enrolled', 'already_enrolled', 'course_full', 'unknown', 'not_student')}
+        for row in results:
+            summary[row['status']] += 1
+
+        return Response({'summary': summary, 'results': results}, status=status.HTTP_200_OK)
+
+    # API: GET /api/courses/{id}/gradebook/
+    @action(detail=True, methods=['get'])
+    def gradebook(self, request, pk=None):
+        """
+        Matriks nilai student x assignment. `grades[i][j]` adalah submission
+        student ke-i untuk assignment ke-j (null jika belum submit).
+        """
+        course = self.get_object()
+        students, grades = [], []
+        with gradebook_snapshot():
+            assignments = gradebook_assignments(course)
+            for student, cells in iter_gradebook_rows(course, assignments):
+                students.append(student)
+                grades.append(cells)
+
+        return Response({
+            'course': {'id': course.id, 'code': course.code, 'name': course.name},
+            'assignments': assignments,
+            'students': students,
+            'grades': grades,
+        })
+
+    # API: GET /api/courses/{id}/gradebook/export/ (CSV, di-stream per baris)
+    @action(detail=True, methods=['get'], url_path='gradebook/export')
+    def gradebook_export(self, request, pk=None):
+        course = self.get_object()
+        response = StreamingHttpResponse(
+            buffered(iter_gradebook_csv(course)), content_type='text/csv; charset=utf-8'
+        )
+        filename = f"gradebook-{course.code or course.pk}.csv"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
 class EnrollmentViewSet(viewsets.ModelViewSet):
     queryset = Enrollment.objects.all()
     serializer_class = EnrollmentSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Enrollment.objects.filter(student=self.request.user)
\ No newline at end of file
+        return Enrollment.objects.filter(student=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        # Lewat jalur enroll yang sama dengan /courses/{id}/enroll/ (capacity + waitlist),
+        # termasuk respons 202 saat masuk waitlist
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        course = serializer.validated_data['course']
+        student = serializer.validated_data['student']
+
+        result = enroll_student(course, student)
+        if result in (WAITLISTED, ALREADY_WAITLISTED):
+            return Response(
+                {
+                    'detail': 'Course is full, added to waitlist.',
+                    'status': 'waitlisted',
+                    'position': waitlist_position(course, student),
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+        if result != ENROLLED:
+            raise ValidationError({'detail': 'Already enrolled.'})
+
+        serializer.instance = Enrollment.objects.get(course=course, student=student)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    # Counter course di-update oleh courses.signals di dalam transaksi yang sama
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
\ No newline at end of file
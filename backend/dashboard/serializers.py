@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+
+class DashboardCourseSerializer(serializers.Serializer):
+    """Course ringkas untuk dashboard (tanpa lecturer_detail / nested)"""
+    id = serializers.IntegerField()
+    code = serializers.CharField()
+    name = serializers.CharField()
+    image = serializers.CharField(allow_null=True)
+    students_count = serializers.IntegerField()
+    unread_discussions = serializers.IntegerField()
+
+
+class DashboardAssignmentSerializer(serializers.Serializer):
+    """Deadline assignment ringkas, course hanya id/code/name"""
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    due_date = serializers.DateTimeField()
+    course_id = serializers.IntegerField()
+    course_code = serializers.CharField()
+    course_name = serializers.CharField()
+    # Student: status submission miliknya
+    status = serializers.CharField(required=False)
+    submission_id = serializers.IntegerField(required=False)
+    grade = serializers.IntegerField(required=False)
+    # Lecturer/admin: jumlah submission masuk
+    submissions_count = serializers.IntegerField(required=False)
+
+
+class DashboardSerializer(serializers.Serializer):
+    courses = DashboardCourseSerializer(many=True)
+    upcoming_assignments = DashboardAssignmentSerializer(many=True)
+    unread_discussions_total = serializers.IntegerField()
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from assignments.models import Assignment, Submission
+from courses.models import Course, Enrollment
+from discussions.models import Discussion, DiscussionComment
+from users.models import User
+
+
+class DashboardTest(TestCase):
+    def setUp(self):
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.student = User.objects.create_user('ani', role='student')
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def add_course(self, code, assignments=2):
+        course = Course.objects.create(name=f'Course {code}', code=code, description='-', lecturer=self.lecturer)
+        Enrollment.objects.create(student=self.student, course=course)
+        for index in range(assignments):
+            Assignment.objects.create(
+                course=course, title=f'{code} tugas {index}', description='-',
+                due_date=timezone.now() + timedelta(days=index + 1),
+            )
+        discussion = Discussion.objects.create(title='Halo', content='-', user=self.lecturer, course=course)
+        DiscussionComment.objects.create(discussion=discussion, user=self.lecturer, content='baru')
+        return course
+
+    def test_query_count_is_fixed(self):
+        self.add_course('A101')
+        with self.assertNumQueries(3):
+            self.client.get('/api/dashboard/')
+
+        for code in ['B101', 'C101', 'D101']:
+            self.add_course(code, assignments=3)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/dashboard/', {'limit': 20})
+
+        self.assertEqual(len(response.data['courses']), 4)
+        self.assertEqual(len(response.data['upcoming_assignments']), 11)
+        self.assertEqual(response.data['unread_discussions_total'], 4)
+
+    def test_student_submission_status(self):
+        course = self.add_course('A101', assignments=3)
+        first, second, _ = Assignment.objects.filter(course=course).order_by('due_date')
+        Submission.objects.create(assignment=first, student=self.student, file_url='x', grade=80)
+        Submission.objects.create(assignment=second, student=self.student, file_url='x')
+
+        response = self.client.get('/api/dashboard/')
+
+        statuses = [row['status'] for row in response.data['upcoming_assignments']]
+        self.assertEqual(statuses, ['graded', 'submitted', 'pending'])
+        self.assertNotIn('course_detail', response.data['upcoming_assignments'][0])
@@ -0,0 +1,112 @@
+from django.core.files.storage import default_storage
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.utils import timezone
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from assignments.models import Assignment, Submission
+from courses.models import Course
+from discussions.unread import unread_discussions_by_course
+from .serializers import DashboardSerializer
+
+DEFAULT_ASSIGNMENT_LIMIT = 5
+MAX_ASSIGNMENT_LIMIT = 50
+
+
+class DashboardView(APIView):
+    """
+    Data halaman home dalam satu request: course user, deadline terdekat,
+    status submission, dan jumlah diskusi belum dibaca.
+    URL: /api/dashboard/?limit=5
+
+    Dibangun dengan jumlah query tetap (course, assignment, unread)
+    memakai .values() sehingga tidak ada serializer bersarang.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        limit = self._get_limit(request)
+
+        # Query 1: course yang diikuti (student) atau diajar (lecturer/admin)
+        if user.role == 'student':
+            courses_qs = Course.objects.filter(
+                enrollments__student=user, enrollments__is_active=True
+            )
+        else:
+            courses_qs = Course.objects.filter(lecturer=user)
+        courses = list(
+            courses_qs.order_by('name').values('id', 'code', 'name', 'image', 'students_count')
+        )
+        course_ids = [course['id'] for course in courses]
+
+        # Query 2: deadline terdekat + status submission / jumlah submission
+        assignments_qs = Assignment.objects.filter(
+            course_id__in=course_ids, due_date__gte=timezone.now()
+        ).order_by('due_date')
+        fields = ['id', 'title', 'due_date', 'course_id', 'course__code', 'course__name']
+        if user.role == 'student':
+            own_submission = Submission.objects.filter(assignment=OuterRef('pk'), student=user)
+            assignments_qs = assignments_qs.annotate(
+                submission_id=Subquery(own_submission.values('id')[:1]),
+                grade=Subquery(own_submission.values('grade')[:1]),
+            )
+            fields += ['submission_id', 'grade']
+        else:
+            submission_counts = (
+                Submission.objects.filter(assignment=OuterRef('pk'))
+                .order_by()
+                .values('assignment')
+                .annotate(total=Count('pk'))
+                .values('total')
+            )
+            assignments_qs = assignments_qs.annotate(
+                submissions_count=Subquery(submission_counts, output_field=IntegerField()),
+            )
+            fields += ['submissions_count']
+
+        upcoming = []
+        for row in assignments_qs.values(*fields)[:limit]:
+            row['course_code'] = row.pop('course__code')
+            row['course_name'] = row.pop('course__name')
+            if user.role == 'student':
+                if row['submission_id'] is None:
+                    row['status'] = 'pending'
+                elif row['grade'] is None:
+                    row['status'] = 'submitted'
+                else:
+                    row['status'] = 'graded'
+            else:
+                row['submissions_count'] = row['submissions_count'] or 0
+            upcoming.append(row)
+
+        # Query 3: jumlah diskusi yang belum dibaca per course
+        unread = self._unread_by_course(user, course_ids)
+        for course in courses:
+            image = course['image']
+            course['image'] = request.build_absolute_uri(default_storage.url(image)) if image else None
+            course['unread_discussions'] = unread.get(course['id'], 0)
+
+        serializer = DashboardSerializer({
+            'courses': courses,
+            'upcoming_assignments': upcoming,
+            'unread_discussions_total': sum(unread.values()),
+        })
+        return Response(serializer.data)
+
+    def _get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_ASSIGNMENT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_ASSIGNMENT_LIMIT
+        return max(1, min(limit, MAX_ASSIGNMENT_LIMIT))
+
+    def _unread_by_course(self, user, course_ids):
+        """
+        Diskusi dengan komentar setelah watermark baca user (DiscussionRead),
+        dikelompokkan per course.
+        """
+        if not course_ids:
+            return {}
+        return unread_discussions_by_course(user, course_ids)
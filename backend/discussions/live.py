@@ -0,0 +1,111 @@
+"""
+Update discussion secara live lewat server-sent events (SSE).
+
+  GET /api/discussions/{id}/events/  event komentar satu discussion
+  GET /api/courses/{id}/events/      event komentar semua discussion di course
+
+Setiap event berisi delta kecil (satu komentar), bukan payload discussion
+utuh, sehingga tab yang terbuka cukup memegang satu koneksi idle alih-alih
+polling. Event dikirim oleh discussions.signals lewat eduplatform.pubsub.
+
+Endpoint ini butuh server ASGI (proses `events` di Procfile, lihat
+eduplatform.asgi); di bawah WSGI dijawab 501.
+"""
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from courses.models import Course
+from eduplatform.pubsub import OVERFLOW, get_broker, publish
+from .models import Discussion
+
+# Isi komentar yang lebih panjang tidak ikut di event (batas payload NOTIFY);
+# client mengambilnya dari /api/discussion-comments/{id}/
+MAX_EVENT_CONTENT = 4000
+RETRY_MS = 5000
+
+
+def discussion_channel(discussion_id):
+    return f'discussion:{discussion_id}'
+
+
+def course_channel(course_id):
+    return f'course:{course_id}'
+
+
+def comment_event(event_type, comment, course_id=None):
+    """Delta untuk satu komentar: comment.created / comment.updated / comment.deleted"""
+    data = {
+        'id': comment.pk,
+        'parent': comment.parent_id,
+        'depth': comment.depth,
+    }
+    if event_type != 'comment.deleted':
+        content = comment.content
+        data.update({
+            'user': comment.user_id,
+            'username': comment.user.username,
+            'content': content if len(content) <= MAX_EVENT_CONTENT else None,
+            'content_truncated': len(content) > MAX_EVENT_CONTENT,
+            'created_at': comment.created_at.isoformat(),
+            'updated_at': comment.updated_at.isoformat(),
+        })
+    return {
+        'type': event_type,
+        'discussion': comment.discussion_id,
+        'course': course_id,
+        'comment': data,
+    }
+
+
+def publish_comment_event(event_type, comment, course_id=None):
+    event = comment_event(event_type, comment, course_id)
+    publish(discussion_channel(comment.discussion_id), event)
+    if course_id is not None:
+        publish(course_channel(course_id), event)
+
+
+def _format(message):
+    if message is OVERFLOW:
+        # Terlalu banyak event tertunda: client sebaiknya memuat ulang data
+        return 'event: reset\ndata: {}\n\n'
+    data = json.dumps(message, cls=DjangoJSONEncoder)
+    return f"event: {message['type']}\ndata: {data}\n\n"
+
+
+async def _event_stream(channels):
+    async with get_broker().subscribe(channels) as subscription:
+        yield f'retry: {RETRY_MS}\n\n'
+        while True:
+            message = await subscription.get(timeout=settings.LIVE_EVENTS_KEEPALIVE)
+            # Komentar SSE sebagai keepalive agar proxy tidak menutup koneksi idle
+            yield ': keepalive\n\n' if message is None else _format(message)
+
+
+def _event_response(request, channels):
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Live events require the ASGI server'}, status=501)
+    response = StreamingHttpResponse(_event_stream(channels), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Nonaktifkan buffering response di nginx
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# Discussion bisa dibaca tanpa login (IsAuthenticatedOrReadOnly), begitu juga event-nya
+@require_GET
+async def discussion_events(request, pk):
+    if not await Discussion.objects.filter(pk=pk).aexists():
+        raise Http404
+    return _event_response(request, [discussion_channel(pk)])
+
+
+@require_GET
+async def course_events(request, pk):
+    if not await Course.objects.filter(pk=pk).aexists():
+        raise Http404
+    return _event_response(request, [course_channel(pk)])
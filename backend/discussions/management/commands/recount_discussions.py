@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+
+from discussions.models import Discussion
+
+
+class Command(BaseCommand):
+    help = "Recompute Discussion.comment_count / last_activity_at / last_commenter from comments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report discussions whose comment counters have drifted',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Discussion.objects.annotate(real_count=Count('comments')).filter(
+            ~Q(comment_count=F('real_count'))
+        )
+        drifted_ids = list(drifted.values_list('pk', flat=True))
+        self.stdout.write(f"Found {len(drifted_ids)} discussion(s) with drifted comment counts.")
+        if options['dry_run']:
+            return
+
+        # last_activity_at / last_commenter tidak bisa dicek murah, jadi semua dihitung ulang
+        updated = Discussion.recount_activity()
+        self.stdout.write(self.style.SUCCESS(f"✓ Recomputed activity summary on {updated} discussion(s)"))
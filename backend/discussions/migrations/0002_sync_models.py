@@ -0,0 +1,59 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='discussion',
+            options={'ordering': ['-created_at']},
+        ),
+        migrations.RemoveField(
+            model_name='discussion',
+            name='parent',
+        ),
+        migrations.AddField(
+            model_name='discussion',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='discussion',
+            name='title',
+            field=models.CharField(max_length=150),
+        ),
+        migrations.AlterField(
+            model_name='discussion',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='discussions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterModelTable(
+            name='discussion',
+            table='discussions',
+        ),
+        migrations.CreateModel(
+            name='DiscussionComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('discussion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='discussions.discussion')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='discussions.discussioncomment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='discussion_comments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'discussion_comments',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0002_sync_models'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='discussioncomment',
+            index=models.Index(fields=['created_at', 'id'], name='comment_cursor_idx'),
+        ),
+    ]
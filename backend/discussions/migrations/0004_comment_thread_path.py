@@ -0,0 +1,59 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+PATH_STEP = 11
+
+
+def backfill_paths(apps, schema_editor):
+    DiscussionComment = apps.get_model('discussions', 'DiscussionComment')
+    parents = dict(DiscussionComment.objects.values_list('pk', 'parent_id'))
+    paths = {}
+
+    def path_for(pk):
+        # Iteratif: rantai balasan bisa panjang
+        chain = []
+        while pk is not None and pk not in paths:
+            chain.append(pk)
+            pk = parents.get(pk)
+        prefix = paths.get(pk, '')
+        for item in reversed(chain):
+            prefix += f'{item:0{PATH_STEP - 1}d}/'
+            paths[item] = prefix
+        return prefix
+
+    batch = []
+    for pk in parents:
+        path = path_for(pk)
+        batch.append(DiscussionComment(pk=pk, path=path, depth=len(path) // PATH_STEP - 1))
+        if len(batch) >= 1000:
+            DiscussionComment.objects.bulk_update(batch, ['path', 'depth'])
+            batch = []
+    DiscussionComment.objects.bulk_update(batch, ['path', 'depth'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0003_cursor_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discussioncomment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='discussioncomment',
+            name='path',
+            field=models.CharField(blank=True, editable=False, max_length=231),
+        ),
+        migrations.AddIndex(
+            model_name='discussioncomment',
+            index=models.Index(fields=['discussion', 'path'], name='comment_thread_path_idx'),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
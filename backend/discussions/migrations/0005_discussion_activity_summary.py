@@ -0,0 +1,57 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_activity(apps, schema_editor):
+    Discussion = apps.get_model('discussions', 'Discussion')
+    DiscussionComment = apps.get_model('discussions', 'DiscussionComment')
+    comments = DiscussionComment.objects.filter(discussion=OuterRef('pk'))
+    latest = comments.order_by('-created_at', '-id')
+    count = comments.order_by().values('discussion').annotate(total=Count('pk')).values('total')
+    Discussion.objects.update(
+        comment_count=Coalesce(Subquery(count, output_field=IntegerField()), 0),
+        last_activity_at=Coalesce(Subquery(latest.values('created_at')[:1]), F('created_at')),
+        last_commenter_id=Subquery(latest.values('user_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_image_variants'),
+        ('discussions', '0004_comment_thread_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discussion',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='discussion',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddField(
+            model_name='discussion',
+            name='last_commenter',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='discussion',
+            index=models.Index(fields=['-last_activity_at', '-id'], name='discussion_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='discussion',
+            index=models.Index(fields=['course', '-last_activity_at', '-id'], name='discussion_course_activity_idx'),
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_last_comment(apps, schema_editor):
+    Discussion = apps.get_model('discussions', 'Discussion')
+    DiscussionComment = apps.get_model('discussions', 'DiscussionComment')
+    newest = DiscussionComment.objects.filter(discussion=OuterRef('pk')).order_by('-id')
+    Discussion.objects.update(last_comment_id=Coalesce(Subquery(newest.values('id')[:1]), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0005_discussion_activity_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiscussionRead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_comment_id', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'discussion_reads',
+            },
+        ),
+        migrations.AddField(
+            model_name='discussion',
+            name='last_comment_id',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='discussioncomment',
+            index=models.Index(fields=['discussion', 'id'], name='comment_discussion_id_idx'),
+        ),
+        migrations.AddField(
+            model_name='discussionread',
+            name='discussion',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reads', to='discussions.discussion'),
+        ),
+        migrations.AddField(
+            model_name='discussionread',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='discussion_reads', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='discussionread',
+            unique_together={('user', 'discussion')},
+        ),
+        migrations.RunPython(backfill_last_comment, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def seed_watermarks(apps, schema_editor):
+    """
+    Watermark awal dari aturan dashboard lama: discussion belum dibaca jika
+    ada komentar user lain setelah last_login. Watermark = id komentar
+    pertama seperti itu dikurangi satu, atau komentar terbaru jika tidak ada
+    (termasuk user yang belum pernah login). Watermark yang sudah ada (komentar
+    sendiri setelah 0006) tidak diubah.
+    """
+    Course = apps.get_model('courses', 'Course')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    User = apps.get_model('users', 'User')
+    Discussion = apps.get_model('discussions', 'Discussion')
+    DiscussionComment = apps.get_model('discussions', 'DiscussionComment')
+    DiscussionRead = apps.get_model('discussions', 'DiscussionRead')
+
+    batch = []
+
+    def flush():
+        DiscussionRead.objects.bulk_create(batch, ignore_conflicts=True)
+        batch.clear()
+
+    for course_id, lecturer_id in Course.objects.values_list('id', 'lecturer_id').iterator():
+        member_ids = set(
+            Enrollment.objects.filter(course_id=course_id, is_active=True).values_list('student_id', flat=True)
+        )
+        member_ids.add(lecturer_id)
+        last_logins = dict(User.objects.filter(pk__in=member_ids).values_list('pk', 'last_login'))
+
+        discussions = Discussion.objects.filter(course_id=course_id, last_comment_id__gt=0)
+        for discussion_id, last_comment_id in discussions.values_list('id', 'last_comment_id').iterator():
+            comments = list(
+                DiscussionComment.objects.filter(discussion_id=discussion_id)
+                .order_by('id')
+                .values_list('id', 'user_id', 'created_at')
+            )
+            for user_id, last_login in last_logins.items():
+                watermark = last_comment_id
+                if last_login is not None:
+                    for comment_id, author_id, created_at in comments:
+                        if author_id != user_id and created_at > last_login:
+                            watermark = comment_id - 1
+                            break
+                if watermark:
+                    batch.append(DiscussionRead(
+                        user_id=user_id, discussion_id=discussion_id, last_read_comment_id=watermark,
+                    ))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+    flush()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0006_discussion_read_watermarks'),
+        ('courses', '0007_course_image_variants'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_watermarks, migrations.RunPython.noop),
+    ]
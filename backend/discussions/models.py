@@ -1,7 +1,16 @@
 from django.db import models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
 from django.conf import settings
+from django.utils import timezone
 from courses.models import Course
 
+# Materialized path komentar: id tiap ancestor (termasuk diri sendiri)
+# dengan lebar tetap, misalnya '0000000012/0000000345/'. Urut berdasarkan
+# path = urutan thread (parent selalu sebelum balasannya).
+PATH_STEP = 11
+MAX_COMMENT_DEPTH = 20
+
 
 class Discussion(models.Model):
     """Discussion Model"""
@@ -17,16 +26,88 @@ class Discussion(models.Model):
         on_delete=models.CASCADE,
         related_name='discussions'
     )
+    # Ringkasan aktivitas (denormalisasi), dijaga oleh discussions.signals
+    # (lihat recount_discussions)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Id komentar terbaru (0 = belum ada), dibandingkan dengan DiscussionRead
+    last_comment_id = models.PositiveBigIntegerField(default=0, editable=False)
+    last_commenter = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'discussions'
         ordering = ['-created_at']
+        indexes = [
+            # Index forum: urut aktivitas terbaru, global dan per course
+            models.Index(fields=['-last_activity_at', '-id'], name='discussion_activity_idx'),
+            models.Index(fields=['course', '-last_activity_at', '-id'], name='discussion_course_activity_idx'),
+        ]
     
+    # Hanya diubah lewat UPDATE (record_comment, remove_comment, recount_activity);
+    # save() biasa dari instance lama tidak boleh menimpanya
+    DB_MANAGED_FIELDS = ('comment_count', 'last_activity_at', 'last_comment_id', 'last_commenter')
+
     def __str__(self):
         return f"{self.title} - {self.course.code}"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not args and kwargs.get('update_fields') is None \
+                and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DB_MANAGED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def record_comment(cls, discussion_id, comment):
+        """Komentar baru: counter naik (F expression) dan jadi aktivitas terakhir"""
+        cls.objects.filter(pk=discussion_id).update(
+            comment_count=F('comment_count') + 1,
+            last_activity_at=comment.created_at,
+            last_commenter_id=comment.user_id,
+            last_comment_id=Greatest(F('last_comment_id'), comment.pk),
+        )
+
+    @classmethod
+    def remove_comment(cls, discussion_id):
+        """Komentar dihapus: aktivitas terakhir diambil dari komentar terbaru yang tersisa"""
+        latest = DiscussionComment.objects.filter(discussion=OuterRef('pk')).order_by('-created_at', '-id')
+        cls.objects.filter(pk=discussion_id).update(
+            comment_count=Greatest(F('comment_count') - 1, 0),
+            last_activity_at=Coalesce(Subquery(latest.values('created_at')[:1]), F('created_at')),
+            last_commenter_id=Subquery(latest.values('user_id')[:1]),
+            last_comment_id=cls._last_comment_id(),
+        )
+
+    @classmethod
+    def recount_activity(cls, queryset=None):
+        """Hitung ulang semua field ringkasan dari tabel komentar (satu UPDATE)"""
+        comments = DiscussionComment.objects.filter(discussion=OuterRef('pk'))
+        latest = comments.order_by('-created_at', '-id')
+        count = comments.order_by().values('discussion').annotate(total=Count('pk')).values('total')
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.update(
+            comment_count=Coalesce(Subquery(count, output_field=IntegerField()), 0),
+            last_activity_at=Coalesce(Subquery(latest.values('created_at')[:1]), F('created_at')),
+            last_commenter_id=Subquery(latest.values('user_id')[:1]),
+            last_comment_id=cls._last_comment_id(),
+        )
+
+    @staticmethod
+    def _last_comment_id():
+        newest = DiscussionComment.objects.filter(discussion=OuterRef('pk')).order_by('-id')
+        return Coalesce(Subquery(newest.values('id')[:1]), 0)
+
 
 class DiscussionComment(models.Model):
     """Discussion Comment Model"""
@@ -48,12 +129,62 @@ class DiscussionComment(models.Model):
         blank=True,
         related_name='replies'
     )
+    # Diisi discussions.signals setelah insert / saat parent berubah
+    path = models.CharField(max_length=PATH_STEP * (MAX_COMMENT_DEPTH + 1), blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'discussion_comments'
         ordering = ['created_at']
+        indexes = [
+            # Keyset pagination /api/discussion-comments/
+            models.Index(fields=['created_at', 'id'], name='comment_cursor_idx'),
+            # Hitung komentar setelah watermark DiscussionRead (id > last_read_comment_id)
+            models.Index(fields=['discussion', 'id'], name='comment_discussion_id_idx'),
+            # Thread satu discussion urut path (lihat discussions.threads)
+            models.Index(fields=['discussion', 'path'], name='comment_thread_path_idx'),
+        ]
     
     def __str__(self):
         return f"Comment by {self.user.username} on {self.discussion.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Untuk mendeteksi komentar yang dipindah ke parent lain
+        instance._loaded_parent_id = instance.__dict__.get('parent_id')
+        return instance
+
+    @staticmethod
+    def path_segment(pk):
+        return f'{pk:0{PATH_STEP - 1}d}/'
+
+
+class DiscussionRead(models.Model):
+    """
+    Watermark baca: komentar dengan id <= last_read_comment_id sudah dilihat
+    user. Satu row per (user, discussion), tidak pernah mundur.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='discussion_reads'
+    )
+    discussion = models.ForeignKey(
+        Discussion,
+        on_delete=models.CASCADE,
+        related_name='reads'
+    )
+    # Bukan FK: komentar yang dihapus tidak memengaruhi watermark
+    last_read_comment_id = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'discussion_reads'
+        # Index unik ini juga dipakai join watermark di discussions.unread
+        unique_together = ['user', 'discussion']
+
+    def __str__(self):
+        return f"{self.user_id} read {self.discussion_id} up to {self.last_read_comment_id}"
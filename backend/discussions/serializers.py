@@ -1,34 +1,84 @@
+from django.db.models import Max
 from rest_framework import serializers
-from .models import Discussion, DiscussionComment
+from .models import MAX_COMMENT_DEPTH, Discussion, DiscussionComment
 from users.serializers import UserSerializer
 from courses.serializers import CourseSerializer
 
 
 class DiscussionCommentSerializer(serializers.ModelSerializer):
-    """Serializer untuk DiscussionComment model"""
+    """
+    Serializer untuk DiscussionComment model (tanpa balasan). Pohon `replies`
+    disusun oleh discussions.threads.build_tree dari hasil serializer ini.
+    """
     user_detail = UserSerializer(source='user', read_only=True)
-    replies = serializers.SerializerMethodField()
     
     class Meta:
         model = DiscussionComment
         fields = ['id', 'discussion', 'user', 'user_detail', 'content', 'parent', 
-                  'replies', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def get_replies(self, obj):
-        if obj.replies.exists():
-            return DiscussionCommentSerializer(obj.replies.all(), many=True).data
-        return []
+                  'depth', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'depth', 'created_at', 'updated_at']
+
+    def validate(self, attrs):
+        instance = self.instance
+        discussion = attrs.get('discussion', getattr(instance, 'discussion', None))
+        parent = attrs.get('parent', getattr(instance, 'parent', None))
+
+        if instance is not None and discussion.pk != instance.discussion_id:
+            raise serializers.ValidationError({'discussion': 'Comments cannot be moved to another discussion.'})
+        if parent is not None:
+            if parent.discussion_id != discussion.pk:
+                raise serializers.ValidationError({'parent': 'Parent comment belongs to another discussion.'})
+            if instance is not None and parent.path.startswith(instance.path):
+                raise serializers.ValidationError({'parent': 'A comment cannot reply to itself or its own replies.'})
+            # Komentar yang dipindah membawa seluruh balasannya
+            height = 0
+            if instance is not None and parent.pk != instance.parent_id:
+                deepest = DiscussionComment.objects.filter(path__startswith=instance.path).aggregate(
+                    depth=Max('depth')
+                )['depth']
+                height = (deepest or instance.depth) - instance.depth
+            if parent.depth + 1 + height > MAX_COMMENT_DEPTH:
+                raise serializers.ValidationError({'parent': f'Replies cannot be nested deeper than {MAX_COMMENT_DEPTH} levels.'})
+        return attrs
 
 
 class DiscussionSerializer(serializers.ModelSerializer):
-    """Serializer untuk Discussion model"""
+    """
+    Serializer untuk Discussion model. Komentar tidak ikut di-embed: ambil
+    dari /api/discussions/{id}/comments/ (paginated) atau /thread/.
+    """
     user_detail = UserSerializer(source='user', read_only=True)
     course_detail = CourseSerializer(source='course', read_only=True)
-    comments = DiscussionCommentSerializer(many=True, read_only=True)
     
     class Meta:
         model = Discussion
         fields = ['id', 'title', 'content', 'user', 'user_detail', 'course', 
-                  'course_detail', 'comments', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+                  'course_detail', 'comment_count', 'last_activity_at', 'last_commenter',
+                  'created_at', 'updated_at']
+        read_only_fields = ['id', 'comment_count', 'last_activity_at', 'last_commenter',
+                            'created_at', 'updated_at']
+
+
+class DiscussionSummarySerializer(serializers.ModelSerializer):
+    """Representasi ringkas untuk index forum (list), tanpa isi dan komentar"""
+    author = serializers.CharField(source='user.username', read_only=True)
+    course_code = serializers.CharField(source='course.code', read_only=True)
+    last_commenter_username = serializers.CharField(
+        source='last_commenter.username', read_only=True, default=None
+    )
+    # Dari discussions.unread.annotate_unread; null untuk user anonim
+    unread_count = serializers.IntegerField(read_only=True, default=None)
+
+    class Meta:
+        model = Discussion
+        fields = ['id', 'title', 'user', 'author', 'course', 'course_code',
+                  'comment_count', 'last_activity_at', 'last_commenter',
+                  'last_commenter_username', 'unread_count', 'created_at']
+        read_only_fields = fields
+
+
+class MarkReadItemSerializer(serializers.Serializer):
+    """Satu baris body /api/discussions/mark-read/"""
+    discussion = serializers.IntegerField()
+    # Id komentar terakhir yang dilihat; jika tidak dikirim, sampai komentar terbaru
+    last_read_comment = serializers.IntegerField(required=False, min_value=0)
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .live import publish_comment_event
+from .models import Discussion, DiscussionComment
+from .threads import assign_path, move_subtree
+from .unread import advance_watermark
+
+
+def _course_id(comment):
+    # Discussion sudah ter-load jika komentar dibuat lewat API
+    if DiscussionComment._meta.get_field('discussion').is_cached(comment):
+        return comment.discussion.course_id
+    return Discussion.objects.filter(pk=comment.discussion_id).values_list('course_id', flat=True).first()
+
+
+def _publish_on_commit(event_type, comment):
+    """Event SSE dikirim setelah commit, agar client tidak melihat data yang di-rollback"""
+    course_id = _course_id(comment)
+    transaction.on_commit(lambda: publish_comment_event(event_type, comment, course_id))
+
+
+@receiver(post_save, sender=DiscussionComment)
+def comment_saved(sender, instance, created, **kwargs):
+    """Materialized path (perlu id komentar, jadi diisi setelah insert) dan ringkasan discussion"""
+    if created:
+        assign_path(instance)
+        Discussion.record_comment(instance.discussion_id, instance)
+        # Penulis komentar sudah melihat thread sampai komentarnya sendiri
+        advance_watermark(instance.user_id, instance.discussion_id, instance.pk)
+    elif instance.parent_id != getattr(instance, '_loaded_parent_id', instance.parent_id):
+        move_subtree(instance)
+    instance._loaded_parent_id = instance.parent_id
+    _publish_on_commit('comment.created' if created else 'comment.updated', instance)
+
+
+@receiver(post_delete, sender=DiscussionComment)
+def comment_deleted(sender, instance, **kwargs):
+    """Dipanggil juga untuk setiap balasan yang ikut terhapus (cascade)"""
+    Discussion.remove_comment(instance.discussion_id)
+    _publish_on_commit('comment.deleted', instance)
@@ -1,3 +1,283 @@
-from django.test import TestCase
+import asyncio
+import importlib
+from datetime import timedelta
 
-# Create your tests here.
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses.models import Course, Enrollment
+from eduplatform.asgi import application
+from eduplatform.pubsub import publish
+from users.models import User
+from .live import discussion_channel
+from .models import Discussion, DiscussionComment, DiscussionRead
+
+
+async def _call_asgi(path, until=None, timeout=5):
+    """
+    Panggil eduplatform.asgi.application langsung. Pesan yang dikirim app
+    dikumpulkan; koneksi diputus (http.disconnect) setelah until(messages)
+    bernilai True atau app selesai sendiri.
+    """
+    messages = []
+    disconnected = asyncio.Event()
+    changed = asyncio.Event()
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'root_path': '', 'query_string': b'', 'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 40000), 'server': ('testserver', 80),
+    }
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+        changed.set()
+
+    task = asyncio.create_task(application(scope, receive, send))
+
+    async def watch():
+        while until is None or not until(messages):
+            changed.clear()
+            await changed.wait()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        await asyncio.wait_for(
+            asyncio.wait([task, watcher], return_when=asyncio.FIRST_COMPLETED), timeout
+        )
+    finally:
+        watcher.cancel()
+        disconnected.set()
+        await asyncio.wait_for(task, timeout)
+    return messages
+
+
+def _bodies(messages):
+    return [m for m in messages if m['type'] == 'http.response.body' and m.get('body')]
+
+
+@override_settings(
+    PUBSUB_BACKEND='eduplatform.pubsub.InMemoryBroker',
+    LIVE_EVENTS_KEEPALIVE=30,
+)
+class AsgiEventStreamTest(TransactionTestCase):
+    """Proses ASGI hanya melayani SSE, dan response-nya tidak di-buffer"""
+
+    def setUp(self):
+        lecturer = User.objects.create_user('dosen', role='lecturer')
+        course = Course.objects.create(name='Live', code='LIVE101', description='-', lecturer=lecturer)
+        self.discussion = Discussion.objects.create(
+            title='Halo', content='-', user=lecturer, course=course,
+        )
+
+    async def test_events_are_sent_while_the_response_is_open(self):
+        path = f'/api/discussions/{self.discussion.pk}/events/'
+        published = False
+
+        def until(messages):
+            nonlocal published
+            bodies = _bodies(messages)
+            if bodies and not published:
+                # Stream sudah terbuka (retry terkirim): kirim satu event
+                published = True
+                publish(discussion_channel(self.discussion.pk), {'type': 'comment.created', 'id': 1})
+            return len(bodies) >= 2
+
+        messages = await _call_asgi(path, until)
+
+        self.assertEqual(messages[0]['type'], 'http.response.start')
+        self.assertEqual(messages[0]['status'], 200)
+        retry, event = _bodies(messages)[:2]
+        self.assertTrue(retry['more_body'])
+        self.assertTrue(event['more_body'])
+        self.assertIn(b'event: comment.created', event['body'])
+
+    async def test_other_paths_are_not_served(self):
+        for path in ['/api/users/', f'/api/courses/{self.discussion.course_id}/gradebook/export/']:
+            with self.subTest(path=path):
+                messages = await _call_asgi(path)
+                self.assertEqual(messages[0]['status'], 404)
+
+
+class ReadWatermarkTest(TestCase):
+    def setUp(self):
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.student = User.objects.create_user('mahasiswa', role='student')
+        self.course = Course.objects.create(name='Baca', code='READ101', description='-', lecturer=self.lecturer)
+        Enrollment.objects.create(student=self.student, course=self.course)
+        self.discussion = Discussion.objects.create(
+            title='Halo', content='-', user=self.lecturer, course=self.course,
+        )
+        self.comment = DiscussionComment.objects.create(
+            discussion=self.discussion, user=self.lecturer, content='pertama',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def test_mark_read_with_missing_id_writes_nothing(self):
+        response = self.client.post('/api/discussions/mark-read/', [
+            {'discussion': self.discussion.pk}, {'discussion': 999999},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['ids'], ['999999'])
+        self.assertFalse(DiscussionRead.objects.filter(user=self.student).exists())
+
+    def test_mark_read_clamps_to_latest_comment(self):
+        response = self.client.post('/api/discussions/mark-read/', [
+            {'discussion': self.discussion.pk, 'last_read_comment': self.comment.pk + 100},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'updated': 1})
+        read = DiscussionRead.objects.get(user=self.student, discussion=self.discussion)
+        self.assertEqual(read.last_read_comment_id, self.comment.pk)
+
+    def test_unread_course_filter(self):
+        response = self.client.get('/api/discussions/unread/', {'course': self.course.pk})
+        self.assertEqual(response.data['total'], 1)
+        self.assertEqual(self.client.get('/api/discussions/unread/', {'course': '²'}).data['total'], 0)
+
+    def test_seed_follows_last_login_rule(self):
+        migration = importlib.import_module('discussions.migrations.0007_seed_read_watermarks')
+        # Komentar pertama sebelum login terakhir, komentar kedua sesudahnya
+        User.objects.filter(pk=self.student.pk).update(last_login=timezone.now())
+        DiscussionComment.objects.filter(pk=self.comment.pk).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+        newer = DiscussionComment.objects.create(
+            discussion=self.discussion, user=self.lecturer, content='kedua',
+        )
+        DiscussionComment.objects.filter(pk=newer.pk).update(created_at=timezone.now() + timedelta(minutes=1))
+        DiscussionRead.objects.filter(user=self.student).delete()
+
+        migration.seed_watermarks(apps, None)
+
+        read = DiscussionRead.objects.get(user=self.student, discussion=self.discussion)
+        self.assertEqual(read.last_read_comment_id, newer.pk - 1)
+        # Komentar terbaru milik lecturer sendiri: sudah dibaca
+        read = DiscussionRead.objects.get(user=self.lecturer, discussion=self.discussion)
+        self.assertEqual(read.last_read_comment_id, newer.pk)
+
+
+class CommentThreadTest(TestCase):
+    def setUp(self):
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+        course = Course.objects.create(name='Thread', code='THR101', description='-', lecturer=self.lecturer)
+        self.discussion = Discussion.objects.create(title='Halo', content='-', user=self.lecturer, course=course)
+        self.first = self.comment('pertama')
+        self.reply = self.comment('balasan', parent=self.first)
+        self.nested = self.comment('balasan kedua', parent=self.reply)
+        self.second = self.comment('kedua')
+        self.client = APIClient()
+        self.client.force_authenticate(self.lecturer)
+        self.url = f'/api/discussions/{self.discussion.pk}/thread/'
+
+    def comment(self, content, parent=None, user=None):
+        return DiscussionComment.objects.create(
+            discussion=self.discussion, user=user or self.lecturer, content=content, parent=parent,
+        )
+
+    def shape(self, nodes):
+        return [(node['content'], self.shape(node['replies'])) for node in nodes]
+
+    def test_thread_is_assembled_from_one_comment_query(self):
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.get(self.url)
+        self.assertEqual(self.shape(response.data['comments']), [
+            ('pertama', [('balasan', [('balasan kedua', [])])]),
+            ('kedua', []),
+        ])
+
+        for index in range(10):
+            user = User.objects.create_user(f'student{index}', role='student')
+            self.comment(f'balasan {index}', parent=self.nested, user=user)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['count'], 14)
+        self.assertEqual(len(large), len(small))
+
+    def test_subtree_and_depth_limit(self):
+        response = self.client.get(self.url, {'max_depth': 0})
+        self.assertEqual(self.shape(response.data['comments']), [('pertama', []), ('kedua', [])])
+
+        response = self.client.get(self.url, {'root': self.reply.pk})
+        self.assertEqual(self.shape(response.data['comments']), [('balasan', [('balasan kedua', [])])])
+
+        self.assertEqual(self.client.get(self.url, {'max_depth': '²'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'root': '²'}).status_code, 404)
+
+
+class DiscussionSummaryTest(TestCase):
+    def setUp(self):
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.student = User.objects.create_user('ani', role='student')
+        self.course = Course.objects.create(name='Forum', code='FOR101', description='-', lecturer=self.lecturer)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def discussion(self, title):
+        return Discussion.objects.create(title=title, content='isi panjang', user=self.lecturer, course=self.course)
+
+    def list_discussions(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/discussions/', {'course': self.course.pk})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], len(queries)
+
+    def test_summary_follows_comments(self):
+        discussion = self.discussion('Halo')
+        first = DiscussionComment.objects.create(discussion=discussion, user=self.lecturer, content='a')
+        latest = DiscussionComment.objects.create(discussion=discussion, user=self.student, content='b')
+        discussion.refresh_from_db()
+        self.assertEqual((discussion.comment_count, discussion.last_commenter_id), (2, self.student.pk))
+        self.assertEqual(discussion.last_comment_id, latest.pk)
+
+        latest.delete()
+        discussion.refresh_from_db()
+        self.assertEqual((discussion.comment_count, discussion.last_commenter_id), (1, self.lecturer.pk))
+        self.assertEqual(discussion.last_comment_id, first.pk)
+
+    def test_stale_save_keeps_summary(self):
+        discussion = self.discussion('Halo')
+        stale = Discussion.objects.get(pk=discussion.pk)
+        comment = DiscussionComment.objects.create(discussion=discussion, user=self.student, content='a')
+
+        stale.title = 'Halo (diubah)'
+        stale.save()
+
+        discussion.refresh_from_db()
+        self.assertEqual(discussion.title, 'Halo (diubah)')
+        self.assertEqual((discussion.comment_count, discussion.last_comment_id), (1, comment.pk))
+
+    def test_list_is_compact_and_sorted_by_activity(self):
+        quiet, busy = self.discussion('Sepi'), self.discussion('Ramai')
+        DiscussionComment.objects.create(discussion=quiet, user=self.lecturer, content='lama')
+        _, baseline = self.list_discussions()
+
+        for index in range(5):
+            other = self.discussion(f'Lain {index}')
+            DiscussionComment.objects.create(discussion=other, user=self.student, content='x')
+        DiscussionComment.objects.create(discussion=busy, user=self.student, content='terbaru')
+        results, count = self.list_discussions()
+
+        self.assertEqual(count, baseline)
+        self.assertEqual(results[0]['title'], 'Ramai')
+        self.assertEqual(results[0]['last_commenter_username'], 'ani')
+        self.assertNotIn('comments', results[0])
+        self.assertNotIn('content', results[0])
+        self.assertEqual(self.client.get('/api/discussions/', {'course': '²'}).data['results'], [])
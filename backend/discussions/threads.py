@@ -0,0 +1,74 @@
+"""
+Thread komentar discussion dari satu query.
+
+Setiap DiscussionComment menyimpan materialized path (id semua ancestor,
+lihat models.PATH_STEP) dan depth. Satu SELECT urut path sudah memberikan
+urutan thread, lalu pohon balasan disusun di memori dalam O(n). Path juga
+memungkinkan fetch subtree (path__startswith) dan batas kedalaman (depth__lte)
+tanpa query rekursif.
+"""
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Length, Substr
+
+from .models import PATH_STEP, DiscussionComment
+
+
+def thread_queryset(discussion_ids, root=None, max_depth=None):
+    """
+    Komentar discussion urut thread. `root` (dict path/depth) membatasi ke
+    satu subtree, `max_depth` relatif terhadap root (0 = root saja).
+    """
+    queryset = DiscussionComment.objects.filter(discussion_id__in=discussion_ids)
+    base_depth = 0
+    if root is not None:
+        queryset = queryset.filter(path__startswith=root['path'])
+        base_depth = root['depth']
+    if max_depth is not None:
+        queryset = queryset.filter(depth__lte=base_depth + max_depth)
+    return queryset.select_related('user').order_by('discussion_id', 'path')
+
+
+def build_tree(nodes):
+    """
+    Susun komentar hasil serialisasi (urut path) menjadi pohon `replies`.
+    Return daftar node teratas; komentar yang parent-nya tidak ikut dimuat
+    (fetch subtree / batas kedalaman) juga menjadi node teratas.
+    """
+    by_id = {}
+    roots = []
+    for node in nodes:
+        node['replies'] = []
+        by_id[node['id']] = node
+        parent = by_id.get(node['parent'])
+        if parent is None:
+            roots.append(node)
+        else:
+            parent['replies'].append(node)
+    return roots
+
+
+def assign_path(comment):
+    """Isi path/depth komentar baru (parent sudah punya path karena dibuat lebih dulu)"""
+    segment = DiscussionComment.path_segment(comment.pk)
+    parent_path = ''
+    if comment.parent_id:
+        parent_path = DiscussionComment.objects.filter(pk=comment.parent_id).values_list(
+            'path', flat=True
+        ).first() or ''
+    comment.path = parent_path + segment
+    comment.depth = len(comment.path) // PATH_STEP - 1
+    DiscussionComment.objects.filter(pk=comment.pk).update(path=comment.path, depth=comment.depth)
+
+
+def move_subtree(comment):
+    """Komentar dipindah ke parent lain: ganti prefix path seluruh subtree-nya"""
+    old_path = DiscussionComment.objects.filter(pk=comment.pk).values_list('path', flat=True).first()
+    if not old_path:
+        assign_path(comment)
+        return
+    assign_path(comment)
+    delta = (len(comment.path) - len(old_path)) // PATH_STEP
+    DiscussionComment.objects.filter(path__startswith=old_path).exclude(pk=comment.pk).update(
+        path=Concat(Value(comment.path), Substr('path', len(old_path) + 1, Length('path'))),
+        depth=F('depth') + delta,
+    )
@@ -0,0 +1,119 @@
+"""
+Jumlah komentar belum dibaca berdasarkan watermark DiscussionRead.
+
+Discussion.last_comment_id dibandingkan dengan watermark user (LEFT JOIN ke
+index unik discussion_reads), sehingga discussion yang sudah dibaca tidak
+perlu menyentuh tabel komentar. Untuk sisanya, komentar dengan id >
+watermark dihitung dari index (discussion, id). Semua discussion dari semua
+course user dijawab dengan satu query.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, FilteredRelation, IntegerField, OuterRef, Q, Subquery, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Discussion, DiscussionComment, DiscussionRead
+
+
+def annotate_watermark(queryset, user):
+    """
+    `watermark` = last_read_comment_id user (0 jika belum pernah dibaca).
+    Dibuat sebagai annotation agar join tetap LEFT JOIN saat difilter.
+    """
+    return queryset.annotate(
+        own_read=FilteredRelation('reads', condition=Q(reads__user=user)),
+    ).annotate(
+        watermark=Coalesce(F('own_read__last_read_comment_id'), 0),
+    )
+
+
+def annotate_unread(queryset, user):
+    """Tambahkan `watermark` dan `unread_count` ke queryset Discussion"""
+    newer = (
+        DiscussionComment.objects.filter(discussion=OuterRef('pk'), id__gt=OuterRef('watermark'))
+        .order_by()
+        .values('discussion')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return annotate_watermark(queryset, user).annotate(
+        unread_count=Case(
+            When(last_comment_id__gt=F('watermark'),
+                 then=Coalesce(Subquery(newer, output_field=IntegerField()), 0)),
+            default=0,
+            output_field=IntegerField(),
+        ),
+    )
+
+
+def unread_discussions(user, course_ids):
+    """[{'id', 'course_id', 'unread_count'}] untuk discussion yang punya komentar baru"""
+    queryset = annotate_unread(Discussion.objects.filter(course_id__in=course_ids), user)
+    return list(
+        queryset.filter(last_comment_id__gt=F('watermark'))
+        .order_by()
+        .values('id', 'course_id', 'unread_count')
+    )
+
+
+def unread_discussions_by_course(user, course_ids):
+    """course_id -> jumlah discussion yang punya komentar belum dibaca (satu query)"""
+    rows = (
+        annotate_watermark(Discussion.objects.filter(course_id__in=course_ids), user)
+        .filter(last_comment_id__gt=F('watermark'))
+        .order_by()
+        .values('course_id')
+        .annotate(total=Count('pk'))
+    )
+    return {row['course_id']: row['total'] for row in rows}
+
+
+def advance_watermark(user_id, discussion_id, comment_id):
+    """Naikkan watermark satu discussion (dipakai saat user menulis komentar)"""
+    updated = DiscussionRead.objects.filter(user_id=user_id, discussion_id=discussion_id).update(
+        last_read_comment_id=Greatest(F('last_read_comment_id'), comment_id),
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        DiscussionRead.objects.bulk_create(
+            [DiscussionRead(user_id=user_id, discussion_id=discussion_id, last_read_comment_id=comment_id)],
+            ignore_conflicts=True,
+        )
+
+
+def mark_read(user, marks):
+    """
+    marks: dict discussion_id -> comment id terakhir yang dilihat (None =
+    komentar terbaru). Watermark tidak pernah mundur dan tidak melewati
+    komentar terbaru. Return (jumlah watermark yang berubah, id yang tidak ada);
+    jika ada id yang tidak ada, tidak ada watermark yang ditulis.
+    """
+    latest = dict(Discussion.objects.filter(pk__in=marks).values_list('pk', 'last_comment_id'))
+    missing = sorted(set(marks) - set(latest))
+    if missing:
+        return 0, missing
+    targets = {
+        pk: latest[pk] if marks[pk] is None else min(marks[pk], latest[pk])
+        for pk in latest
+    }
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {
+            read.discussion_id: read
+            for read in DiscussionRead.objects.select_for_update().filter(
+                user=user, discussion_id__in=targets
+            )
+        }
+        changed, created = [], []
+        for pk, target in targets.items():
+            read = existing.get(pk)
+            if read is None:
+                created.append(DiscussionRead(user=user, discussion_id=pk, last_read_comment_id=target))
+            elif target > read.last_read_comment_id:
+                read.last_read_comment_id = target
+                read.updated_at = now
+                changed.append(read)
+        DiscussionRead.objects.bulk_update(changed, ['last_read_comment_id', 'updated_at'])
+        DiscussionRead.objects.bulk_create(created, ignore_conflicts=True)
+    return len(changed) + len(created), missing
@@ -1,30 +1,189 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from .models import Discussion, DiscussionComment
-from .serializers import DiscussionSerializer, DiscussionCommentSerializer
+from rest_framework.response import Response
+from django.db.models import Max, Sum
+from .models import Discussion, DiscussionComment, DiscussionRead
+from .serializers import (
+    DiscussionSerializer, DiscussionCommentSerializer, DiscussionSummarySerializer,
+    MarkReadItemSerializer,
+)
+from .threads import build_tree, thread_queryset
+from .unread import annotate_unread, mark_read, unread_discussions
+from eduplatform.conditional import ConditionalGetMixin
+from users.context import get_auth_context
 from users.permissions import IsDiscussionOwner
 
+MAX_MARK_READ = 500
 
-class DiscussionViewSet(viewsets.ModelViewSet):
-    """ViewSet untuk Discussion CRUD operations"""
-    queryset = Discussion.objects.all()
+
+class DiscussionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """
+    ViewSet untuk Discussion CRUD operations.
+    List memakai representasi ringkas (DiscussionSummarySerializer) urut
+    aktivitas terbaru; komentar diambil per discussion lewat /comments/.
+    """
+    queryset = Discussion.objects.select_related('user', 'course__lecturer')
     serializer_class = DiscussionSerializer
-    
+
+    @property
+    def cursor_ordering(self):
+        # Dibaca KeysetCursorPagination untuk ?cursor=
+        if self.action == 'comments':
+            return ('path',)
+        return ('-last_activity_at', '-id')
+
+    def get_queryset(self):
+        if self.action != 'list':
+            return super().get_queryset()
+
+        queryset = Discussion.objects.select_related('user', 'course', 'last_commenter').defer('content')
+        # API: GET /api/discussions/?course=<id> (index forum satu course)
+        course_id = self.request.query_params.get('course')
+        if course_id:
+            queryset = queryset.filter(course_id=course_id if course_id.isascii() and course_id.isdigit() else None)
+        if self.request.user.is_authenticated:
+            # unread_count dihitung di query yang sama (watermark DiscussionRead)
+            queryset = annotate_unread(queryset, self.request.user)
+        return queryset.order_by('-last_activity_at', '-id')
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return DiscussionSummarySerializer
+        if self.action == 'comments':
+            return DiscussionCommentSerializer
+        return DiscussionSerializer
+
+    def get_validator_aggregates(self):
+        aggregates = super().get_validator_aggregates()
+        # Field ringkasan berubah tanpa menyentuh updated_at
+        aggregates['last_activity'] = Max('last_activity_at')
+        aggregates['comments'] = Sum('comment_count')
+        if self.action != 'list':
+            # course_detail ikut di-serialize
+            aggregates['course_modified'] = Max('course__updated_at')
+        return aggregates
+
+    def get_extra_validators(self, queryset):
+        # unread_count di list berubah saat user menandai discussion sudah dibaca
+        user = self.request.user
+        if self.action != 'list' or not user.is_authenticated:
+            return []
+        return [DiscussionRead.objects.filter(user=user).aggregate(read_modified=Max('updated_at'))]
+
+    # API: POST /api/discussions/mark-read/
+    @action(detail=False, methods=['post'], url_path='mark-read')
+    def mark_read(self, request):
+        """
+        Tandai banyak discussion sudah dibaca sekaligus:
+        [{"discussion": 12}, {"discussion": 15, "last_read_comment": 340}]
+        """
+        serializer = MarkReadItemSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=MAX_MARK_READ
+        )
+        serializer.is_valid(raise_exception=True)
+        marks = {}
+        for item in serializer.validated_data:
+            if item['discussion'] in marks:
+                raise ValidationError({'detail': f"Duplicate discussion id {item['discussion']}."})
+            marks[item['discussion']] = item.get('last_read_comment')
+
+        updated, missing = mark_read(request.user, marks)
+        if missing:
+            raise ValidationError({'detail': 'Discussions not found.', 'ids': missing})
+        return Response({'updated': updated})
+
+    # API: GET /api/discussions/unread/?course=<id>
+    @action(detail=False, methods=['get'])
+    def unread(self, request):
+        """Jumlah komentar belum dibaca di semua course yang diikuti/diajar user"""
+        auth = get_auth_context(request)
+        course_ids = auth.taught_course_ids | auth.enrolled_course_ids
+        course_id = request.query_params.get('course')
+        if course_id:
+            course_ids = course_ids & {int(course_id)} if course_id.isascii() and course_id.isdigit() else frozenset()
+
+        rows = unread_discussions(request.user, course_ids)
+        courses = {}
+        for row in rows:
+            totals = courses.setdefault(row['course_id'], {'discussions': 0, 'comments': 0})
+            totals['discussions'] += 1
+            totals['comments'] += row['unread_count']
+        return Response({
+            'total': sum(row['unread_count'] for row in rows),
+            'courses': courses,
+            'discussions': {row['id']: row['unread_count'] for row in rows},
+        })
+
+    # API: GET /api/discussions/{id}/comments/?page=N atau ?cursor=
+    @action(detail=True, methods=['get'])
+    def comments(self, request, pk=None):
+        """
+        Komentar satu discussion, paginated, dalam urutan thread (urut path):
+        setiap halaman adalah potongan thread berurutan, indentasi dari `depth`.
+        Query param max_depth=<n> membatasi kedalaman (0 = komentar teratas saja).
+        """
+        discussion = self.get_object()
+
+        max_depth = request.query_params.get('max_depth')
+        if max_depth is not None:
+            if not (max_depth.isascii() and max_depth.isdigit()):
+                return Response({'error': 'max_depth must be a non-negative integer'}, status=status.HTTP_400_BAD_REQUEST)
+            max_depth = int(max_depth)
+
+        comments = thread_queryset([discussion.pk], max_depth=max_depth)
+        page = self.paginate_queryset(comments)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def thread(self, request, pk=None):
+        """
+        Thread komentar sebagai pohon `replies`.
+        Query param: root=<comment id> (hanya subtree komentar tersebut),
+        max_depth=<n> (kedalaman relatif terhadap root; 0 = komentar teratas saja)
+        """
+        discussion = self.get_object()
+
+        max_depth = request.query_params.get('max_depth')
+        if max_depth is not None:
+            if not (max_depth.isascii() and max_depth.isdigit()):
+                return Response({'error': 'max_depth must be a non-negative integer'}, status=status.HTTP_400_BAD_REQUEST)
+            max_depth = int(max_depth)
+
+        root = None
+        root_id = request.query_params.get('root')
+        if root_id is not None:
+            root = DiscussionComment.objects.filter(
+                pk=root_id if root_id.isascii() and root_id.isdigit() else None, discussion=discussion
+            ).values('path', 'depth').first()
+            if root is None:
+                return Response({'error': 'Comment not found in this discussion'}, status=status.HTTP_404_NOT_FOUND)
+
+        comments = thread_queryset([discussion.pk], root=root, max_depth=max_depth)
+        data = DiscussionCommentSerializer(comments, many=True, context=self.get_serializer_context()).data
+        return Response({
+            'discussion': discussion.pk,
+            'count': len(data),
+            'comments': build_tree(data),
+        })
+
     def get_permissions(self):
-        # List and retrieve - anyone can view
-        if self.action in ['list', 'retrieve']:
+        # List, retrieve, comments and thread - anyone can view
+        if self.action in ['list', 'retrieve', 'comments', 'thread']:
             return [IsAuthenticatedOrReadOnly()]
-        # Create - authenticated users can create discussions
-        elif self.action == 'create':
+        # Create and read tracking - authenticated users
+        elif self.action in ['create', 'mark_read', 'unread']:
             return [IsAuthenticated()]
         # Update and delete - discussion owner or admin
         else:
             return [IsDiscussionOwner()]
 
 
-class DiscussionCommentViewSet(viewsets.ModelViewSet):
+class DiscussionCommentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet untuk DiscussionComment CRUD operations"""
-    queryset = DiscussionComment.objects.all()
+    queryset = DiscussionComment.objects.select_related('user')
     serializer_class = DiscussionCommentSerializer
     
     def get_permissions(self):
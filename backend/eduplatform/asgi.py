@@ -1,16 +1,38 @@
 """
 ASGI config for eduplatform project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+Proses ASGI hanya melayani server-sent events (discussions.live); API lain
+tetap di WSGI (eduplatform.wsgi). Di bawah ASGI, Django membaca response
+streaming sinkron (StreamingListMixin, export gradebook, FileResponse blob)
+ke memori dulu sebelum dikirim, jadi path lain dijawab 404 di sini.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
 
 import os
+import re
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduplatform.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Harus sesuai dengan URL discussion-events / course-events di eduplatform.urls
+EVENT_PATH_RE = re.compile(r'^/api/(discussions|courses)/\d+/events/$')
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and not EVENT_PATH_RE.match(scope['path']):
+        await send({
+            'type': 'http.response.start',
+            'status': 404,
+            'headers': [(b'content-type', b'application/json')],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': b'{"error": "This server only serves live event streams"}',
+        })
+        return
+    await django_application(scope, receive, send)
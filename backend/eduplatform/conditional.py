@@ -0,0 +1,78 @@
+"""
+Conditional GET (ETag) untuk ViewSet yang sering di-poll.
+
+ETag dihitung dari satu query aggregate (jumlah baris + MAX(updated_at))
+atas queryset yang sudah difilter, tanpa serialisasi. Jika request membawa
+If-None-Match yang cocok, langsung dijawab 304.
+
+Last-Modified sengaja tidak dikirim: resolusinya hanya per detik, sehingga
+perubahan di detik yang sama dengan response sebelumnya akan dijawab 304
+lewat If-Modified-Since. ETag memakai timestamp penuh (mikrodetik).
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Mixin untuk ModelViewSet dengan field `updated_at`.
+
+    Override `get_validator_aggregates()` untuk menambah aggregate lain
+    (misalnya MAX(updated_at) dari relasi yang ikut di-serialize), atau
+    `get_extra_validators()` untuk query tambahan.
+    """
+
+    def get_validator_aggregates(self):
+        return {
+            'count': Count('pk'),
+            'last_modified': Max('updated_at'),
+        }
+
+    def get_extra_validators(self, queryset):
+        return []
+
+    def get_etag(self, queryset):
+        """ETag untuk queryset (request path, user, dan hasil aggregate)"""
+        values = queryset.order_by().aggregate(**self.get_validator_aggregates())
+        extra = self.get_extra_validators(queryset)
+
+        user = self.request.user
+        raw = '|'.join([
+            self.request.get_full_path(),
+            str(user.pk if user.is_authenticated else ''),
+            repr(sorted(values.items())),
+            repr([sorted(part.items()) for part in extra]),
+        ])
+        return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+    def _conditional(self, request, queryset, render):
+        etag = self.get_etag(queryset)
+
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            response = render()
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            # Payload berbeda per user (is_enrolled, dll) dan harus selalu divalidasi ulang
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization', 'Cookie'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._conditional(
+            request, queryset, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        # get_object() dulu: lookup tidak valid jadi 404 dan object permission
+        # sudah dicek sebelum ETag bisa dijawab 304
+        instance = self.get_object()
+        queryset = self.filter_queryset(self.get_queryset()).filter(pk=instance.pk)
+        return self._conditional(
+            request, queryset, lambda: Response(self.get_serializer(instance).data)
+        )
@@ -0,0 +1,72 @@
+"""
+Pagination default untuk semua list endpoint.
+
+Secara default tetap PageNumberPagination (?page=N, dengan "count").
+Jika request membawa parameter ?cursor= (boleh kosong untuk halaman pertama),
+dipakai keyset/cursor pagination: tanpa COUNT(*) dan tanpa OFFSET, sehingga
+halaman ke-500 sama murahnya dengan halaman pertama.
+"""
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination yang mengikuti ordering model (Meta.ordering) atau
+    `cursor_ordering` pada view, ditambah `id` sebagai tiebreaker yang stabil.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', None)
+        if ordering is None:
+            ordering = queryset.model._meta.ordering or ['-pk']
+        ordering = list(ordering)
+
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            descending = ordering[0].startswith('-')
+            ordering.append('-id' if descending else 'id')
+        return tuple(ordering)
+
+
+class HybridPagination(PageNumberPagination):
+    """PageNumberPagination, atau KeysetCursorPagination jika ada ?cursor="""
+
+    cursor_query_param = 'cursor'
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = KeysetCursorPagination()
+            page = self.cursor_paginator.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.cursor_paginator.display_page_controls
+            return page
+
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Keyset pagination cursor (send empty for the first page).',
+                'schema': {'type': 'string'},
+            },
+        ]
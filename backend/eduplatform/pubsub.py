@@ -0,0 +1,198 @@
+"""
+Pub/sub sederhana untuk event live (server-sent events, lihat discussions.live).
+
+Backend dipilih lewat settings.PUBSUB_BACKEND:
+
+- InMemoryBroker: fan-out di dalam satu proses. Cukup untuk runserver,
+  satu worker ASGI, dan test.
+- PostgresBroker: publish lewat NOTIFY, setiap proses menjalankan satu
+  thread LISTEN dan meneruskan event ke subscriber lokalnya. Dipakai jika
+  ada lebih dari satu worker/instance.
+
+publish() dipanggil dari kode sinkron (signal, biasanya lewat on_commit);
+subscriber adalah coroutine di event loop ASGI. Setiap subscriber punya
+antrean terbatas: subscriber yang terlalu lambat menerima OVERFLOW dan
+sebaiknya memuat ulang datanya.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW = object()
+QUEUE_SIZE = 100
+# Batas payload NOTIFY PostgreSQL adalah 8000 byte
+NOTIFY_CHANNEL = 'eduplatform_events'
+MAX_NOTIFY_PAYLOAD = 7900
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.PUBSUB_BACKEND)()
+    return _broker
+
+
+def publish(channel, message):
+    """Kirim `message` (dict yang bisa di-JSON-kan) ke semua subscriber `channel`"""
+    get_broker().publish(channel, message)
+
+
+class Subscription:
+    """Antrean event untuk satu koneksi; dipakai sebagai async context manager"""
+
+    def __init__(self, broker, channels):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    async def __aenter__(self):
+        self.broker.attach(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker.detach(self)
+
+    def deliver(self, message):
+        # Bisa dipanggil dari thread mana pun
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self.queue.full():
+            # Event lama dibuang; client diberi tahu agar memuat ulang
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = OVERFLOW
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Event berikutnya, OVERFLOW, atau None jika timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InMemoryBroker:
+    """Fan-out ke subscriber di proses ini"""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        return Subscription(self, channels)
+
+    def attach(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+
+    def detach(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def dispatch(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.deliver(message)
+            except RuntimeError:
+                # Event loop subscriber sudah ditutup
+                self.detach(subscription)
+
+    def publish(self, channel, message):
+        self.dispatch(channel, message)
+
+
+class PostgresBroker(InMemoryBroker):
+    """
+    Fan-out antar proses lewat PostgreSQL LISTEN/NOTIFY. Semua event memakai
+    satu channel NOTIFY; nama channel aplikasi ada di dalam payload dan
+    disaring di proses penerima.
+    """
+
+    reconnect_delay = 5
+
+    def __init__(self, using='default'):
+        super().__init__()
+        self.using = using
+        self._listener = None
+
+    def publish(self, channel, message):
+        payload = json.dumps({'channel': channel, 'message': message}, default=str)
+        if len(payload.encode('utf-8')) > MAX_NOTIFY_PAYLOAD:
+            logger.warning("Dropping event for %s: payload too large for NOTIFY", channel)
+            return
+        with connections[self.using].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, payload])
+
+    def attach(self, subscription):
+        super().attach(subscription)
+        self._ensure_listener()
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen_forever, name='pubsub-listener', daemon=True
+                )
+                self._listener.start()
+
+    def _connect(self):
+        wrapper = connections[self.using]
+        raw = wrapper.get_new_connection(wrapper.get_connection_params())
+        raw.autocommit = True
+        with raw.cursor() as cursor:
+            cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+        return raw
+
+    def _listen_forever(self):
+        while True:
+            raw = None
+            try:
+                raw = self._connect()
+                while True:
+                    if select.select([raw], [], [], 60) == ([], [], []):
+                        continue
+                    raw.poll()
+                    while raw.notifies:
+                        self._handle(raw.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Pub/sub listener lost its connection, reconnecting")
+                time.sleep(self.reconnect_delay)
+            finally:
+                if raw is not None:
+                    try:
+                        raw.close()
+                    except Exception:
+                        pass
+
+    def _handle(self, payload):
+        try:
+            event = json.loads(payload)
+            self.dispatch(event['channel'], event['message'])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed pub/sub payload")
+
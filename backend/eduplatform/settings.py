@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Full-text & trigram search (aman di SQLite)
     
     # Third party apps
     'rest_framework',
@@ -42,6 +43,9 @@ INSTALLED_APPS = [
     'assignments',
     'discussions',
     'reports', # Tambahan jika ada modul reports
+    'dashboard',
+    'uploads',
+    'search',
 ]
 
 MIDDLEWARE = [
@@ -116,6 +120,33 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# File media disimpan berdasarkan SHA-256 (dedup + refcount), lihat uploads/storage.py.
+# staticfiles tetap storage bawaan (STATICFILES_STORAGE di atas diabaikan sejak Django 5.1)
+STORAGES = {
+    'default': {'BACKEND': 'uploads.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Jumlah thread untuk membuat thumbnail/WebP Course.image (0 = sinkron di request)
+IMAGE_VARIANT_WORKERS = int(os.getenv('IMAGE_VARIANT_WORKERS', '2'))
+
+# Thread untuk menghitung MinHash signature submission (0 = sinkron di request)
+SIMILARITY_WORKERS = int(os.getenv('SIMILARITY_WORKERS', '1'))
+
+# Upload file bertahap (resumable) ke MEDIA_ROOT, lihat uploads/
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv('CHUNKED_UPLOAD_MAX_SIZE', str(2 * 1024 ** 3)))
+CHUNKED_UPLOAD_MAX_CHUNK = int(os.getenv('CHUNKED_UPLOAD_MAX_CHUNK', str(32 * 1024 ** 2)))
+
+# Pub/sub untuk event live (SSE): in-memory hanya menjangkau satu proses,
+# jadi dengan PostgreSQL dipakai LISTEN/NOTIFY agar semua worker menerima event
+PUBSUB_BACKEND = os.getenv('PUBSUB_BACKEND') or (
+    'eduplatform.pubsub.PostgresBroker'
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+    else 'eduplatform.pubsub.InMemoryBroker'
+)
+# Komentar SSE dikirim jika tidak ada event selama ini (detik), agar proxy tidak memutus koneksi
+LIVE_EVENTS_KEEPALIVE = int(os.getenv('LIVE_EVENTS_KEEPALIVE', '20'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Custom User Model
@@ -124,13 +155,13 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',  # JWT + cache user (tanpa SELECT per request)
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'eduplatform.pagination.HybridPagination',  # ?page=N atau ?cursor=
     'PAGE_SIZE': 10,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
@@ -141,8 +172,15 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': False,
+    # Claim user_version untuk cache user (users.authentication)
+    'TOKEN_OBTAIN_SERIALIZER': 'users.serializers.VersionedTokenObtainPairSerializer',
 }
 
+# TTL (detik) cache user untuk users.authentication.CachedJWTAuthentication.
+# Cache default Django per proses; token yang dibuat sebelum user berubah bisa
+# membaca entry lama di worker lain selama TTL ini.
+JWT_USER_CACHE_TIMEOUT = int(os.getenv('JWT_USER_CACHE_TIMEOUT', '60'))
+
 # --- KONFIGURASI PENTING UNTUK KONEKSI FRONTEND ---
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8080",  # Frontend React (PENTING)
@@ -158,6 +196,7 @@ CORS_ALLOW_HEADERS = [
     'accept',
     'accept-encoding',
     'authorization',
+    'content-range',  # PUT /api/uploads/{id}/
     'content-type',
     'dnt',
     'origin',
@@ -0,0 +1,78 @@
+"""
+Streaming list (JSON array atau NDJSON) untuk list besar tanpa pagination.
+
+Baris diambil dengan .values(...).iterator(chunk_size=...) dan langsung
+ditulis ke StreamingHttpResponse, sehingga memori worker tetap datar
+berapapun jumlah baris (tidak ada serializer object / string JSON raksasa).
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+# Gabungkan potongan kecil agar tidak ada satu write() per baris
+BUFFER_SIZE = 64 * 1024
+
+
+def _dumps(row):
+    return json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def buffered(chunks, size=BUFFER_SIZE):
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def iter_json_array(rows):
+    """Yield '[', baris dipisah koma, lalu ']'"""
+    yield '['
+    first = True
+    for row in rows:
+        if first:
+            first = False
+            yield _dumps(row)
+        else:
+            yield ',' + _dumps(row)
+    yield ']'
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield _dumps(row) + '\n'
+
+
+class StreamingListMixin:
+    """
+    Mixin ViewSet: `self.stream_list(request)` mengembalikan seluruh hasil
+    filter sebagai stream. Format NDJSON jika ?stream=ndjson atau header
+    Accept: application/x-ndjson, selain itu JSON array biasa.
+    """
+    stream_fields = None
+    stream_chunk_size = 2000
+
+    def wants_ndjson(self, request):
+        return (
+            request.query_params.get('stream') == 'ndjson'
+            or NDJSON_CONTENT_TYPE in request.META.get('HTTP_ACCEPT', '')
+        )
+
+    def perform_content_negotiation(self, request, force=False):
+        # NDJSON ditulis langsung oleh stream_list, tidak ada renderer DRF untuknya;
+        # tanpa force, Accept: application/x-ndjson dijawab 406
+        return super().perform_content_negotiation(request, force=force or self.wants_ndjson(request))
+
+    def stream_list(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.stream_fields)
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+
+        if self.wants_ndjson(request):
+            return StreamingHttpResponse(buffered(iter_ndjson(rows)), content_type=NDJSON_CONTENT_TYPE)
+        return StreamingHttpResponse(buffered(iter_json_array(rows)), content_type='application/json')
@@ -15,7 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework import routers
@@ -32,8 +32,12 @@ from drf_spectacular.views import (
 from users.views import UserViewSet
 from courses.views import CourseViewSet, EnrollmentViewSet
 from materials.views import MaterialViewSet
-from assignments.views import AssignmentViewSet, SubmissionViewSet
+from assignments.views import AssignmentViewSet, SubmissionViewSet, calendar_feed
 from discussions.views import DiscussionViewSet, DiscussionCommentViewSet
+from discussions.live import course_events, discussion_events
+from dashboard.views import DashboardView
+from uploads.views import UploadSessionViewSet, serve_blob
+from search.views import SearchView
 
 # Setup Router untuk REST API
 router = routers.DefaultRouter()
@@ -45,10 +49,19 @@ router.register(r'assignments', AssignmentViewSet)
 router.register(r'submissions', SubmissionViewSet)
 router.register(r'discussions', DiscussionViewSet)
 router.register(r'discussion-comments', DiscussionCommentViewSet)
+router.register(r'uploads', UploadSessionViewSet)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # Server-sent events (ASGI), didaftarkan sebelum router
+    path('api/discussions/<int:pk>/events/', discussion_events, name='discussion-events'),
+    path('api/courses/<int:pk>/events/', course_events, name='course-events'),
     path('api/', include(router.urls)),
+    path('api/dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('api/search/', SearchView.as_view(), name='search'),
+    path('api/calendar/<str:token>.ics', calendar_feed, name='assignment-calendar-feed'),
+    # Blob media (content-addressed) disajikan dengan Cache-Control immutable, juga saat DEBUG=False
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<name>cas/.+)$", serve_blob, name='media-blob'),
     # JWT token endpoints
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='material',
+            options={'ordering': ['-created_at']},
+        ),
+        migrations.RenameField(
+            model_name='material',
+            old_name='uploaded_at',
+            new_name='created_at',
+        ),
+        migrations.RemoveField(
+            model_name='material',
+            name='description',
+        ),
+        migrations.RemoveField(
+            model_name='material',
+            name='file',
+        ),
+        migrations.AddField(
+            model_name='material',
+            name='file_url',
+            field=models.CharField(default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='title',
+            field=models.CharField(max_length=150),
+        ),
+        migrations.AlterModelTable(
+            name='material',
+            table='materials',
+        ),
+    ]
@@ -19,3 +19,10 @@ class Material(models.Model):
     
     def __str__(self):
         return f"{self.title} - {self.course.code}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # file_url awal untuk referensi blob di uploads.signals
+        instance._loaded_file_url = instance.__dict__.get('file_url')
+        return instance
@@ -0,0 +1,16 @@
+# Generated by Django 5.1.6 on 2026-10-18 02:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='Report',
+        ),
+    ]
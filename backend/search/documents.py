@@ -0,0 +1,138 @@
+"""
+Dokumen SearchEntry untuk setiap model yang bisa dicari, dan query pencarian.
+
+Satu tabel search_entries menggantikan pencarian terpisah di lima tabel.
+Di PostgreSQL dokumen full-text (title berbobot A, body berbobot B) di-index
+dengan GIN expression index; ekspresi search_document() harus sama persis
+dengan index di migration search/0002_search_document_index. Di database
+lain (SQLite untuk development) kembali ke icontains.
+"""
+from collections import namedtuple
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Substr
+
+from assignments.models import Assignment
+from courses.models import Course
+from courses.search import SEARCH_CONFIG, is_postgres
+from discussions.models import Discussion, DiscussionComment
+from materials.models import Material
+from .models import SearchEntry
+
+# Batas teks per dokumen (tsvector PostgreSQL maksimal 1 MB)
+MAX_BODY_LENGTH = 100_000
+SNIPPET_LENGTH = 200
+
+# fields: field model yang memengaruhi dokumen (save dengan update_fields lain dilewati)
+# related: select_related untuk backfill
+Indexed = namedtuple('Indexed', 'entity_type model fields related build')
+
+
+def _course(course):
+    return {
+        'course_id': course.pk,
+        'title': f'{course.code} {course.name}',
+        'body': course.description,
+    }
+
+
+def _material(material):
+    return {'course_id': material.course_id, 'title': material.title, 'body': ''}
+
+
+def _assignment(assignment):
+    return {'course_id': assignment.course_id, 'title': assignment.title, 'body': assignment.description}
+
+
+def _discussion(discussion):
+    return {'course_id': discussion.course_id, 'title': discussion.title, 'body': discussion.content}
+
+
+def _comment(comment):
+    return {
+        'course_id': comment.discussion.course_id,
+        'parent_id': comment.discussion_id,
+        'title': '',
+        'body': comment.content,
+    }
+
+
+INDEXED_MODELS = [
+    Indexed(SearchEntry.COURSE, Course, {'code', 'name', 'description'}, (), _course),
+    Indexed(SearchEntry.MATERIAL, Material, {'title', 'course'}, (), _material),
+    Indexed(SearchEntry.ASSIGNMENT, Assignment, {'title', 'description', 'course'}, (), _assignment),
+    Indexed(SearchEntry.DISCUSSION, Discussion, {'title', 'content', 'course'}, (), _discussion),
+    Indexed(SearchEntry.COMMENT, DiscussionComment, {'content', 'discussion'}, ('discussion',), _comment),
+]
+BY_MODEL = {indexed.model: indexed for indexed in INDEXED_MODELS}
+
+
+def build_entry(indexed, instance):
+    """SearchEntry (belum disimpan) untuk satu instance"""
+    values = indexed.build(instance)
+    values['body'] = (values['body'] or '')[:MAX_BODY_LENGTH]
+    values['title'] = (values['title'] or '')[:255]
+    return SearchEntry(entity_type=indexed.entity_type, entity_id=instance.pk, **values)
+
+
+def index_instance(instance, update_fields=None):
+    indexed = BY_MODEL[type(instance)]
+    if update_fields is not None and not indexed.fields & set(update_fields):
+        return
+    entry = build_entry(indexed, instance)
+    SearchEntry.objects.update_or_create(
+        entity_type=entry.entity_type,
+        entity_id=entry.entity_id,
+        defaults={
+            'course_id': entry.course_id,
+            'parent_id': entry.parent_id,
+            'title': entry.title,
+            'body': entry.body,
+        },
+    )
+    if indexed.entity_type == SearchEntry.DISCUSSION:
+        # Entry komentar menyimpan course discussion-nya; ikut pindah jika course berubah
+        SearchEntry.objects.filter(
+            entity_type=SearchEntry.COMMENT, parent_id=instance.pk,
+        ).exclude(course_id=entry.course_id).update(course_id=entry.course_id)
+
+
+def remove_instance(instance):
+    indexed = BY_MODEL[type(instance)]
+    SearchEntry.objects.filter(entity_type=indexed.entity_type, entity_id=instance.pk).delete()
+
+
+def search_document():
+    """Dokumen full-text SearchEntry: title berbobot A, body berbobot B"""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('body', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def search_entries(queryset, term):
+    """
+    Filter dan ranking SearchEntry. Annotation `score` (None di luar
+    PostgreSQL) dan `snippet`; hasil terurut berdasarkan relevansi.
+    """
+    if not is_postgres():
+        return queryset.filter(
+            Q(title__icontains=term) | Q(body__icontains=term)
+        ).annotate(
+            score=Value(None, output_field=FloatField()),
+            snippet=Substr('body', 1, SNIPPET_LENGTH),
+        ).order_by('-updated_at', '-id')
+
+    query = SearchQuery(term, search_type='websearch', config=SEARCH_CONFIG)
+    # alias(): tsvector tidak ikut di-SELECT, hanya dipakai filter & rank
+    return queryset.alias(
+        search_document=search_document(),
+    ).filter(
+        search_document=query,
+    ).annotate(
+        score=SearchRank(F('search_document'), query),
+        snippet=SearchHeadline(
+            'body', query, config=SEARCH_CONFIG, max_words=30, min_words=10, short_word=2,
+        ),
+    ).order_by('-score', '-updated_at', '-id')
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from search.documents import INDEXED_MODELS, build_entry
+from search.models import SearchEntry
+
+UPDATE_FIELDS = ['course', 'parent_id', 'title', 'body', 'updated_at']
+
+
+class Command(BaseCommand):
+    help = "Backfill search_entries from courses, materials, assignments, discussions and comments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Entries written per INSERT ... ON CONFLICT statement',
+        )
+        parser.add_argument(
+            '--type',
+            choices=[indexed.entity_type for indexed in INDEXED_MODELS],
+            help='Only rebuild one entity type',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        started = time.monotonic()
+        total = 0
+
+        for indexed in INDEXED_MODELS:
+            if options['type'] and indexed.entity_type != options['type']:
+                continue
+            written = 0
+            batch = []
+            queryset = indexed.model.objects.select_related(*indexed.related).order_by('pk')
+            for instance in queryset.iterator(chunk_size=batch_size):
+                batch.append(build_entry(indexed, instance))
+                if len(batch) >= batch_size:
+                    written += self.write(batch)
+                    batch = []
+            written += self.write(batch)
+            removed = self.prune(indexed)
+            total += written
+            self.stdout.write(f"{indexed.entity_type}: {written} indexed, {removed} stale removed")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"✓ Indexed {total} document(s) in {elapsed:.1f}s"))
+
+    def write(self, entries):
+        if not entries:
+            return 0
+        # Upsert: backfill boleh dijalankan ulang kapan saja
+        SearchEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['entity_type', 'entity_id'],
+            update_fields=UPDATE_FIELDS,
+        )
+        return len(entries)
+
+    def prune(self, indexed):
+        """Hapus entry yang entity-nya sudah tidak ada (misalnya dihapus lewat .delete() massal)"""
+        exists = indexed.model.objects.filter(pk=OuterRef('entity_id'))
+        with transaction.atomic():
+            removed, _ = SearchEntry.objects.filter(entity_type=indexed.entity_type).exclude(
+                Exists(exists)
+            ).delete()
+        return removed
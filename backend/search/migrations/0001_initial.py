@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('courses', '0007_course_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('course', 'Course'), ('material', 'Material'), ('assignment', 'Assignment'), ('discussion', 'Discussion'), ('comment', 'Discussion comment')], max_length=20)),
+                ('entity_id', models.PositiveBigIntegerField()),
+                ('parent_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='courses.course')),
+            ],
+            options={
+                'db_table': 'search_entries',
+                'unique_together': {('entity_type', 'entity_id')},
+            },
+        ),
+    ]
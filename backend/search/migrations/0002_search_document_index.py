@@ -0,0 +1,83 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+BATCH_SIZE = 1000
+# Sama dengan search.documents.MAX_BODY_LENGTH
+MAX_BODY_LENGTH = 100_000
+
+
+def search_indexes():
+    # Hanya untuk PostgreSQL. Ekspresi disalin (bukan di-import) dari
+    # search.documents.search_document agar migration tidak berubah saat modul
+    # itu diubah; harus tetap sama persis
+    return [GinIndex(
+        SearchVector('title', weight='A', config='simple')
+        + SearchVector('body', weight='B', config='simple'),
+        name='search_entry_document_idx',
+    )]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    for index in search_indexes():
+        schema_editor.add_index(SearchEntry, index)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    for index in search_indexes():
+        schema_editor.remove_index(SearchEntry, index)
+
+
+def backfill_entries(apps, schema_editor):
+    """
+    Isi search_entries dari data yang sudah ada (model historis, aturan
+    dokumen disalin dari search.documents). Setelahnya index dijaga oleh
+    search.signals; command rebuild_search_index tetap bisa dipakai ulang.
+    """
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    sources = [
+        ('course', apps.get_model('courses', 'Course'), (),
+         lambda course: (course.pk, None, f'{course.code} {course.name}', course.description)),
+        ('material', apps.get_model('materials', 'Material'), (),
+         lambda material: (material.course_id, None, material.title, '')),
+        ('assignment', apps.get_model('assignments', 'Assignment'), (),
+         lambda assignment: (assignment.course_id, None, assignment.title, assignment.description)),
+        ('discussion', apps.get_model('discussions', 'Discussion'), (),
+         lambda discussion: (discussion.course_id, None, discussion.title, discussion.content)),
+        ('comment', apps.get_model('discussions', 'DiscussionComment'), ('discussion',),
+         lambda comment: (comment.discussion.course_id, comment.discussion_id, '', comment.content)),
+    ]
+
+    for entity_type, model, related, build in sources:
+        batch = []
+        for instance in model.objects.select_related(*related).order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            course_id, parent_id, title, body = build(instance)
+            batch.append(SearchEntry(
+                entity_type=entity_type, entity_id=instance.pk, course_id=course_id, parent_id=parent_id,
+                title=(title or '')[:255], body=(body or '')[:MAX_BODY_LENGTH],
+            ))
+            if len(batch) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        SearchEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('assignments', '0002_sync_models'),
+        ('discussions', '0002_sync_models'),
+        ('materials', '0002_sync_models'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        migrations.RunPython(backfill_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_image_variants'),
+        ('search', '0002_search_document_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchentry',
+            index=models.Index(fields=['entity_type', 'parent_id'], name='search_entry_parent_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import models
+from courses.models import Course
+
+
+class SearchEntry(models.Model):
+    """
+    Satu dokumen pencarian per course/material/assignment/discussion/komentar.
+    Diisi oleh search.signals dan command rebuild_search_index; dokumen
+    full-text (title berbobot A, body berbobot B) di-index di PostgreSQL,
+    lihat search.documents.
+    """
+    COURSE = 'course'
+    MATERIAL = 'material'
+    ASSIGNMENT = 'assignment'
+    DISCUSSION = 'discussion'
+    COMMENT = 'comment'
+    ENTITY_TYPES = [
+        (COURSE, 'Course'),
+        (MATERIAL, 'Material'),
+        (ASSIGNMENT, 'Assignment'),
+        (DISCUSSION, 'Discussion'),
+        (COMMENT, 'Discussion comment'),
+    ]
+
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPES)
+    entity_id = models.PositiveBigIntegerField()
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name='search_entries'
+    )
+    # Discussion dari komentar (untuk link di hasil pencarian)
+    parent_id = models.PositiveBigIntegerField(null=True, blank=True)
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_entries'
+        unique_together = ['entity_type', 'entity_id']
+        indexes = [
+            # Komentar satu discussion (pindah course, lihat search.documents)
+            models.Index(fields=['entity_type', 'parent_id'], name='search_entry_parent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.entity_id}"
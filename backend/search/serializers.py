@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """Satu hasil /api/search/ (dibangun dari .values() SearchEntry)"""
+    type = serializers.CharField(source='entity_type')
+    id = serializers.IntegerField(source='entity_id')
+    course = serializers.IntegerField(source='course_id')
+    # Discussion dari hasil bertipe comment
+    discussion = serializers.IntegerField(source='parent_id', allow_null=True)
+    title = serializers.CharField()
+    snippet = serializers.CharField(allow_blank=True)
+    # Relevansi (PostgreSQL); null di database lain
+    score = serializers.FloatField(allow_null=True)
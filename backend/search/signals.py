@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from assignments.models import Assignment
+from courses.models import Course
+from discussions.models import Discussion, DiscussionComment
+from materials.models import Material
+from .documents import index_instance, remove_instance
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Material)
+@receiver(post_save, sender=Assignment)
+@receiver(post_save, sender=Discussion)
+@receiver(post_save, sender=DiscussionComment)
+def entity_saved(sender, instance, update_fields=None, **kwargs):
+    """Dokumen pencarian di-update di transaksi yang sama dengan perubahannya"""
+    index_instance(instance, update_fields)
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Material)
+@receiver(post_delete, sender=Assignment)
+@receiver(post_delete, sender=Discussion)
+@receiver(post_delete, sender=DiscussionComment)
+def entity_deleted(sender, instance, **kwargs):
+    # Entry milik course yang dihapus juga ikut terhapus lewat FK cascade
+    remove_instance(instance)
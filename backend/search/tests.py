@@ -0,0 +1,137 @@
+import importlib
+from io import StringIO
+
+from django.apps import apps
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from courses.models import Course, Enrollment
+from discussions.models import Discussion, DiscussionComment
+from materials.models import Material
+from users.models import User
+from .documents import search_document
+from .models import SearchEntry
+
+
+class SearchTestMixin:
+    def setUp(self):
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.student = User.objects.create_user('ani', role='student')
+        self.outsider = User.objects.create_user('budi', role='student')
+        self.course = Course.objects.create(
+            name='Jaringan Komputer', code='NET101', description='Routing dan switching', lecturer=self.lecturer,
+        )
+        Enrollment.objects.create(student=self.student, course=self.course)
+        self.material = Material.objects.create(course=self.course, title='Modul routing statis', file_url='x')
+        self.discussion = Discussion.objects.create(
+            title='Tanya routing', content='Bagaimana routing OSPF?', user=self.student, course=self.course,
+        )
+        self.comment = DiscussionComment.objects.create(
+            discussion=self.discussion, user=self.lecturer, content='Routing OSPF memakai link state',
+        )
+
+    def entry(self, instance, entity_type):
+        return SearchEntry.objects.filter(entity_type=entity_type, entity_id=instance.pk).first()
+
+
+class SearchIndexSignalTest(SearchTestMixin, TestCase):
+    def test_create_edit_delete_update_the_index(self):
+        entry = self.entry(self.comment, SearchEntry.COMMENT)
+        self.assertEqual(entry.course_id, self.course.pk)
+        self.assertEqual(entry.parent_id, self.discussion.pk)
+
+        self.material.title = 'Modul VLAN'
+        self.material.save()
+        self.assertEqual(self.entry(self.material, SearchEntry.MATERIAL).title, 'Modul VLAN')
+
+        material_id = self.material.pk
+        self.material.delete()
+        self.assertFalse(SearchEntry.objects.filter(entity_type=SearchEntry.MATERIAL, entity_id=material_id).exists())
+
+    def test_moving_discussion_moves_its_comments(self):
+        other = Course.objects.create(name='Sistem Operasi', code='OS101', description='-', lecturer=self.lecturer)
+        self.discussion.course = other
+        self.discussion.save()
+
+        self.assertEqual(self.entry(self.discussion, SearchEntry.DISCUSSION).course_id, other.pk)
+        self.assertEqual(self.entry(self.comment, SearchEntry.COMMENT).course_id, other.pk)
+
+    def test_unrelated_update_fields_skip_reindex(self):
+        SearchEntry.objects.filter(entity_type=SearchEntry.COURSE).update(body='lama')
+        self.course.save(update_fields=['updated_at'])
+        self.assertEqual(self.entry(self.course, SearchEntry.COURSE).body, 'lama')
+
+
+class SearchViewTest(SearchTestMixin, TestCase):
+    def search(self, user, **params):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/api/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return {(row['type'], row['id']) for row in response.data['results']}
+
+    def test_non_member_only_sees_courses(self):
+        hits = self.search(self.outsider, q='routing')
+        self.assertEqual(hits, {(SearchEntry.COURSE, self.course.pk)})
+
+    def test_member_sees_own_course_content(self):
+        hits = self.search(self.student, q='routing')
+        self.assertEqual(hits, {
+            (SearchEntry.COURSE, self.course.pk),
+            (SearchEntry.MATERIAL, self.material.pk),
+            (SearchEntry.DISCUSSION, self.discussion.pk),
+            (SearchEntry.COMMENT, self.comment.pk),
+        })
+        self.assertEqual(self.search(self.student, q='routing', type='comment'), {(SearchEntry.COMMENT, self.comment.pk)})
+        self.assertEqual(self.search(self.student, q='routing', course='²'), set())
+
+    def test_edited_and_deleted_content_follows_index(self):
+        self.comment.content = 'Pakai distance vector saja'
+        self.comment.save()
+        self.assertNotIn((SearchEntry.COMMENT, self.comment.pk), self.search(self.student, q='link state'))
+        self.assertIn((SearchEntry.COMMENT, self.comment.pk), self.search(self.student, q='distance vector'))
+
+        discussion_id = self.discussion.pk
+        self.discussion.delete()
+        hits = self.search(self.student, q='routing')
+        self.assertNotIn((SearchEntry.DISCUSSION, discussion_id), hits)
+        self.assertNotIn(SearchEntry.COMMENT, {entity_type for entity_type, _ in hits})
+
+
+class RebuildSearchIndexTest(SearchTestMixin, TestCase):
+    def test_rebuild_upserts_and_prunes(self):
+        SearchEntry.objects.filter(entity_type=SearchEntry.MATERIAL).update(title='usang')
+        SearchEntry.objects.filter(entity_type=SearchEntry.COMMENT).delete()
+        SearchEntry.objects.create(
+            entity_type=SearchEntry.DISCUSSION, entity_id=self.discussion.pk + 1000, course=self.course,
+        )
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        self.assertEqual(self.entry(self.material, SearchEntry.MATERIAL).title, 'Modul routing statis')
+        self.assertIsNotNone(self.entry(self.comment, SearchEntry.COMMENT))
+        self.assertEqual(SearchEntry.objects.filter(entity_type=SearchEntry.DISCUSSION).count(), 1)
+        self.assertEqual(SearchEntry.objects.count(), 4)
+
+
+class SearchMigrationTest(SearchTestMixin, TestCase):
+    migration = 'search.migrations.0002_search_document_index'
+
+    def entries(self):
+        return set(SearchEntry.objects.values_list(
+            'entity_type', 'entity_id', 'course_id', 'parent_id', 'title', 'body',
+        ))
+
+    def test_backfill_matches_signal_entries(self):
+        expected = self.entries()
+        SearchEntry.objects.all().delete()
+
+        importlib.import_module(self.migration).backfill_entries(apps, None)
+
+        self.assertEqual(self.entries(), expected)
+
+    def test_index_expression_matches_search_document(self):
+        index, = importlib.import_module(self.migration).search_indexes()
+        self.assertEqual(index.expressions[0], search_document())
@@ -0,0 +1,54 @@
+from django.db.models import Q
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from users.context import get_auth_context
+from .documents import search_entries
+from .models import SearchEntry
+from .serializers import SearchResultSerializer
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+RESULT_FIELDS = ['entity_type', 'entity_id', 'course_id', 'parent_id', 'title', 'snippet', 'score']
+
+
+class SearchView(APIView):
+    """
+    Pencarian gabungan course, material, assignment, discussion dan komentar.
+    URL: /api/search/?q=<kata kunci>&type=<entity type>&course=<id>&limit=20
+
+    Satu query ke search_entries, dibatasi ke course yang diajar/diikuti user
+    (course sendiri tetap bisa dicari semua user, seperti /api/courses/).
+    Admin mencari di semua course.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response({'count': 0, 'results': []})
+
+        queryset = SearchEntry.objects.all()
+        auth = get_auth_context(request)
+        if not auth.is_admin:
+            course_ids = auth.taught_course_ids | auth.enrolled_course_ids
+            queryset = queryset.filter(Q(entity_type=SearchEntry.COURSE) | Q(course_id__in=course_ids))
+
+        entity_type = request.query_params.get('type')
+        if entity_type:
+            queryset = queryset.filter(entity_type=entity_type)
+        course_id = request.query_params.get('course')
+        if course_id:
+            queryset = queryset.filter(course_id=course_id if course_id.isascii() and course_id.isdigit() else None)
+
+        rows = list(search_entries(queryset, term).values(*RESULT_FIELDS)[:self._get_limit(request)])
+        serializer = SearchResultSerializer(rows, many=True)
+        return Response({'count': len(rows), 'results': serializer.data})
+
+    def _get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        return max(1, min(limit, MAX_LIMIT))
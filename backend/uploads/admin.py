@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import Blob, UploadSession
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('filename', 'owner', 'target', 'object_id', 'received', 'size', 'status', 'updated_at')
+    list_filter = ('status', 'target')
+    search_fields = ('filename', 'owner__username')
+    readonly_fields = ('received', 'sha256', 'file_url')
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'refcount', 'created_at')
+    search_fields = ('name', 'sha256')
+    readonly_fields = ('name', 'sha256', 'size', 'refcount', 'created_at')
@@ -0,0 +1,151 @@
+"""
+Penyimpanan chunk upload di disk dan checksum incremental.
+
+Chunk ditulis langsung ke MEDIA_ROOT/uploads/partial/<session>.part saat
+dibaca dari request (blok 64 KB), jadi file besar tidak pernah ada utuh di
+memori worker. SHA-256 di-update bersamaan dengan penulisan; state hasher
+disimpan per proses bersama offset-nya. Jika chunk berikutnya ditangani
+worker lain (atau setelah restart), hasher dibangun ulang dari prefix file
+di disk, sehingga hasilnya selalu benar.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+
+READ_BLOCK_SIZE = 64 * 1024
+PARTIAL_DIR = 'uploads/partial'
+# Lokasi akhir per target, relatif terhadap MEDIA_ROOT
+TARGET_DIRS = {
+    'submission': 'submissions',
+    'material': 'materials',
+}
+MAX_CACHED_HASHERS = 256
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+_hashers = OrderedDict()
+_hashers_lock = threading.Lock()
+
+
+def partial_path(session_id):
+    return os.path.join(settings.MEDIA_ROOT, PARTIAL_DIR, f'{session_id}.part')
+
+
+def final_name(session):
+    """Path relatif MEDIA_ROOT untuk file yang sudah lengkap"""
+    filename = get_valid_filename(session.filename) or 'file'
+    return f'{TARGET_DIRS[session.target]}/{session.id}/{filename}'
+
+
+def parse_content_range(header):
+    """'bytes 0-1023/4096' -> (0, 1023, 4096), atau None jika tidak valid"""
+    match = CONTENT_RANGE_RE.match(header or '')
+    if match is None:
+        return None
+    start, end, total = (int(value) for value in match.groups())
+    if end < start:
+        return None
+    return start, end, total
+
+
+def _take_hasher(session_id, offset):
+    with _hashers_lock:
+        entry = _hashers.pop(session_id, None)
+    if entry is not None and entry[0] == offset:
+        return entry[1]
+    return None
+
+
+def _store_hasher(session_id, offset, hasher):
+    with _hashers_lock:
+        _hashers[session_id] = (offset, hasher)
+        while len(_hashers) > MAX_CACHED_HASHERS:
+            _hashers.popitem(last=False)
+
+
+def _rebuild_hasher(path, offset):
+    """Hitung ulang SHA-256 dari `offset` byte pertama file di disk"""
+    hasher = hashlib.sha256()
+    remaining = offset
+    if remaining:
+        with open(path, 'rb') as handle:
+            while remaining:
+                block = handle.read(min(READ_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+    return hasher
+
+
+def write_chunk(session, stream, start, length):
+    """
+    Tulis `length` byte dari `stream` ke file partial mulai di `start`
+    (harus sama dengan session.received). Return jumlah byte yang tertulis;
+    bisa kurang dari `length` jika koneksi client putus di tengah chunk.
+    """
+    path = partial_path(session.id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    hasher = _take_hasher(session.id, start) or _rebuild_hasher(path, start)
+
+    written = 0
+    mode = 'r+b' if os.path.exists(path) else 'wb'
+    with open(path, mode) as handle:
+        handle.seek(start)
+        # Buang byte sisa chunk yang gagal sebelumnya
+        handle.truncate()
+        try:
+            while written < length:
+                block = stream.read(min(READ_BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                handle.write(block)
+                hasher.update(block)
+                written += len(block)
+        except OSError:
+            # Koneksi putus: simpan yang sudah diterima, client lanjut dari offset baru
+            pass
+
+    _store_hasher(session.id, start + written, hasher)
+    return written
+
+
+def file_digest(session):
+    """SHA-256 hex file partial yang sudah lengkap"""
+    hasher = _take_hasher(session.id, session.size)
+    if hasher is None:
+        hasher = _rebuild_hasher(partial_path(session.id), session.size)
+    return hasher.hexdigest()
+
+
+def move_to_final(session):
+    """
+    Pindahkan file partial ke lokasi akhirnya. Dengan ContentAddressedStorage
+    file masuk ke CAS memakai session.sha256 (tanpa hash ulang), selain itu
+    rename atomik ke final_name(). Return path relatif MEDIA_ROOT.
+    """
+    if hasattr(default_storage, 'ingest'):
+        return default_storage.ingest(
+            partial_path(session.id), session.sha256, session.size, session.filename
+        )
+
+    name = final_name(session)
+    destination = os.path.join(settings.MEDIA_ROOT, name)
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    os.replace(partial_path(session.id), destination)
+    return name
+
+
+def discard(session_id):
+    with _hashers_lock:
+        _hashers.pop(session_id, None)
+    try:
+        os.remove(partial_path(session_id))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from uploads.chunks import discard
+from uploads.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = "Delete pending upload sessions (and their partial files) that have been idle too long"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=48,
+            help='Idle time after which a pending session is removed (default: 48)',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = UploadSession.objects.filter(status='pending', updated_at__lt=cutoff)
+
+        removed = 0
+        for session_id in stale.values_list('pk', flat=True).iterator():
+            discard(session_id)
+            removed += 1
+        stale.delete()
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Removed {removed} stale upload session(s)"))
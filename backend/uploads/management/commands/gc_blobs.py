@@ -0,0 +1,90 @@
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from assignments.models import Submission
+from courses.images import variant_paths
+from courses.models import Course
+from materials.models import Material
+from uploads.models import Blob
+from uploads.storage import BLOB_DIR, TMP_DIR, is_blob_name, name_from_url, release
+
+# File tanpa row Blob yang lebih muda dari ini mungkin sedang di-ingest
+ORPHAN_FILE_MIN_AGE = 60 * 60
+
+
+def _referenced_blobs():
+    """Hitung referensi nyata ke setiap blob dari semua kolom yang menyimpan file"""
+    counts = Counter()
+    for image, variants in Course.objects.values_list('image', 'image_variants').iterator():
+        if is_blob_name(image):
+            counts[image] += 1
+        counts.update(path for path in variant_paths(variants) if is_blob_name(path))
+    for model in (Material, Submission):
+        for url in model.objects.values_list('file_url', flat=True).iterator():
+            name = name_from_url(url)
+            if name:
+                counts[name] += 1
+    return counts
+
+
+class Command(BaseCommand):
+    help = "Reconcile Blob reference counts with the database and delete unreferenced blobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be changed',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        counts = _referenced_blobs()
+
+        fixed = removed = 0
+        for blob in Blob.objects.only('id', 'name', 'refcount').iterator():
+            actual = counts.get(blob.name, 0)
+            if actual == blob.refcount:
+                continue
+            if actual == 0:
+                removed += 1
+                if not dry_run:
+                    # refcount 1 -> release() menghapus row dan file
+                    with transaction.atomic():
+                        Blob.objects.filter(pk=blob.pk).update(refcount=1)
+                        release(blob.name)
+            else:
+                fixed += 1
+                if not dry_run:
+                    Blob.objects.filter(pk=blob.pk).update(refcount=actual)
+
+        stray = self.remove_stray_files(dry_run)
+
+        prefix = "Would fix" if dry_run else "✓ Fixed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {fixed} refcount(s), {removed} unreferenced blob(s), {stray} stray file(s)"
+        ))
+
+    def remove_stray_files(self, dry_run):
+        """File di cas/ tanpa row Blob (ingest yang di-rollback) dan sisa file tmp"""
+        root = os.path.join(settings.MEDIA_ROOT, BLOB_DIR)
+        known = set(Blob.objects.values_list('name', flat=True))
+        cutoff = time.time() - ORPHAN_FILE_MIN_AGE
+        tmp_root = os.path.join(settings.MEDIA_ROOT, TMP_DIR)
+
+        removed = 0
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+                is_tmp = directory.startswith(tmp_root)
+                if (is_tmp or name not in known) and os.path.getmtime(path) < cutoff:
+                    removed += 1
+                    if not dry_run:
+                        os.remove(path)
+        return removed
@@ -0,0 +1,68 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class UploadSession(models.Model):
+    """Sesi upload bertahap (resumable) untuk file Submission atau Material"""
+
+    TARGET_CHOICES = [
+        ('submission', 'Submission'),
+        ('material', 'Material'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('complete', 'Complete'),
+    ]
+
+    # UUID agar URL sesi tidak bisa ditebak
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    filename = models.CharField(max_length=150)
+    size = models.PositiveBigIntegerField()
+    # Jumlah byte berurutan yang sudah tersimpan (offset untuk resume)
+    received = models.PositiveBigIntegerField(default=0)
+    # SHA-256 (hex) dari client (opsional) untuk diverifikasi saat finalize
+    expected_sha256 = models.CharField(max_length=64, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    file_url = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'upload_sessions'
+        ordering = ['-created_at']
+        indexes = [
+            # cleanup_uploads: sesi pending yang sudah lama tidak aktif
+            models.Index(fields=['status', 'updated_at'], name='upload_status_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size}) - {self.status}"
+
+
+class Blob(models.Model):
+    """
+    File di MEDIA_ROOT/cas/ yang disimpan berdasarkan SHA-256 isinya
+    (uploads.storage.ContentAddressedStorage). `refcount` = jumlah referensi
+    (Course.image, varian image, Material/Submission.file_url) ke file ini.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'blobs'
+
+    def __str__(self):
+        return f"{self.name} (refs: {self.refcount})"
@@ -0,0 +1,63 @@
+import re
+
+from django.conf import settings
+from rest_framework import serializers
+
+from assignments.models import Submission
+from materials.models import Material
+from users.context import get_auth_context
+from .models import UploadSession
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Serializer untuk membuat dan membaca status UploadSession"""
+    sha256 = serializers.CharField(
+        source='expected_sha256', required=False, allow_blank=True, write_only=True
+    )
+    checksum = serializers.CharField(source='sha256', read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'target', 'object_id', 'filename', 'size', 'sha256', 'received',
+                  'status', 'checksum', 'file_url', 'created_at']
+        read_only_fields = ['id', 'received', 'status', 'file_url', 'created_at']
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('File must not be empty.')
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'File is larger than {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes.'
+            )
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if value and not SHA256_RE.match(value):
+            raise serializers.ValidationError('Must be a hex-encoded SHA-256 digest.')
+        return value
+
+    def validate(self, attrs):
+        request = self.context['request']
+        if not can_upload_to(request, attrs['target'], attrs['object_id']):
+            raise serializers.ValidationError(
+                {'object_id': 'Target not found or you cannot upload to it.'}
+            )
+        return attrs
+
+
+def can_upload_to(request, target, object_id):
+    """Student pemilik submission, atau lecturer pengajar course material (admin selalu boleh)"""
+    user = request.user
+    if target == 'submission':
+        submissions = Submission.objects.filter(pk=object_id)
+        if user.role != 'admin':
+            submissions = submissions.filter(student=user)
+        return submissions.exists()
+
+    course_id = Material.objects.filter(pk=object_id).values_list('course_id', flat=True).first()
+    if course_id is None:
+        return False
+    return user.role == 'admin' or get_auth_context(request).teaches(course_id)
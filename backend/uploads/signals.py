@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from assignments.models import Submission
+from materials.models import Material
+from .storage import acquire, name_from_url, release
+
+
+@receiver(pre_save, sender=Submission)
+@receiver(pre_save, sender=Material)
+def file_owner_saving(sender, instance, **kwargs):
+    # assignments.signals me-reset _loaded_file_url di post_save sebelum
+    # handler di bawah jalan, jadi nilai awalnya disimpan dulu di sini
+    instance._previous_file_url = None if instance._state.adding else getattr(instance, '_loaded_file_url', None)
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_save, sender=Material)
+def file_owner_saved(sender, instance, update_fields=None, **kwargs):
+    """
+    file_url yang diisi/diganti lewat save() (misalnya URL disalin dari row
+    lain) menambah referensi blob baru dan melepas referensi blob lama.
+    Finalize upload memakai update() dan mengatur referensinya sendiri.
+    """
+    previous = instance.__dict__.pop('_previous_file_url', None)
+    if update_fields is not None and 'file_url' not in update_fields:
+        return
+    instance._loaded_file_url = instance.file_url
+    if previous == instance.file_url:
+        return
+
+    new_name = name_from_url(instance.file_url)
+    if new_name:
+        acquire(new_name)
+    old_name = name_from_url(previous)
+    if old_name:
+        transaction.on_commit(lambda: release(old_name))
+
+
+@receiver(post_delete, sender=Submission)
+@receiver(post_delete, sender=Material)
+def file_owner_deleted(sender, instance, **kwargs):
+    """Lepas referensi blob file_url (termasuk delete cascade dari course/assignment)"""
+    name = name_from_url(instance.file_url)
+    if name:
+        transaction.on_commit(lambda: release(name))
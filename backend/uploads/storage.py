@@ -0,0 +1,133 @@
+"""
+Storage MEDIA_ROOT berbasis isi file (content-addressed).
+
+Setiap file disimpan sekali di cas/<aa>/<bb>/<sha256><ext>; upload dengan isi
+yang sama (slide yang sama di banyak Material, starter file yang sama di
+banyak Submission) memakai file yang sudah ada. Jumlah referensi dicatat di
+uploads.models.Blob: save() menambah refcount, delete() menguranginya, dan
+file baru benar-benar dihapus saat refcount mencapai 0.
+
+URL blob tidak pernah berubah isinya, sehingga disajikan dengan
+Cache-Control immutable (uploads.views.serve_blob).
+"""
+import hashlib
+import os
+import re
+import tempfile
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+BLOB_DIR = 'cas'
+TMP_DIR = 'cas/tmp'
+BLOB_NAME_RE = re.compile(r'^cas/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(\.[a-z0-9]{1,10})?$')
+EXTENSION_RE = re.compile(r'^\.[a-z0-9]{1,10}$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def blob_name(digest, original_name):
+    """Nama blob dari hash; ekstensi asli dipertahankan untuk content type"""
+    ext = os.path.splitext(original_name or '')[1].lower()
+    if not EXTENSION_RE.match(ext):
+        ext = ''
+    return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+def is_blob_name(name):
+    return bool(BLOB_NAME_RE.match(name or ''))
+
+
+def name_from_url(url):
+    """'/media/cas/ab/cd/<sha>.pdf' -> 'cas/ab/cd/<sha>.pdf', None jika bukan URL blob"""
+    path = urlparse(url or '').path
+    prefix = '/' + settings.MEDIA_URL.strip('/') + '/'
+    if not path.startswith(prefix):
+        return None
+    name = path[len(prefix):]
+    return name if is_blob_name(name) else None
+
+
+def acquire(name):
+    """Tambah refcount blob yang dirujuk row lain (URL disalin); False jika blob tidak ada"""
+    from .models import Blob
+
+    return bool(Blob.objects.filter(name=name).update(refcount=F('refcount') + 1))
+
+
+def release(name):
+    """Kurangi refcount blob; hapus file dan row Blob jika tidak ada referensi lagi"""
+    from .models import Blob
+
+    with transaction.atomic():
+        blob = Blob.objects.select_for_update().filter(name=name).first()
+        if blob is None:
+            return
+        if blob.refcount > 1:
+            Blob.objects.filter(pk=blob.pk).update(refcount=F('refcount') - 1)
+            return
+        blob.delete()
+        # Langkah terakhir: jika gagal, penghapusan row ikut di-rollback
+        try:
+            os.remove(os.path.join(settings.MEDIA_ROOT, name))
+        except FileNotFoundError:
+            pass
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage dengan deduplikasi SHA-256 dan reference counting"""
+
+    # Dibaca courses.images: referensi lama selalu dilepas walau namanya sama
+    reference_counted = True
+
+    def get_available_name(self, name, max_length=None):
+        # Nama akhir ditentukan dari hash di _save, jadi tidak perlu cek bentrok
+        return name
+
+    def _save(self, name, content):
+        tmp_dir = self.path(TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            hasher, size = hashlib.sha256(), 0
+            with os.fdopen(fd, 'wb') as handle:
+                for chunk in content.chunks():
+                    handle.write(chunk)
+                    hasher.update(chunk)
+                    size += len(chunk)
+            return self.ingest(tmp_path, hasher.hexdigest(), size, name)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def ingest(self, path, digest, size, original_name):
+        """
+        Masukkan file lokal yang sudah di-hash (misalnya hasil upload bertahap)
+        ke CAS tanpa membaca ulang isinya. File sumber dipindah atau dihapus
+        jika isinya sudah ada. Return nama blob.
+        """
+        from .models import Blob
+
+        name = blob_name(digest, original_name)
+        destination = self.path(name)
+        with transaction.atomic():
+            # Row lock menyerialkan ingest/release untuk blob yang sama
+            blob, _ = Blob.objects.select_for_update().get_or_create(
+                name=name, defaults={'sha256': digest, 'size': size}
+            )
+            if os.path.exists(destination):
+                os.remove(path)
+            else:
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                os.replace(path, destination)
+                os.chmod(destination, self.file_permissions_mode or 0o644)
+            Blob.objects.filter(pk=blob.pk).update(refcount=F('refcount') + 1)
+        return name
+
+    def delete(self, name):
+        if is_blob_name(name):
+            release(name)
+        else:
+            super().delete(name)
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from courses.models import Course
+from materials.models import Material
+from users.models import User
+from .models import Blob, UploadSession
+from .storage import IMMUTABLE_CACHE_CONTROL, name_from_url
+
+CONTENT = b'0123456789ab'
+
+
+class MediaRootMixin:
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+        self.lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.course = Course.objects.create(name='Upload', code='UP101', description='-', lecturer=self.lecturer)
+        self.material = Material.objects.create(course=self.course, title='Slide', file_url='')
+        self.client = APIClient()
+        self.client.force_authenticate(self.lecturer)
+
+
+class ChunkedUploadTest(MediaRootMixin, TestCase):
+    def start(self, size=len(CONTENT), **extra):
+        response = self.client.post('/api/uploads/', {
+            'target': 'material', 'object_id': self.material.pk,
+            'filename': 'slide.pdf', 'size': size, **extra,
+        })
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def put(self, session_id, start, end, body=None, total=len(CONTENT)):
+        body = CONTENT[start:end + 1] if body is None else body
+        return self.client.put(
+            f'/api/uploads/{session_id}/', body, content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{total}',
+        )
+
+    def test_out_of_order_chunk_is_rejected_with_offset(self):
+        session_id = self.start(sha256=hashlib.sha256(CONTENT).hexdigest())
+        self.assertEqual(self.put(session_id, 0, 3).data['received'], 4)
+
+        response = self.put(session_id, 8, 11)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['received'], 4)
+
+        self.assertEqual(self.put(session_id, 4, 11).data['received'], len(CONTENT))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/uploads/{session_id}/finalize/')
+
+        self.assertEqual(response.data['status'], 'complete')
+        self.material.refresh_from_db()
+        name = name_from_url(self.material.file_url)
+        self.assertEqual(Blob.objects.get(name=name).refcount, 1)
+        with open(os.path.join(self.media_root, name), 'rb') as handle:
+            self.assertEqual(handle.read(), CONTENT)
+
+    @override_settings(CHUNKED_UPLOAD_MAX_CHUNK=4)
+    def test_oversized_chunk_is_rejected(self):
+        session_id = self.start()
+        self.assertEqual(self.put(session_id, 0, 7).status_code, 413)
+        self.assertEqual(UploadSession.objects.get(pk=session_id).received, 0)
+
+    def test_range_must_match_session_and_body(self):
+        session_id = self.start()
+        # Total berbeda dari size sesi
+        self.assertEqual(self.put(session_id, 0, 3, total=99).status_code, 400)
+        # Body lebih pendek dari range
+        self.assertEqual(self.put(session_id, 0, 3, body=b'01').status_code, 400)
+        response = self.client.put(f'/api/uploads/{session_id}/', b'0123', content_type='application/octet-stream')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(CHUNKED_UPLOAD_MAX_SIZE=8)
+    def test_file_larger_than_limit_is_refused(self):
+        response = self.client.post('/api/uploads/', {
+            'target': 'material', 'object_id': self.material.pk, 'filename': 'besar.pdf', 'size': 9,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('size', response.data)
+
+
+class BlobStorageTest(MediaRootMixin, TestCase):
+    def test_last_reference_deletes_the_file(self):
+        first = default_storage.save('materials/a.pdf', ContentFile(CONTENT))
+        second = default_storage.save('materials/b.pdf', ContentFile(CONTENT))
+        self.assertEqual(first, second)
+        path = os.path.join(self.media_root, first)
+        self.assertEqual(Blob.objects.get(name=first).refcount, 2)
+
+        default_storage.delete(first)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(Blob.objects.get(name=first).refcount, 1)
+
+        default_storage.delete(second)
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(Blob.objects.filter(name=first).exists())
+
+    def test_serve_blob_is_immutable(self):
+        name = default_storage.save('materials/slide.pdf', ContentFile(CONTENT))
+        url = default_storage.url(name)
+        etag = f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertFalse(response['Content-Disposition'].startswith('attachment'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+
+    def test_serve_blob_forces_download_for_html(self):
+        name = default_storage.save('materials/page.html', ContentFile(b'<script></script>'))
+        response = self.client.get(default_storage.url(name))
+        self.assertTrue(response['Content-Disposition'].startswith('attachment'))
+        self.assertEqual(self.client.get('/media/cas/zz/not-a-blob').status_code, 404)
+
+
+class FileReferenceTest(MediaRootMixin, TestCase):
+    def upload(self, material, filename, content):
+        # Seperti finalize: blob di-ingest lalu file_url di-set lewat update()
+        name = default_storage.save(f'materials/{filename}', ContentFile(content))
+        Material.objects.filter(pk=material.pk).update(file_url=default_storage.url(name))
+        material.refresh_from_db()
+        return name
+
+    def test_copied_url_survives_delete_of_original(self):
+        name = self.upload(self.material, 'slide.pdf', CONTENT)
+        copy = Material.objects.create(course=self.course, title='Salinan', file_url=self.material.file_url)
+        self.assertEqual(Blob.objects.get(name=name).refcount, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.material.delete()
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+        self.assertEqual(Blob.objects.get(name=name).refcount, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            copy.delete()
+        self.assertFalse(Blob.objects.filter(name=name).exists())
+
+    def test_reassigned_url_moves_the_reference(self):
+        old_name = self.upload(self.material, 'lama.pdf', CONTENT)
+        other = Material.objects.create(course=self.course, title='Lain', file_url='')
+        new_name = self.upload(other, 'baru.pdf', b'isi lain')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/materials/{self.material.pk}/', {'file_url': other.file_url}, format='json'
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+
+        self.assertFalse(Blob.objects.filter(name=old_name).exists())
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, old_name)))
+        self.assertEqual(Blob.objects.get(name=new_name).refcount, 2)
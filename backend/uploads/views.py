@@ -0,0 +1,174 @@
+import mimetypes
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import FileResponse, Http404
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from assignments.models import Submission
+from assignments.similarity import schedule_signature
+from materials.models import Material
+from .chunks import discard, file_digest, move_to_final, parse_content_range, write_chunk
+from .models import UploadSession
+from .serializers import UploadSessionSerializer
+from .storage import IMMUTABLE_CACHE_CONTROL, BLOB_NAME_RE, name_from_url, release
+
+TARGET_MODELS = {
+    'submission': Submission,
+    'material': Material,
+}
+
+
+class UploadSessionViewSet(mixins.CreateModelMixin,
+                           mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    Upload file bertahap yang bisa dilanjutkan (resumable):
+
+    1. POST   /api/uploads/                  {target, object_id, filename, size, sha256?}
+    2. PUT    /api/uploads/{id}/             body = byte mentah, header
+                                             Content-Range: bytes <start>-<end>/<size>
+    3. GET    /api/uploads/{id}/             -> `received` = offset untuk melanjutkan
+    4. POST   /api/uploads/{id}/finalize/    -> set file_url pada Submission/Material
+    """
+    queryset = UploadSession.objects.all()
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(owner=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+    def update(self, request, *args, **kwargs):
+        """Terima satu byte range; body dibaca langsung dari stream request"""
+        session = self.get_object()
+        if session.status != 'pending':
+            return Response({'detail': 'Upload is already finalized.'}, status=status.HTTP_409_CONFLICT)
+
+        content_range = parse_content_range(request.META.get('HTTP_CONTENT_RANGE'))
+        if content_range is None:
+            return Response(
+                {'detail': 'Content-Range header "bytes <start>-<end>/<size>" is required.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        start, end, total = content_range
+        length = end - start + 1
+        if total != session.size or end >= session.size:
+            return Response({'detail': 'Range does not match the upload size.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.CHUNKED_UPLOAD_MAX_CHUNK:
+            return Response({'detail': f'Chunks are limited to {settings.CHUNKED_UPLOAD_MAX_CHUNK} bytes.'},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if int(request.META.get('CONTENT_LENGTH') or 0) != length:
+            return Response({'detail': 'Content-Length does not match Content-Range.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Row lock: chunk untuk sesi yang sama tidak ditulis bersamaan
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            if start != session.received:
+                return Response(
+                    {'detail': 'Chunk does not start at the current offset.', 'received': session.received},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            written = write_chunk(session, request._request, start, length)
+            session.received = start + written
+            session.save(update_fields=['received', 'updated_at'])
+
+        if written < length:
+            return Response(
+                {'detail': 'Chunk was incomplete.', 'received': session.received},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(self.get_serializer(session).data)
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        session = self.get_object()
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            if session.status == 'complete':
+                return Response(self.get_serializer(session).data)
+            if session.received != session.size:
+                return Response(
+                    {'detail': 'Upload is incomplete.', 'received': session.received},
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            digest = file_digest(session)
+            if session.expected_sha256 and digest != session.expected_sha256:
+                # File rusak: mulai ulang dari offset 0
+                discard(session.pk)
+                session.received = 0
+                session.save(update_fields=['received', 'updated_at'])
+                return Response({'detail': 'Checksum mismatch, upload restarted.', 'received': 0},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            model = TARGET_MODELS[session.target]
+            old_url = model.objects.filter(pk=session.object_id).values_list('file_url', flat=True).first()
+            if old_url is None:
+                raise NotFound('Upload target no longer exists.')
+
+            session.sha256 = digest
+            name = move_to_final(session)
+            session.file_url = default_storage.url(name)
+            session.status = 'complete'
+            model.objects.filter(pk=session.object_id).update(file_url=session.file_url)
+            session.save(update_fields=['sha256', 'status', 'file_url', 'updated_at'])
+
+            if session.target == 'submission':
+                # file_url di-set lewat update(), jadi signal post_save tidak terpanggil
+                submission_id = session.object_id
+                transaction.on_commit(lambda: schedule_signature(submission_id))
+
+            # File lama tidak lagi direferensikan target ini
+            old_name = name_from_url(old_url)
+            if old_name:
+                transaction.on_commit(lambda: release(old_name))
+
+        return Response(self.get_serializer(session).data)
+
+    def perform_destroy(self, instance):
+        if instance.status == 'pending':
+            discard(instance.pk)
+        instance.delete()
+
+
+# Dibuka inline di browser; tipe lain (HTML, SVG, dll.) dipaksa download
+INLINE_CONTENT_TYPES = ('image/png', 'image/jpeg', 'image/gif', 'image/webp', 'application/pdf')
+INLINE_CONTENT_PREFIXES = ('video/', 'audio/')
+
+
+@require_safe
+def serve_blob(request, name):
+    """
+    /media/cas/<aa>/<bb>/<sha256><ext>: isi URL tidak pernah berubah, jadi
+    browser dan proxy boleh menyimpannya selamanya tanpa revalidasi.
+    """
+    match = BLOB_NAME_RE.match(name)
+    if match is None:
+        raise Http404
+    etag = f'"{match.group(1)}"'
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        try:
+            handle = open(default_storage.path(name), 'rb')
+        except FileNotFoundError:
+            raise Http404
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        inline = content_type in INLINE_CONTENT_TYPES or content_type.startswith(INLINE_CONTENT_PREFIXES)
+        response = FileResponse(handle, content_type=content_type, as_attachment=not inline)
+    response['ETag'] = etag
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -0,0 +1,82 @@
+"""
+JWTAuthentication dengan cache user.
+
+JWTAuthentication bawaan melakukan SELECT ke tabel users di setiap request.
+Di sini semua field User kecuali password disimpan di cache dengan TTL
+pendek, lalu request.user dibangun sebagai instance User dari cache. Hanya
+password yang deferred, sehingga serializer dan permission (email, is_staff,
+/api/users/me/, ...) tidak memicu query tambahan.
+
+Cache default Django per proses: users.signals hanya menghapus entry di
+worker yang menyimpan User. Karena itu token membawa versi user
+(USER_VERSION_CLAIM, updated_at saat login) dan entry yang lebih tua dari
+versi token dibaca ulang dari database, sehingga token baru setelah ganti
+role/nonaktif langsung konsisten di semua worker. Token lama tetap bisa
+membaca entry lama sampai JWT_USER_CACHE_TIMEOUT habis.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# Naikkan versi jika daftar field berubah agar entry lama tidak terbaca.
+# Urutan sama dengan urutan field di model (dipakai User.from_db)
+CACHE_VERSION = 2
+CACHED_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields if field.attname != 'password'
+)
+UPDATED_AT_INDEX = CACHED_FIELDS.index('updated_at')
+USER_VERSION_CLAIM = 'user_version'
+
+
+def user_version(updated_at):
+    """Versi user (mikrodetik updated_at) untuk claim token dan perbandingan cache"""
+    return int(updated_at.timestamp() * 1_000_000)
+
+
+def user_cache_key(user_id):
+    return f'jwt-user:v{CACHE_VERSION}:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Pengganti rest_framework_simplejwt JWTAuthentication di REST_FRAMEWORK"""
+
+    def get_user(self, validated_token):
+        # Revoke-token butuh hash password; pakai jalur bawaan (query) jika aktif
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        token_version = validated_token.get(USER_VERSION_CLAIM)
+        if values is not None and token_version is not None:
+            # Entry dibuat sebelum user berubah (di worker lain): baca ulang
+            if user_version(values[UPDATED_AT_INDEX]) < token_version:
+                values = None
+        if values is None:
+            values = User.objects.filter(pk=user_id).values_list(*CACHED_FIELDS).first()
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(key, values, settings.JWT_USER_CACHE_TIMEOUT)
+
+        # Hanya password yang deferred
+        user = User.from_db(DEFAULT_DB_ALIAS, CACHED_FIELDS, values)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
@@ -0,0 +1,79 @@
+"""
+Konteks otorisasi per request.
+
+Course yang diajar dan diikuti user di-load sekali (satu query) saat pertama
+dibutuhkan, lalu dipakai ulang oleh permission class, get_queryset, dan
+serializer selama request yang sama. Pengecekan cukup membandingkan `*_id`
+dengan set di memori, tanpa lazy-load FK seperti obj.course.lecturer.
+"""
+from functools import cached_property
+
+from django.db.models import Exists, OuterRef, Q
+
+
+class AuthContext:
+    def __init__(self, user):
+        self.user = user
+
+    @property
+    def user_id(self):
+        return self.user.pk if self.user.is_authenticated else None
+
+    @property
+    def is_admin(self):
+        return self.user.is_authenticated and self.user.role == 'admin'
+
+    @cached_property
+    def _course_ids(self):
+        """(taught_ids, enrolled_ids) dalam satu query"""
+        if not self.user.is_authenticated:
+            return frozenset(), frozenset()
+
+        from courses.models import Course, Enrollment
+
+        rows = (
+            Course.objects.annotate(
+                enrolled=Exists(
+                    Enrollment.objects.filter(
+                        course=OuterRef('pk'), student=self.user, is_active=True
+                    )
+                )
+            )
+            .filter(Q(lecturer=self.user) | Q(enrolled=True))
+            .values_list('id', 'lecturer_id', 'enrolled')
+        )
+        taught, enrolled = set(), set()
+        for course_id, lecturer_id, is_enrolled in rows:
+            if lecturer_id == self.user.pk:
+                taught.add(course_id)
+            if is_enrolled:
+                enrolled.add(course_id)
+        return frozenset(taught), frozenset(enrolled)
+
+    @property
+    def taught_course_ids(self):
+        return self._course_ids[0]
+
+    @property
+    def enrolled_course_ids(self):
+        return self._course_ids[1]
+
+    def teaches(self, course_id):
+        return course_id in self.taught_course_ids
+
+    def is_enrolled(self, course_id):
+        return course_id in self.enrolled_course_ids
+
+    def is_member(self, course_id):
+        """Lecturer pengajar atau student yang terdaftar di course"""
+        return self.teaches(course_id) or self.is_enrolled(course_id)
+
+
+def get_auth_context(request):
+    """AuthContext untuk request ini (dibuat sekali, disimpan di HttpRequest)"""
+    http_request = getattr(request, '_request', request)
+    context = getattr(http_request, '_auth_context', None)
+    if context is None or context.user is not request.user:
+        context = AuthContext(request.user)
+        http_request._auth_context = context
+    return context
@@ -0,0 +1,213 @@
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from users.models import User
+
+REQUIRED_COLUMNS = ('username', 'email', 'password')
+VALID_ROLES = {choice for choice, _ in User.ROLE_CHOICES}
+# Batas parameter per query IN (SQLite membatasi jumlah variabel)
+LOOKUP_CHUNK = 5000
+MAX_REPORTED_ERRORS = 20
+
+
+def _init_worker():
+    # Worker process (spawn/forkserver) perlu setup Django sebelum make_password
+    if not apps.ready:
+        django.setup()
+
+
+def _hash_password(password):
+    return make_password(password)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import users from a CSV file (username,email,password[,first_name,last_name,role]). "
+        "Passwords are hashed in parallel across processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path to the CSV file')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk_create batch (default: 1000)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Processes used for password hashing (default: all cores)',
+        )
+        parser.add_argument(
+            '--default-role',
+            choices=sorted(VALID_ROLES),
+            default='student',
+            help="Role for rows without a 'role' column value (default: student)",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file and report what would be imported',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        batch_size = max(1, options['batch_size'])
+        workers = max(1, options['workers'])
+
+        # 1. Validasi seluruh file dulu; tidak ada yang ditulis jika ada error
+        rows = self.read_rows(options['csv_file'], options['default_role'])
+        self.stdout.write(f"Validated {len(rows)} row(s).")
+
+        # 2. Lewati username/email yang sudah ada (query per chunk, bukan per baris)
+        existing_usernames = self.existing_values(
+            User.objects.all(), 'username', [row['username'] for row in rows]
+        )
+        existing_emails = self.existing_values(
+            User.objects.annotate(email_lower=Lower('email')),
+            'email_lower',
+            [row['email'].lower() for row in rows],
+        )
+        new_rows = [
+            row for row in rows
+            if row['username'] not in existing_usernames
+            and row['email'].lower() not in existing_emails
+        ]
+        skipped = len(rows) - len(new_rows)
+        if skipped:
+            self.stdout.write(f"Skipping {skipped} row(s) with an existing username or email.")
+
+        if options['dry_run'] or not new_rows:
+            self.stdout.write(self.style.SUCCESS(f"{len(new_rows)} user(s) would be imported."))
+            return
+
+        # 3. Hash paralel; batch di-insert segera setelah hash-nya siap
+        created = 0
+        hash_started = time.perf_counter()
+        chunksize = max(1, min(64, len(new_rows) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            hashes = executor.map(
+                _hash_password, (row['password'] for row in new_rows), chunksize=chunksize
+            )
+            for batch in _chunks(zip(new_rows, hashes), batch_size):
+                users = [self.build_user(row, password_hash) for row, password_hash in batch]
+                with transaction.atomic():
+                    User.objects.bulk_create(users, batch_size=batch_size)
+                created += len(users)
+                self.stdout.write(f"  inserted {created}/{len(new_rows)}")
+
+        elapsed = time.perf_counter() - started
+        hash_elapsed = time.perf_counter() - hash_started
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Imported {created} user(s), skipped {skipped} in {elapsed:.1f}s "
+            f"({created / hash_elapsed:.0f} users/s with {workers} worker(s))"
+        ))
+
+    def read_rows(self, path, default_role):
+        try:
+            handle = open(path, newline='', encoding='utf-8-sig')
+        except OSError as e:
+            raise CommandError(f"Cannot open {path}: {e}")
+
+        rows, errors = [], []
+        seen_usernames, seen_emails = {}, {}
+        with handle:
+            reader = csv.DictReader(handle)
+            columns = {name.strip() for name in reader.fieldnames or []}
+            missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+            if missing:
+                raise CommandError(f"Missing required column(s): {', '.join(missing)}")
+
+            # Baris 1 adalah header
+            for line, raw in enumerate(reader, start=2):
+                # Kolom berlebih (key None) diabaikan
+                row = {
+                    key.strip(): (value or '').strip()
+                    for key, value in raw.items()
+                    if key is not None
+                }
+                row['username'] = User.normalize_username(row.get('username', ''))
+                row['email'] = User.objects.normalize_email(row.get('email', ''))
+                row['role'] = row.get('role') or default_role
+                row_errors = self.validate_row(row)
+
+                username, email = row['username'], row['email'].lower()
+                if username in seen_usernames:
+                    row_errors.append(f"duplicate username (line {seen_usernames[username]})")
+                if email in seen_emails:
+                    row_errors.append(f"duplicate email (line {seen_emails[email]})")
+                seen_usernames.setdefault(username, line)
+                seen_emails.setdefault(email, line)
+
+                if row_errors:
+                    errors.append(f"line {line}: {'; '.join(row_errors)}")
+                else:
+                    rows.append(row)
+
+        if errors:
+            shown = '\n'.join(errors[:MAX_REPORTED_ERRORS])
+            more = len(errors) - MAX_REPORTED_ERRORS
+            if more > 0:
+                shown += f"\n... and {more} more"
+            raise CommandError(f"{len(errors)} invalid row(s), nothing imported:\n{shown}")
+        return rows
+
+    def validate_row(self, row):
+        errors = []
+        if not row['username']:
+            errors.append("username is required")
+        else:
+            try:
+                User.username_validator(row['username'])
+            except ValidationError as e:
+                errors.extend(e.messages)
+            if len(row['username']) > User._meta.get_field('username').max_length:
+                errors.append("username is too long")
+        try:
+            validate_email(row['email'])
+        except ValidationError:
+            errors.append(f"invalid email '{row['email']}'")
+        if not row.get('password'):
+            errors.append("password is required")
+        if row['role'] not in VALID_ROLES:
+            errors.append(f"invalid role '{row['role']}'")
+        return errors
+
+    def existing_values(self, queryset, field, values):
+        existing = set()
+        for chunk in _chunks(set(values), LOOKUP_CHUNK):
+            existing.update(
+                queryset.filter(**{f'{field}__in': chunk}).values_list(field, flat=True)
+            )
+        return existing
+
+    def build_user(self, row, password_hash):
+        return User(
+            username=row['username'],
+            email=row['email'],
+            password=password_hash,
+            first_name=row.get('first_name', ''),
+            last_name=row.get('last_name', ''),
+            role=row['role'],
+            is_staff=row['role'] == 'admin',
+        )
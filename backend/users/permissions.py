@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission
+from .context import get_auth_context
 
 
 class IsAdmin(BasePermission):
@@ -60,18 +61,18 @@ class IsOwnerOrAdmin(BasePermission):
         
         # === COURSE ===
         # Pemilik: Dosen yang mengajar (lecturer)
-        if hasattr(obj, 'lecturer'):
-            return obj.lecturer == request.user
+        if hasattr(obj, 'lecturer_id'):
+            return obj.lecturer_id == request.user.id
         
         # === SUBMISSION ===
         # Pemilik: Mahasiswa yang submit (student)
-        if hasattr(obj, 'student'):
-            return obj.student == request.user
+        if hasattr(obj, 'student_id'):
+            return obj.student_id == request.user.id
         
         # === ASSIGNMENT & MATERIAL ===
-        # Pemilik: Dosen yang mengajar course tersebut
-        if hasattr(obj, 'course'):
-            return obj.course.lecturer == request.user
+        # Pemilik: Dosen yang mengajar course tersebut (cek di AuthContext, tanpa load FK)
+        if hasattr(obj, 'course_id'):
+            return get_auth_context(request).teaches(obj.course_id)
         
         return False
 
@@ -85,12 +86,12 @@ class IsCourseOwner(BasePermission):
             return True
         
         # Untuk Course langsung
-        if hasattr(obj, 'lecturer'):
-            return obj.lecturer == request.user
+        if hasattr(obj, 'lecturer_id'):
+            return obj.lecturer_id == request.user.id
         
         # Untuk Assignment/Material yang punya course
-        if hasattr(obj, 'course'):
-            return obj.course.lecturer == request.user
+        if hasattr(obj, 'course_id'):
+            return get_auth_context(request).teaches(obj.course_id)
         
         return False
 
@@ -105,12 +106,13 @@ class IsSubmissionOwner(BasePermission):
             return True
         
         # Mahasiswa pemilik submission
-        if hasattr(obj, 'student') and obj.student == request.user:
+        if hasattr(obj, 'student_id') and obj.student_id == request.user.id:
             return True
         
-        # Lecturer dari course assignment tersebut (untuk grading)
-        if hasattr(obj, 'assignment'):
-            return obj.assignment.course.lecturer == request.user
+        # Lecturer dari course assignment tersebut (untuk grading).
+        # SubmissionViewSet memakai select_related('assignment') agar course_id sudah ada
+        if hasattr(obj, 'assignment_id'):
+            return get_auth_context(request).teaches(obj.assignment.course_id)
         
         return False
 
@@ -127,7 +129,7 @@ class IsDiscussionOwner(BasePermission):
             return True
         
         # Untuk Discussion atau Comment
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
+        if hasattr(obj, 'user_id'):
+            return obj.user_id == request.user.id
         
         return False
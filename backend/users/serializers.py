@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .authentication import USER_VERSION_CLAIM, user_version
 from .models import User
 
 class UserSerializer(serializers.ModelSerializer):
@@ -19,4 +21,13 @@ class UserCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
-        return user
\ No newline at end of file
+        return user
+
+class VersionedTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token membawa versi user agar cache CachedJWTAuthentication tahu entry yang usang"""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[USER_VERSION_CLAIM] = user_version(user.updated_at)
+        return token
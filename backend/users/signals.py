@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import invalidate_cached_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Hapus cache JWT user (role/is_active bisa berubah, termasuk dari UserAdmin)"""
+    invalidate_cached_user(instance.pk)
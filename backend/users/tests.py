@@ -1,3 +1,170 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from courses.models import Course, Enrollment
+from .authentication import USER_VERSION_CLAIM, CachedJWTAuthentication, user_version
+from .context import AuthContext
+from .models import User
+from .serializers import UserSerializer
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('ani', email='ani@example.com', password='rahasia-123', role='student')
+
+    def _authenticate(self, access):
+        auth = CachedJWTAuthentication()
+        return auth.get_user(auth.get_validated_token(access))
+
+    def _login(self):
+        response = self.client.post('/api/token/', {'username': 'ani', 'password': 'rahasia-123'})
+        self.assertEqual(response.status_code, 200)
+        return response.data['access']
+
+    def test_token_carries_user_version(self):
+        token = AccessToken(self._login())
+        self.user.refresh_from_db()
+        self.assertEqual(token[USER_VERSION_CLAIM], user_version(self.user.updated_at))
+
+    def test_cached_user_needs_no_queries(self):
+        access = self._login()
+        self._authenticate(access)
+
+        with self.assertNumQueries(0):
+            user = self._authenticate(access)
+            self.assertEqual((user.email, user.role, user.is_staff), ('ani@example.com', 'student', False))
+
+    def test_me_is_served_from_cached_user(self):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {self._login()}'}
+        self.client.get('/api/users/me/', **headers)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/users/me/', **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['username'], response.data['email']), ('ani', 'ani@example.com'))
+
+    def test_entry_older_than_token_is_reloaded(self):
+        self._authenticate(self._login())
+        # Perubahan dari worker lain: signal tidak menghapus cache di proses ini
+        User.objects.filter(pk=self.user.pk).update(
+            role='lecturer', updated_at=timezone.now() + timedelta(seconds=1)
+        )
+
+        # Login ulang tidak menyimpan user (UPDATE_LAST_LOGIN mati), jadi cache
+        # hanya dibuang karena versi di token lebih baru
+        self.assertEqual(self._authenticate(self._login()).role, 'lecturer')
+
+
+class AuthContextTest(TestCase):
+    def setUp(self):
+        lecturer = User.objects.create_user('dosen', role='lecturer')
+        self.student = User.objects.create_user('ani', role='student')
+        for index in range(3):
+            course = Course.objects.create(name=f'Course {index}', code=f'AC{index}', description='-', lecturer=lecturer)
+            Enrollment.objects.create(student=self.student, course=course)
+        Course.objects.create(name='Lain', code='OTHER', description='-', lecturer=lecturer)
+
+    def test_context_is_loaded_once_per_request(self):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        # get_queryset (?enrolled=true) dan is_enrolled tiap baris memakai konteks yang sama:
+        # konteks otorisasi, ETag, COUNT halaman, isi halaman
+        with self.assertNumQueries(4):
+            response = client.get('/api/courses/', {'enrolled': 'true'})
+
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertTrue(all(course['is_enrolled'] for course in response.data['results']))
+
+    def test_taught_and_enrolled_ids_in_one_query(self):
+        context = AuthContext(self.student)
+        with self.assertNumQueries(1):
+            enrolled = context.enrolled_course_ids
+            self.assertEqual(context.taught_course_ids, frozenset())
+            self.assertTrue(all(context.is_member(course_id) for course_id in enrolled))
+        self.assertEqual(len(enrolled), 3)
+
+
+class StreamingUserListTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', role='admin')
+        self.students = [User.objects.create_user(f'student{index}', role='student') for index in range(5)]
+        User.objects.create_user('dosen', role='lecturer')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_json_array_is_streamed(self):
+        response = self.client.get('/api/users/', {'all': 'true', 'role': 'student'})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([row['username'] for row in rows], [student.username for student in self.students])
+        self.assertEqual(set(rows[0]), set(UserSerializer.Meta.fields))
+
+    def test_ndjson_has_one_object_per_line(self):
+        for params, headers in [({'stream': 'ndjson'}, {}), ({}, {'HTTP_ACCEPT': 'application/x-ndjson'})]:
+            with self.subTest(params=params):
+                response = self.client.get('/api/users/', {'all': 'true', **params}, **headers)
+                self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+                lines = b''.join(response.streaming_content).decode().splitlines()
+                self.assertEqual(len(lines), User.objects.count())
+                self.assertEqual(json.loads(lines[0])['username'], 'admin')
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportUsersCommandTest(TestCase):
+    def write_csv(self, text):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            handle.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_existing_usernames_and_emails_are_skipped(self):
+        User.objects.create_user('ani', email='ani@example.com', role='student')
+        User.objects.create_user('lama', email='Budi@Example.com', role='student')
+        path = self.write_csv(
+            'username,email,password,first_name,role\n'
+            'ani,ani.baru@example.com,rahasia-1,Ani,\n'
+            'budi,budi@example.com,rahasia-2,Budi,\n'
+            'citra,citra@example.com,rahasia-3,Citra,lecturer\n'
+        )
+
+        out = StringIO()
+        call_command('import_users', path, '--workers=1', stdout=out)
+
+        self.assertIn('Imported 1 user(s), skipped 2', out.getvalue())
+        citra = User.objects.get(username='citra')
+        self.assertEqual((citra.first_name, citra.role), ('Citra', 'lecturer'))
+        self.assertTrue(citra.check_password('rahasia-3'))
+        self.assertEqual(User.objects.count(), 3)
+
+    def test_bad_rows_abort_the_whole_import(self):
+        path = self.write_csv(
+            'username,email,password,role\n'
+            'dodi,dodi@example.com,rahasia,student\n'
+            'dodi,dodi2@example.com,rahasia,student\n'
+            'eka,bukan-email,rahasia,student\n'
+            'fani,fani@example.com,,dekan\n'
+        )
+
+        with self.assertRaises(CommandError) as raised:
+            call_command('import_users', path, '--workers=1', stdout=StringIO())
+
+        message = str(raised.exception)
+        self.assertIn('3 invalid row(s)', message)
+        self.assertIn('line 3: duplicate username (line 2)', message)
+        self.assertIn("line 4: invalid email 'bukan-email'", message)
+        self.assertIn("line 5: password is required; invalid role 'dekan'", message)
+        self.assertFalse(User.objects.exists())
@@ -5,14 +5,17 @@ from rest_framework.response import Response
 from .models import User
 from .serializers import UserSerializer, UserCreateSerializer
 from .permissions import IsAdmin
+from eduplatform.streaming import StreamingListMixin
 
 # HAPUS BARIS INI JIKA ADA: from .models import Course, Enrollment
 # Model Course dan Enrollment tidak diperlukan di UserViewSet ini
 # kecuali jika Anda ingin menampilkan course di profil user, tapi biasanya itu diurus oleh serializer.
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """ViewSet untuk User CRUD operations"""
     queryset = User.objects.all()
+    # Field yang di-stream untuk ?all=true (sama dengan UserSerializer)
+    stream_fields = UserSerializer.Meta.fields
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -23,7 +26,7 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         Support filtering by role: /api/users/?role=student
         """
-        queryset = User.objects.all()
+        queryset = User.objects.order_by('id')
         role = self.request.query_params.get('role')
         if role:
             queryset = queryset.filter(role=role)
@@ -43,9 +46,11 @@ class UserViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         """
         Allow disabling pagination for dropdowns: /api/users/?all=true
+        Hasil di-stream (JSON array, atau NDJSON dengan ?stream=ndjson)
+        agar memori worker tidak melonjak untuk puluhan ribu user.
         """
         if request.query_params.get('all') == 'true':
-            self.pagination_class = None
+            return self.stream_list(request)
         return super().list(request, *args, **kwargs)
 
     @action(detail=False, methods=['get'])
@@ -54,5 +59,6 @@ class UserViewSet(viewsets.ModelViewSet):
         Endpoint khusus untuk mengambil data profile user yang sedang login.
         URL: /api/users/me/
         """
+        # request.user dari CachedJWTAuthentication sudah memuat semua field profil
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
\ No newline at end of file